@@ -0,0 +1,179 @@
+"""
+JSON codec micro-benchmark for PyDataBridgeX.
+
+Times encoding and decoding with every installed codec (the standard
+library, orjson and msgspec) on realistic Firestore payloads: a single
+document and a page of documents as returned by ``read_all_documents``.
+Typed decoding into a schema is timed as well.
+
+Usage:
+    python benchmarks/codecs.py
+    python benchmarks/codecs.py --page-size 1000 --output codecs.json
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydatabridgex.pydatabridgex.firebase.codec import CODECS  # noqa: E402
+
+
+@dataclasses.dataclass
+class Address:
+    street: str
+    city: str
+    postcode: str
+    location: Dict[str, float]
+
+
+@dataclasses.dataclass
+class Customer:
+    id: str
+    name: str
+    email: str
+    active: bool
+    balance: float
+    visits: int
+    tags: List[str]
+    address: Address
+    orders: List[Dict[str, Any]]
+    createdAt: str
+    updatedAt: str
+    notes: Optional[str] = None
+
+
+def document(rng: random.Random, index: int) -> Dict[str, Any]:
+    """
+    Builds a customer document with nested maps, arrays and mixed scalar types.
+    """
+    return {
+        "id": f"cust_{index:08d}",
+        "name": f"Customer {index} {'é' * (index % 3)}",
+        "email": f"customer{index}@example.com",
+        "active": rng.random() < 0.8,
+        "balance": round(rng.uniform(-500, 5000), 2),
+        "visits": rng.randint(0, 10_000),
+        "tags": rng.sample(["vip", "new", "churn-risk", "b2b", "eu", "us"], 3),
+        "address": {
+            "street": f"{rng.randint(1, 999)} Main Street",
+            "city": rng.choice(["Lisbon", "Osaka", "Denver", "Accra"]),
+            "postcode": f"{rng.randint(10000, 99999)}",
+            "location": {"lat": rng.uniform(-90, 90), "lng": rng.uniform(-180, 180)},
+        },
+        "orders": [
+            {
+                "sku": f"SKU-{rng.randint(1000, 9999)}",
+                "quantity": rng.randint(1, 5),
+                "price": round(rng.uniform(1, 300), 2),
+            }
+            for _ in range(rng.randint(0, 6))
+        ],
+        "createdAt": "2024-03-01T12:34:56.789Z",
+        "updatedAt": "2024-06-18T08:00:00.000Z",
+        "notes": None if index % 4 else "Prefers email contact.",
+    }
+
+
+def timed(fn: Callable[[], Any], budget: float) -> float:
+    """
+    Returns the best per-call time over repeated rounds within ``budget`` seconds.
+    """
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed > 0.05:
+            break
+        calls *= 2
+    best = elapsed / calls
+    deadline = time.perf_counter() + budget
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, (time.perf_counter() - started) / calls)
+    return best
+
+
+def run(page_size: int, budget: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Benchmarks every installed codec.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per codec and payload, the encode, decode
+        and typed-decode times in microseconds and MB/s.
+    """
+    rng = random.Random(7)
+    payloads = {
+        "document": (document(rng, 0), Customer),
+        "page": (
+            {f"cust_{i:08d}": document(rng, i) for i in range(page_size)},
+            Dict[str, Customer],
+        ),
+    }
+    results = {}
+    for name, cls in CODECS.items():
+        try:
+            codec = cls()
+        except ImportError:
+            print(f"{name:8} not installed, skipped")
+            continue
+        results[name] = {}
+        for payload_name, (value, schema) in payloads.items():
+            encoded = codec.dumps(value)
+            size = len(encoded)
+            row = {"bytes": size}
+            for op, fn in (
+                ("encode", lambda: codec.dumps(value)),
+                ("decode", lambda: codec.loads(encoded)),
+                ("decode_typed", lambda: codec.loads(encoded, schema)),
+            ):
+                try:
+                    seconds = timed(fn, budget)
+                except TypeError:
+                    continue
+                row[f"{op}_us"] = seconds * 1e6
+                row[f"{op}_mb_per_sec"] = size / seconds / 1e6
+            results[name][payload_name] = row
+            print(_format(name, payload_name, row), flush=True)
+    return results
+
+
+def _format(codec: str, payload: str, row: Dict[str, Any]) -> str:
+    cells = [f"{codec:8} {payload:9} {row['bytes']:>9} B"]
+    for op in ("encode", "decode", "decode_typed"):
+        if f"{op}_us" in row:
+            cells.append(f"{op} {row[f'{op}_us']:10.1f} us")
+        else:
+            cells.append(f"{op} {'n/a':>10}   ")
+    return "  ".join(cells)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--page-size", type=int, default=500, help="documents per page payload"
+    )
+    parser.add_argument(
+        "--budget", type=float, default=0.5, help="seconds spent timing each operation"
+    )
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    args = parser.parse_args(argv)
+    results = run(args.page_size, args.budget)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
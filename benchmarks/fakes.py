@@ -0,0 +1,581 @@
+"""
+In-process stand-ins for the services PyDataBridgeX talks to.
+
+FakeFirebase serves the proxy endpoints used by ``FirebaseBase._send_request``
+plus the Firebase Storage resumable upload protocol. FakeBlobService
+implements the subset of the Azure Blob REST API that ``AzureStorage`` uses,
+in the spirit of Azurite. Both keep everything in memory, answer with
+HTTP/1.1 keep-alive and ignore authentication.
+"""
+
+import base64
+import bisect
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, handler: type) -> None:
+        super().__init__(("127.0.0.1", 0), handler)
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def __enter__(self) -> "_Server":
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _reply(
+        self,
+        status: int,
+        body: bytes = b"",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class _FirebaseHandler(_Handler):
+    server: "FakeFirebase"
+
+    def _json(self, status: int, payload: Any, headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload).encode()
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        accepted = self.headers.get("Accept-Encoding") or ""
+        if self.server.compress_responses and len(body) >= 1024 and "gzip" in accepted:
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        self._reply(status, body, headers)
+
+    def _route(self) -> None:
+        parts = urlsplit(self.path)
+        # Repeated parameters, such as uids=a&uids=b, keep all their values.
+        query = {
+            k: v[0] if len(v) == 1 else v for k, v in parse_qs(parts.query).items()
+        }
+        body = self._body()
+        encoding = self.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding:
+            return self._json(415, {"error": f"Unsupported encoding {encoding}"})
+        path = parts.path.rstrip("/") or "/"
+        with self.server.lock:
+            self.server.requests.append((self.command, path))
+            self.server.headers.append(dict(self.headers))
+            fault = self.server.faults.popleft() if self.server.faults else None
+        if fault is not None:
+            status, retry_after = fault
+            headers = {"Retry-After": retry_after} if retry_after is not None else None
+            return self._json(status, {"error": "Injected fault"}, headers)
+        if path.startswith("/v0/b/"):
+            return self._resumable_start(query)
+        if path.startswith("/upload/"):
+            return self._resumable_chunk(path[len("/upload/") :], body)
+        payload = {}
+        if body and "json" in (self.headers.get("Content-Type") or ""):
+            payload = json.loads(body)
+        handler = self.server.routes.get((self.command, path))
+        if handler is None:
+            return self._json(404, {"error": f"No route for {self.command} {path}"})
+        self._json(200, handler(self.server, query, payload, body))
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _route
+
+    def _resumable_start(self, query: Dict[str, str]) -> None:
+        session = uuid.uuid4().hex
+        with self.server.lock:
+            self.server.uploads[session] = {
+                "name": query.get("name"),
+                "data": bytearray(),
+            }
+        self._reply(
+            200,
+            headers={
+                "X-Goog-Upload-Status": "active",
+                "X-Goog-Upload-URL": f"{self.server.url}/upload/{session}",
+            },
+        )
+
+    def _resumable_chunk(self, session: str, body: bytes) -> None:
+        upload = self.server.uploads.get(session)
+        if upload is None:
+            return self._json(404, {"error": "Unknown upload session"})
+        command = self.headers.get("X-Goog-Upload-Command", "")
+        if "upload" in command:
+            offset = int(self.headers.get("X-Goog-Upload-Offset", 0))
+            if offset != len(upload["data"]):
+                return self._json(400, {"error": "Offset mismatch"})
+            upload["data"] += body
+        received = {"X-Goog-Upload-Size-Received": str(len(upload["data"]))}
+        if "finalize" not in command:
+            received["X-Goog-Upload-Status"] = "active"
+            return self._reply(200, headers=received)
+        with self.server.lock:
+            self.server.files[upload["name"]] = bytes(upload["data"])
+            del self.server.uploads[session]
+        self._json(
+            200,
+            {"name": upload["name"], "size": str(len(upload["data"]))},
+            dict(received, **{"X-Goog-Upload-Status": "final"}),
+        )
+
+
+def _create(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    doc_id = uuid.uuid4().hex
+    with server.lock:
+        server.documents[doc_id] = payload.get("data")
+        server.changed[doc_id] = time.time()
+    return {"id": doc_id}
+
+
+def _read(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    if "uid" in query:
+        return server.users.get(query["uid"])
+    doc_id = query.get("id")
+    if doc_id is None:
+        return dict(server.documents)
+    return {doc_id: server.documents.get(doc_id)}
+
+
+def _batch_get(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    # Keyed by document ID; IDs that do not exist are left out.
+    server.batch_gets += 1
+    ids = [request.get("id") for request in payload.get("requests", [])]
+    return {
+        "documents": {
+            doc_id: server.documents[doc_id]
+            for doc_id in ids
+            if doc_id in server.documents
+        }
+    }
+
+
+def _import_users(
+    server: "FakeFirebase", query: Dict, payload: Dict, body: bytes
+) -> Dict:
+    # Like the Admin API, reports only the failures, by index in the batch.
+    errors = []
+    with server.lock:
+        for index, user in enumerate(payload.get("users", [])):
+            if not user.get("uid"):
+                errors.append({"index": index, "reason": "missing uid"})
+            else:
+                server.users[user["uid"]] = user
+    return {"errors": errors}
+
+
+def _get_users(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    # Lists only the users that exist.
+    uids = query.get("uids", [])
+    if isinstance(uids, str):
+        uids = [uids]
+    return {"users": [server.users[uid] for uid in uids if uid in server.users]}
+
+
+def _delete_users(
+    server: "FakeFirebase", query: Dict, payload: Dict, body: bytes
+) -> Dict:
+    errors = []
+    with server.lock:
+        for index, uid in enumerate(payload.get("uids", [])):
+            if server.users.pop(uid, None) is None:
+                errors.append({"index": index, "reason": "user not found"})
+    return {"errors": errors}
+
+
+def _update(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    data = payload.get("data") or payload.get("newData") or {}
+    doc_id = payload.get("id") or data.get("id")
+    with server.lock:
+        server.documents[doc_id] = data
+        server.changed[doc_id] = time.time()
+    return {"id": doc_id}
+
+
+def _delete(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    doc_id = query.get("id") or payload.get("id")
+    with server.lock:
+        server.documents.pop(doc_id, None)
+        server.changed[doc_id] = time.time()
+    return {"id": doc_id}
+
+
+def _read_all(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    with server.lock:
+        if "changedSince" in query:
+            since = float(query["changedSince"])
+            ids = sorted(k for k, t in server.changed.items() if t >= since)
+        else:
+            ids = sorted(server.documents)
+    start = query.get("startAfter")
+    if start is not None:
+        ids = ids[bisect.bisect_right(ids, start) :]
+    if "limit" in query:
+        ids = ids[: int(query["limit"])]
+    return {doc_id: server.documents.get(doc_id) for doc_id in ids}
+
+
+def _patch(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    # A Realtime Database multi-location update against ``server.tree``.
+    for path, value in payload.items():
+        *parents, leaf = [key for key in path.split("/") if key]
+        node = server.tree
+        for key in parents:
+            if not isinstance(node.get(key), dict):
+                node[key] = {}
+            node = node[key]
+        if value is None:
+            node.pop(leaf, None)
+        else:
+            node[leaf] = value
+    return payload
+
+
+def _token(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    # The secure token endpoint: exchanges a refresh token for an ID token.
+    form = {k: v[0] for k, v in parse_qs(body.decode()).items()}
+    server.token_refreshes += 1
+    return {
+        "id_token": f"id-{server.token_refreshes}",
+        "refresh_token": form.get("refresh_token"),
+        "expires_in": "3600",
+    }
+
+
+def _paths(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    return {"paths": sorted(server.documents)}
+
+
+def _upload(server: "FakeFirebase", query: Dict, payload: Dict, body: bytes) -> Dict:
+    return {"path": payload.get("path"), "size": len(body)}
+
+
+def _download_url(
+    server: "FakeFirebase", query: Dict, payload: Dict, body: bytes
+) -> Dict:
+    return {"url": f"{server.url}/files/{payload.get('path')}"}
+
+
+class FakeFirebase(_Server):
+    """
+    In-memory stand-in for the Firebase proxy endpoints.
+
+    Firestore, RealTime and Storage routes share one document store; the
+    resumable upload protocol is served under ``/v0/b`` (set
+    ``ResumableUpload.base_url`` to ``f"{fake.url}/v0/b"``). gzip request
+    bodies are accepted (other encodings get a 415), and responses of 1 KiB
+    or more are gzipped when ``compress_responses`` is set. Multi-location
+    PATCH updates to the database URL ``f"{fake.url}/rtdb"`` are applied to
+    ``tree``, and ``f"{fake.url}/token"`` stands in for the secure token
+    endpoint. Authentication lookups, batch imports and batch
+    deletions use ``users``.
+
+    Usage:
+        with FakeFirebase() as fake:
+            config = Configuration({}, {}, "db", "bucket", base_url=fake.url)
+    """
+
+    routes = {
+        ("POST", "/"): _create,
+        ("GET", "/"): _read,
+        ("PUT", "/"): _update,
+        ("DELETE", "/"): _delete,
+        ("POST", "/batchGet"): _batch_get,
+        ("GET", "/all"): _read_all,
+        ("GET", "/paths"): _paths,
+        ("POST", "/import"): _import_users,
+        ("GET", "/batch"): _get_users,
+        ("DELETE", "/batch"): _delete_users,
+        ("PATCH", "/rtdb/.json"): _patch,
+        ("POST", "/token"): _token,
+        ("POST", "/create"): _create,
+        ("GET", "/read"): _read,
+        ("PUT", "/update"): _update,
+        ("DELETE", "/delete"): _delete,
+        ("POST", "/uploadFile"): _upload,
+        ("POST", "/uploadByte8Array"): _upload,
+        ("POST", "/getDownloadURL"): _download_url,
+        ("DELETE", "/deleteFile"): _delete,
+    }
+
+    def __init__(self) -> None:
+        super().__init__(_FirebaseHandler)
+        self.documents = {}
+        self.users = {}
+        self.uploads = {}
+        self.files = {}
+        self.compress_responses = False
+        self.batch_gets = 0
+        self.token_refreshes = 0
+        self.changed = {}
+        self.tree = {}
+        self.requests = []
+        self.headers = []
+        self.faults = deque()
+
+    def fail(
+        self, status: int, times: int = 1, retry_after: Optional[str] = None
+    ) -> None:
+        """
+        Answers the next ``times`` requests with ``status``, plus a
+        ``Retry-After`` header when one is given.
+        """
+        with self.lock:
+            self.faults.extend([(status, retry_after)] * times)
+
+
+class _Blob:
+    __slots__ = ("data", "etag", "modified", "md5")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.etag = f'"0x{uuid.uuid4().hex[:15].upper()}"'
+        self.modified = formatdate(usegmt=True)
+        self.md5 = base64.b64encode(hashlib.md5(data).digest()).decode()
+
+
+class _BlobHandler(_Handler):
+    server: "FakeBlobService"
+
+    def _headers(self, extra: Dict[str, str] = None) -> Dict[str, str]:
+        return dict(
+            extra or {},
+            **{
+                "x-ms-request-id": str(uuid.uuid4()),
+                "x-ms-version": "2021-12-02",
+                "Date": formatdate(usegmt=True),
+            },
+        )
+
+    def _error(self, status: int, code: str) -> None:
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f"<Error><Code>{code}</Code><Message>{code}</Message></Error>"
+        ).encode()
+        self._reply(
+            status,
+            body,
+            self._headers({"x-ms-error-code": code, "Content-Type": "application/xml"}),
+        )
+
+    def _target(self) -> Tuple[str, Optional[str], Dict[str, str]]:
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        segments = unquote(parts.path).lstrip("/").split("/", 2)
+        container = segments[1] if len(segments) > 1 else ""
+        blob = segments[2] if len(segments) > 2 else None
+        return container, blob, query
+
+    def do_PUT(self) -> None:
+        container, blob, query = self._target()
+        body = self._body()
+        server = self.server
+        with server.lock:
+            if blob is None:
+                if container in server.containers:
+                    return self._error(409, "ContainerAlreadyExists")
+                server.containers[container] = {}
+                server.blocks[container] = {}
+                return self._reply(201, headers=self._headers({"ETag": '"0x1"'}))
+            blobs = server.containers.get(container)
+            if blobs is None:
+                return self._error(404, "ContainerNotFound")
+            comp = query.get("comp")
+            if comp == "block":
+                server.blocks[container].setdefault(blob, {})[query["blockid"]] = body
+                return self._reply(201, headers=self._headers())
+            if comp == "blocklist":
+                staged = server.blocks[container].pop(blob, {})
+                ids = [node.text for node in ElementTree.fromstring(body)]
+                try:
+                    data = b"".join(staged[block_id] for block_id in ids)
+                except KeyError:
+                    return self._error(400, "InvalidBlockList")
+            else:
+                data = body
+            entry = blobs[blob] = _Blob(data)
+        self._reply(
+            201,
+            headers=self._headers(
+                {
+                    "ETag": entry.etag,
+                    "Last-Modified": entry.modified,
+                    "Content-MD5": entry.md5,
+                    "x-ms-request-server-encrypted": "false",
+                }
+            ),
+        )
+
+    def _properties(self, entry: _Blob) -> Dict[str, str]:
+        return {
+            "ETag": entry.etag,
+            "Last-Modified": entry.modified,
+            "x-ms-creation-time": entry.modified,
+            "x-ms-blob-type": "BlockBlob",
+            "Content-Type": "application/octet-stream",
+            "Accept-Ranges": "bytes",
+        }
+
+    def _blob(self, container: str, blob: str) -> Optional[_Blob]:
+        return self.server.containers.get(container, {}).get(blob)
+
+    def do_HEAD(self) -> None:
+        container, blob, _ = self._target()
+        entry = self._blob(container, blob)
+        if entry is None:
+            return self._reply(
+                404, headers=self._headers({"x-ms-error-code": "BlobNotFound"})
+            )
+        headers = self._properties(entry)
+        headers["Content-MD5"] = entry.md5
+        self.send_response(200)
+        for name, value in self._headers(headers).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(entry.data)))
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        container, blob, query = self._target()
+        if blob is None:
+            return self._list(container, query)
+        entry = self._blob(container, blob)
+        if entry is None:
+            return self._error(404, "BlobNotFound")
+        expected = self.headers.get("If-Match")
+        if expected is not None and expected not in ("*", entry.etag):
+            return self._error(412, "ConditionNotMet")
+        size = len(entry.data)
+        headers = self._properties(entry)
+        requested = self.headers.get("x-ms-range") or self.headers.get("Range")
+        match = re.match(r"bytes=(\d+)-(\d*)", requested or "")
+        if match is None:
+            headers["Content-MD5"] = entry.md5
+            return self._reply(200, entry.data, self._headers(headers))
+        start = int(match.group(1))
+        end = min(int(match.group(2)) if match.group(2) else size - 1, size - 1)
+        if start >= size:
+            return self._error(416, "InvalidRange")
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["x-ms-blob-content-md5"] = entry.md5
+        self._reply(206, entry.data[start : end + 1], self._headers(headers))
+
+    def do_DELETE(self) -> None:
+        container, blob, _ = self._target()
+        server = self.server
+        with server.lock:
+            if blob is None:
+                if server.containers.pop(container, None) is None:
+                    return self._error(404, "ContainerNotFound")
+                server.blocks.pop(container, None)
+            elif server.containers.get(container, {}).pop(blob, None) is None:
+                return self._error(404, "BlobNotFound")
+        self._reply(202, headers=self._headers())
+
+    def _list(self, container: str, query: Dict[str, str]) -> None:
+        blobs = self.server.containers.get(container)
+        if blobs is None:
+            return self._error(404, "ContainerNotFound")
+        prefix = query.get("prefix", "")
+        marker = query.get("marker", "")
+        limit = int(query.get("maxresults", 5000))
+        with self.server.lock:
+            names = sorted(
+                name for name in blobs if name.startswith(prefix) and name > marker
+            )
+        page, rest = names[:limit], names[limit:]
+        items = []
+        for name in page:
+            entry = blobs.get(name)
+            if entry is None:
+                continue
+            items.append(
+                f"<Blob><Name>{escape(name)}</Name><Properties>"
+                f"<Creation-Time>{entry.modified}</Creation-Time>"
+                f"<Last-Modified>{entry.modified}</Last-Modified>"
+                f"<Etag>{escape(entry.etag)}</Etag>"
+                f"<Content-Length>{len(entry.data)}</Content-Length>"
+                f"<Content-Type>application/octet-stream</Content-Type>"
+                f"<Content-MD5>{entry.md5}</Content-MD5>"
+                f"<BlobType>BlockBlob</BlobType>"
+                f"</Properties></Blob>"
+            )
+        next_marker = escape(page[-1]) if rest else ""
+        body = (
+            '<?xml version="1.0" encoding="utf-8"?>'
+            f'<EnumerationResults ServiceEndpoint="{self.server.url}/" '
+            f'ContainerName="{escape(container)}">'
+            f"<Prefix>{escape(prefix)}</Prefix><MaxResults>{limit}</MaxResults>"
+            f"<Blobs>{''.join(items)}</Blobs><NextMarker>{next_marker}</NextMarker>"
+            "</EnumerationResults>"
+        ).encode()
+        self._reply(200, body, self._headers({"Content-Type": "application/xml"}))
+
+
+class FakeBlobService(_Server):
+    """
+    In-memory stand-in for the Azure Blob service, in the spirit of Azurite.
+
+    Supports container create/delete/list, Put Blob, Put Block, Put Block
+    List, ranged and If-Match conditional Get Blob, Get Blob Properties and
+    Delete Blob.
+
+    Usage:
+        with FakeBlobService() as fake:
+            storage = AzureStorage("bench", connection=fake.connection_string)
+    """
+
+    account = "devstoreaccount1"
+
+    def __init__(self) -> None:
+        super().__init__(_BlobHandler)
+        self.containers = {}
+        self.blocks = {}
+
+    @property
+    def connection_string(self) -> str:
+        key = base64.b64encode(b"fake-account-key").decode()
+        return (
+            f"DefaultEndpointsProtocol=http;AccountName={self.account};"
+            f"AccountKey={key};BlobEndpoint={self.url}/{self.account};"
+        )
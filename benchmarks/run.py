@@ -0,0 +1,457 @@
+"""
+Benchmark suite for PyDataBridgeX.
+
+Runs the Firebase and AzureStorage clients against the in-process fakes in
+``fakes.py`` and reports ops/s and p50/p99 latency per case. Results are
+written as JSON; pass ``--baseline`` to compare against an earlier run and
+exit non-zero when a case got slower than the tolerance allows. Quick runs
+are too noisy for that and cannot be compared.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results.json --tolerance 0.15
+    python benchmarks/run.py --only azure.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import FakeBlobService, FakeFirebase  # noqa: E402
+from pydatabridgex.pydatabridgex.azure.storage import AzureStorage  # noqa: E402
+from pydatabridgex.pydatabridgex.firebase.compression import (  # noqa: E402
+    Compression,
+)
+from pydatabridgex.pydatabridgex.firebase.configuration import (  # noqa: E402
+    Configuration,
+)
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore  # noqa: E402
+from pydatabridgex.pydatabridgex.firebase.realtime import RealTime  # noqa: E402
+from pydatabridgex.pydatabridgex.firebase.replica import (  # noqa: E402
+    DocumentReplica,
+)
+from pydatabridgex.pydatabridgex.firebase.storage import Storage  # noqa: E402
+from pydatabridgex.pydatabridgex.firebase.upload import (  # noqa: E402
+    ResumableUpload,
+)
+from pydatabridgex.pydatabridgex.firebase.writebehind import (  # noqa: E402
+    WriteBehindQueue,
+)
+
+MiB = 1024 * 1024
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start import cases, each timed in a fresh interpreter.
+IMPORTS = {
+    "import.package": "import pydatabridgex.pydatabridgex",
+    "import.firestore": "from pydatabridgex.pydatabridgex import Firestore",
+    "import.azure_storage": "from pydatabridgex.pydatabridgex import AzureStorage",
+}
+
+CASES = {}
+
+
+def case(name: str) -> Callable[[Callable], Callable]:
+    """
+    Registers a benchmark case.
+
+    A case receives the run context and returns one latency sample per
+    timed operation, or a ``(samples, ops, bytes)`` tuple when a sample
+    covers several operations or moves a payload.
+    """
+
+    def register(fn: Callable) -> Callable:
+        CASES[name] = fn
+        return fn
+
+    return register
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def import_time(statement: str) -> float:
+    """
+    Returns the seconds a fresh interpreter spends executing an import statement.
+    """
+    script = (
+        "import time\n"
+        "started = time.perf_counter()\n"
+        f"{statement}\n"
+        "print(time.perf_counter() - started)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output)
+
+
+def percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Context:
+    """
+    The fakes, clients and sizes shared by every case in a run.
+    """
+
+    def __init__(self, firebase: FakeFirebase, blobs: FakeBlobService, quick: bool):
+        self.quick = quick
+        self.ops = 100 if quick else 1000
+        self.large = (8 if quick else 64) * MiB
+        self.firebase = firebase
+        self.config = Configuration(
+            {"apiKey": "bench"}, {}, "bench-db", "bench-bucket", base_url=firebase.url
+        )
+        self.firestore = Firestore(self.config)
+        self.batched = Firestore(self.config).enable_batching()
+        self.realtime = RealTime(self.config)
+        self.storage = Storage(self.config)
+        self.compression = Compression()
+        self.compressed = Firestore(
+            Configuration(
+                {"apiKey": "bench"},
+                {},
+                "bench-db",
+                "bench-bucket",
+                base_url=firebase.url,
+                transport=self.config.get_transport(),
+                compression=self.compression,
+            )
+        )
+        self.document = {
+            "rows": [
+                {"sku": f"SKU-{i:05d}", "city": "Lisbon", "quantity": i % 7}
+                for i in range(1000)
+            ]
+        }
+        self.azure = AzureStorage("bench", connection=blobs.connection_string)
+        self.workdir = tempfile.mkdtemp(prefix="pydatabridgex-bench-")
+        self.large_path = os.path.join(self.workdir, "large.bin")
+        with open(self.large_path, "wb") as file:
+            for _ in range(self.large // MiB):
+                file.write(os.urandom(MiB))
+
+    def close(self) -> None:
+        self.config.get_transport().close()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+@case("firestore.create")
+def firestore_create(ctx: Context) -> List[float]:
+    data = {"n": 1, "s": "x" * 64}
+    return timed(lambda: ctx.firestore.create_document(data), ctx.ops)
+
+
+@case("firestore.read")
+def firestore_read(ctx: Context) -> List[float]:
+    doc_id = ctx.firestore.create_document({"n": 1})["id"]
+    return timed(lambda: ctx.firestore.read_document({"id": doc_id}), ctx.ops)
+
+
+@case("firestore.update")
+def firestore_update(ctx: Context) -> List[float]:
+    doc_id = ctx.firestore.create_document({"n": 1})["id"]
+    data = {"id": doc_id, "n": 2}
+    return timed(lambda: ctx.firestore.update_document(data), ctx.ops)
+
+
+@case("firestore.delete")
+def firestore_delete(ctx: Context) -> List[float]:
+    ids = [ctx.firestore.create_document({"n": 1})["id"] for _ in range(ctx.ops)]
+    ids = iter(ids)
+    return timed(lambda: ctx.firestore.delete_document({"id": next(ids)}), ctx.ops)
+
+
+@case("firestore.bulk_write")
+def firestore_bulk_write(ctx: Context) -> tuple:
+    ops = [("create", {"n": i}) for i in range(ctx.ops)]
+    samples = timed(lambda: ctx.firestore.bulk_write(ops), 5)
+    return samples, 5 * len(ops), 0
+
+
+@case("firestore.bulk_read")
+def firestore_bulk_read(ctx: Context) -> tuple:
+    refs = [ctx.firestore.create_document({"n": i}) for i in range(100)]
+    refs = [{"id": ref["id"]} for ref in refs] * (ctx.ops // 100)
+    samples = timed(lambda: ctx.firestore.bulk_read(refs), 5)
+    return samples, 5 * len(refs), 0
+
+
+@case("batching.bulk_read")
+def batching_bulk_read(ctx: Context) -> tuple:
+    refs = [ctx.firestore.create_document({"n": i}) for i in range(100)]
+    refs = [{"id": ref["id"]} for ref in refs] * (ctx.ops // 100)
+    samples = timed(lambda: ctx.batched.bulk_read(refs, max_in_flight=64), 5)
+    return samples, 5 * len(refs), 0
+
+
+@case("writebehind.submit")
+def writebehind_submit(ctx: Context) -> List[float]:
+    path = os.path.join(ctx.workdir, "write-behind.db")
+    with WriteBehindQueue(ctx.firestore, path) as queue:
+        samples = timed(lambda: queue.submit("create_document", {"n": 1}), ctx.ops)
+        queue.flush()
+    return samples
+
+
+@case("replica.query")
+def replica_query(ctx: Context) -> List[float]:
+    path = os.path.join(ctx.workdir, "replica.db")
+    with DocumentReplica(ctx.firestore, path, indexes=["n"]) as replica:
+        replica.sync()
+        return timed(lambda: replica.query([("n", "==", 1)], limit=10), ctx.ops)
+
+
+@case("firestore.iter_documents")
+def firestore_iter_documents(ctx: Context) -> tuple:
+    missing = ctx.ops * 5 - len(ctx.firebase.documents)
+    if missing > 0:
+        ctx.firestore.bulk_write([("create", {"n": i}) for i in range(missing)])
+    count = len(ctx.firebase.documents)
+    samples = timed(lambda: sum(1 for _ in ctx.firestore.iter_documents({})), 3)
+    return samples, 3 * count, 0
+
+
+@case("firestore.create_large")
+def firestore_create_large(ctx: Context) -> tuple:
+    size = len(json.dumps({"data": ctx.document}))
+    ops = ctx.ops // 10
+    samples = timed(lambda: ctx.firestore.create_document(ctx.document), ops)
+    return samples, ops, ops * size
+
+
+@case("compression.create_large")
+def compression_create_large(ctx: Context) -> tuple:
+    size = len(json.dumps({"data": ctx.document}))
+    ops = ctx.ops // 10
+    samples = timed(lambda: ctx.compressed.create_document(ctx.document), ops)
+    return samples, ops, ops * size
+
+
+@case("compression.read_all")
+def compression_read_all(ctx: Context) -> tuple:
+    ctx.firebase.compress_responses = True
+    try:
+        size = len(json.dumps(ctx.compressed.read_all_documents({})))
+        samples = timed(lambda: ctx.compressed.read_all_documents({}), 10)
+    finally:
+        ctx.firebase.compress_responses = False
+    return samples, 10, 10 * size
+
+
+@case("realtime.create")
+def realtime_create(ctx: Context) -> List[float]:
+    return timed(lambda: ctx.realtime.create_item({"n": 1}), ctx.ops)
+
+
+@case("realtime.read")
+def realtime_read(ctx: Context) -> List[float]:
+    item_id = ctx.realtime.create_item({"n": 1})["id"]
+    return timed(lambda: ctx.realtime.read_items({"id": item_id}), ctx.ops)
+
+
+@case("storage.upload_file")
+def storage_upload_file(ctx: Context) -> tuple:
+    samples = timed(lambda: ctx.storage.upload_file(ctx.large_path, "large.bin"), 3)
+    return samples, 3, 3 * ctx.large
+
+
+@case("storage.upload_stream")
+def storage_upload_stream(ctx: Context) -> tuple:
+    def upload() -> None:
+        session = ResumableUpload(
+            ctx.config.get_transport(), ctx.config.storage_bucket, "large.bin"
+        )
+        session.base_url = f"{ctx.firebase.url}/v0/b"
+        session.upload(ctx.large_path)
+
+    return timed(upload, 3), 3, 3 * ctx.large
+
+
+@case("azure.create_file")
+def azure_create_file(ctx: Context) -> List[float]:
+    payload = os.urandom(4096)
+    names = iter(f"small/{i:06d}" for i in range(ctx.ops))
+    return timed(lambda: ctx.azure.create_file(payload, next(names)), ctx.ops)
+
+
+@case("azure.download_file")
+def azure_download_file(ctx: Context) -> List[float]:
+    ctx.azure.create_file(os.urandom(4096), "small/read")
+    return timed(lambda: ctx.azure.download_file("small/read"), ctx.ops)
+
+
+@case("azure.upload_path")
+def azure_upload_path(ctx: Context) -> tuple:
+    samples = timed(lambda: ctx.azure.upload_path(ctx.large_path, "large.bin"), 3)
+    return samples, 3, 3 * ctx.large
+
+
+@case("azure.download_to_path")
+def azure_download_to_path(ctx: Context) -> tuple:
+    target = os.path.join(ctx.workdir, "download.bin")
+    samples = timed(lambda: ctx.azure.download_to_path("large.bin", target), 3)
+    return samples, 3, 3 * ctx.large
+
+
+@case("azure.find_file")
+def azure_find_file(ctx: Context) -> tuple:
+    for i in range(ctx.ops - len(ctx.azure.find_file())):
+        ctx.azure.create_file(b"x", f"listing/{i:06d}")
+    count = len(ctx.azure.find_file())
+    return timed(ctx.azure.find_file, 5), 5 * count, 0
+
+
+def _import_case(statement: str) -> Callable[[Context], List[float]]:
+    return lambda ctx: [import_time(statement) for _ in range(5 if ctx.quick else 20)]
+
+
+for _name, _statement in IMPORTS.items():
+    case(_name)(_import_case(_statement))
+
+
+def summarize(outcome: Any, seconds: float) -> Dict[str, float]:
+    if isinstance(outcome, tuple):
+        samples, ops, moved = outcome
+    else:
+        samples, ops, moved = outcome, len(outcome), 0
+    result = {
+        "ops": ops,
+        "seconds": seconds,
+        "ops_per_sec": ops / sum(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+    }
+    if moved:
+        result["mb_per_sec"] = moved / MiB / sum(samples)
+    return result
+
+
+def run(quick: bool, only: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs every registered case, or those whose name starts with ``only``.
+
+    Returns:
+        Dict[str, Any]: The run metadata and a result per case.
+    """
+    results = {}
+    with FakeFirebase() as firebase, FakeBlobService() as blobs:
+        ctx = Context(firebase, blobs, quick)
+        try:
+            for name, fn in CASES.items():
+                if only and not name.startswith(only):
+                    continue
+                started = time.perf_counter()
+                outcome = fn(ctx)
+                results[name] = summarize(outcome, time.perf_counter() - started)
+                print(_format(name, results[name]), flush=True)
+        finally:
+            ctx.close()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "quick": quick,
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Compares a run against a baseline run.
+
+    Returns:
+        List[str]: The cases whose throughput dropped by more than ``tolerance``.
+    """
+    regressions = []
+    print(f"\n{'case':28} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, before in baseline["results"].items():
+        after = current["results"].get(name)
+        if after is None:
+            continue
+        change = after["ops_per_sec"] / before["ops_per_sec"] - 1
+        flag = ""
+        if change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:28} {before['ops_per_sec']:12.1f} {after['ops_per_sec']:12.1f} "
+            f"{change:+8.1%}{flag}"
+        )
+    return regressions
+
+
+def _format(name: str, result: Dict[str, float]) -> str:
+    line = (
+        f"{name:28} {result['ops_per_sec']:10.1f} ops/s  "
+        f"p50 {result['p50_ms']:8.3f} ms  p99 {result['p99_ms']:8.3f} ms"
+    )
+    if "mb_per_sec" in result:
+        line += f"  {result['mb_per_sec']:8.1f} MiB/s"
+    return line
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--quick", action="store_true", help="smaller, faster run")
+    parser.add_argument("--only", help="run cases whose name starts with this prefix")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    parser.add_argument("--baseline", help="compare against results from this path")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed relative drop in ops/s before a case counts as a regression",
+    )
+    args = parser.parse_args(argv)
+    baseline = None
+    if args.baseline:
+        # Run-to-run noise in the small quick workload already exceeds the
+        # default tolerance, so such a comparison would report regressions
+        # that are not there.
+        if args.quick:
+            parser.error("--baseline compares full runs only; drop --quick")
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["meta"].get("quick"):
+            parser.error(f"{args.baseline} holds a --quick run; record a full one")
+    current = run(args.quick, args.only)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(current, file, indent=2)
+    if baseline is not None:
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
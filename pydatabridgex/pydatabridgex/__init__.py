@@ -1,4 +1,27 @@
-import requests
-from typing import Any, Dict, List, Union
-from pydatabridge.pydatabridge.firebase import *
-from pydatabridge.pydatabridge.azure import *
+"""
+PyDataBridgeX: Firebase and Azure clients.
+
+Importing the package is cheap: every public name is resolved from its
+backend on first access, so a service that only uses Firestore never
+imports the Azure SDK, and nothing imports requests until a client is used.
+"""
+
+from ._lazy import lazy_exports
+from .firebase import _EXPORTS as _FIREBASE_EXPORTS
+from .azure import _EXPORTS as _AZURE_EXPORTS
+
+_EXPORTS = {
+    **{name: ".firebase" for name in _FIREBASE_EXPORTS},
+    **{name: ".azure" for name in _AZURE_EXPORTS},
+    "DEFAULT_BUCKETS": ".instrumentation",
+    "Call": ".instrumentation",
+    "Instrumentation": ".instrumentation",
+    "measure": ".instrumentation",
+    "documents_to_batches": ".arrow",
+    "rows_to_batches": ".arrow",
+    "batches_to_table": ".arrow",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
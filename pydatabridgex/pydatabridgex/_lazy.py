@@ -0,0 +1,37 @@
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Builds the module-level ``__getattr__`` and ``__dir__`` of a package
+    whose public names are imported from their submodules on first access.
+
+    A resolved name is stored in the package namespace, so later lookups
+    no longer go through ``__getattr__``.
+
+    Args:
+        package (str): The package's ``__name__``.
+        exports (Dict[str, str]): Each public name and the relative module
+            that defines it.
+
+    Returns:
+        Tuple[Callable[[str], Any], Callable[[], List[str]]]: The
+            ``__getattr__`` and ``__dir__`` functions.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
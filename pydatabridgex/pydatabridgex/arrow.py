@@ -0,0 +1,152 @@
+"""
+Columnar (Apache Arrow) output for Firestore documents and SQL rows.
+
+pyarrow is an optional dependency: install it with ``pip install PyDataBridgeX[arrow]``.
+"""
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Arrow output requires pyarrow: pip install PyDataBridgeX[arrow]"
+        ) from e
+    return pyarrow
+
+
+def documents_to_batches(
+    documents: Iterable[Tuple[str, Dict[str, Any]]],
+    batch_size: int = 10000,
+    id_field: str = "id",
+    schema: Optional[Any] = None,
+) -> Iterator[Any]:
+    """
+    Builds Arrow record batches from ``(document ID, data)`` pairs.
+
+    Unless a schema is given it is inferred (nested maps become struct
+    columns) and widened as later batches bring new fields or wider types,
+    such as a field that was null or integer so far; each batch is cast to
+    the schema so far, so batches can only gain columns and widen types, and
+    batches_to_table unifies them. A type change that cannot be made without
+    losing data, such as integer to string, raises pyarrow.ArrowInvalid or
+    pyarrow.ArrowTypeError, as does a value that does not fit a given schema.
+
+    Args:
+        documents (Iterable[Tuple[str, Dict[str, Any]]]): The documents, e.g. from Firestore.iter_documents.
+        batch_size (int): The number of documents per record batch.
+        id_field (str): The name of the column holding the document ID.
+        schema (pyarrow.Schema, optional): The schema to use instead of inferring one.
+
+    Yields:
+        pyarrow.RecordBatch: The documents, ``batch_size`` at a time.
+    """
+    pa = _pyarrow()
+    fixed = schema is not None
+    documents = iter(documents)
+    while True:
+        records = [
+            {id_field: doc_id, **data} for doc_id, data in islice(documents, batch_size)
+        ]
+        if not records:
+            return
+        batch, schema = _fit(pa, pa.RecordBatch.from_pylist(records), schema, fixed)
+        yield batch
+
+
+def rows_to_batches(
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    batch_size: int = 10000,
+    schema: Optional[Any] = None,
+) -> Iterator[Any]:
+    """
+    Builds Arrow record batches from result rows, one column array at a time.
+
+    The schema is inferred and widened across batches as in
+    documents_to_batches; a given schema is matched to the columns by position.
+
+    Args:
+        columns (Sequence[str]): The column names.
+        rows (Iterable[Sequence[Any]]): The result rows.
+        batch_size (int): The number of rows per record batch.
+        schema (pyarrow.Schema, optional): The schema to use instead of inferring one.
+
+    Yields:
+        pyarrow.RecordBatch: The rows, ``batch_size`` at a time.
+    """
+    pa = _pyarrow()
+    fixed = schema is not None
+    names = schema.names if fixed else list(columns)
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        arrays = [pa.array(column) for column in zip(*chunk)]
+        batch = pa.RecordBatch.from_arrays(arrays, names=names)
+        batch, schema = _fit(pa, batch, schema, fixed)
+        yield batch
+
+
+def batches_to_table(batches: Iterable[Any], schema: Optional[Any] = None) -> Any:
+    """
+    Collects record batches into a single Arrow table.
+
+    Batches whose schemas differ, as documents_to_batches and rows_to_batches
+    produce when a later batch widens a type, are cast to their unified schema.
+
+    Args:
+        batches (Iterable[pyarrow.RecordBatch]): The record batches.
+        schema (pyarrow.Schema, optional): The schema of an empty result.
+
+    Returns:
+        pyarrow.Table: The combined table.
+    """
+    pa = _pyarrow()
+    batches = list(batches)
+    if not batches:
+        return pa.table({}) if schema is None else schema.empty_table()
+    unified = batches[-1].schema
+    if any(batch.schema != unified for batch in batches):
+        unified = _unify(pa, [batch.schema for batch in batches])
+        batches = [
+            batch if batch.schema == unified else _conform(pa, batch, unified)
+            for batch in batches
+        ]
+    return pa.Table.from_batches(batches)
+
+
+def _fit(pa: Any, batch: Any, schema: Optional[Any], fixed: bool) -> Tuple[Any, Any]:
+    # Inferring each batch on its own and casting it afterwards, rather than
+    # converting with the expected types, keeps pyarrow from truncating
+    # values (2.5 into an int64 column) without an error.
+    if schema is None:
+        return batch, batch.schema
+    if not fixed and batch.schema != schema:
+        schema = _unify(pa, [schema, batch.schema])
+    if batch.schema != schema:
+        batch = _conform(pa, batch, schema)
+    return batch, schema
+
+
+def _unify(pa: Any, schemas: Sequence[Any]) -> Any:
+    return pa.unify_schemas(list(schemas), promote_options="permissive")
+
+
+def _conform(pa: Any, batch: Any, schema: Any) -> Any:
+    # Safe casts only: a value the target type cannot hold raises instead of
+    # being truncated, and a column missing from the batch becomes nulls.
+    names = set(batch.schema.names)
+    arrays = [
+        (
+            batch.column(field.name).cast(field.type)
+            if field.name in names
+            else pa.nulls(batch.num_rows, field.type)
+        )
+        for field in schema
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
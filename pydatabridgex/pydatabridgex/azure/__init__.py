@@ -1,2 +1,20 @@
-from pydatabridgex.pydatabridgex.azure.sql import *
-from pydatabridgex.pydatabridgex.azure.storage import *
+"""
+Azure clients for PyDataBridgeX.
+
+Names are resolved from their submodules on first access, so the Azure SDK
+(``pip install PyDataBridgeX[azure]``) and pyodbc are imported only when
+AzureStorage, TransferManager or AzureSQL is used.
+"""
+
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "AzureSQL": ".sql",
+    "AzureStorage": ".storage",
+    "TRANSIENT_STATUS_CODES": ".transfer",
+    "TransferManager": ".transfer",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,114 +1,322 @@
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-from typing import List, Optional, Any
-import warnings
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Union
+from ..arrow import batches_to_table, rows_to_batches
 
 
-class AzureStorage:
+class _PooledConnection:
     """
-    AzureStorage class for interacting with Azure Blob Storage.
+    A DB-API connection plus the cursors it keeps prepared, keyed by SQL text.
+    """
+
+    def __init__(self, raw: Any, statement_cache_size: int) -> None:
+        self.raw = raw
+        self.statement_cache_size = statement_cache_size
+        self.cursors = OrderedDict()
+
+    def cursor_for(self, sql: str) -> Any:
+        """
+        Returns a cursor that last executed ``sql``, so drivers such as
+        pyodbc can skip re-preparing the statement.
+        """
+        cursor = self.cursors.pop(sql, None)
+        if cursor is None:
+            cursor = self.raw.cursor()
+            if len(self.cursors) >= self.statement_cache_size:
+                self.cursors.popitem(last=False)[1].close()
+        self.cursors[sql] = cursor
+        return cursor
+
+    def close(self) -> None:
+        for cursor in self.cursors.values():
+            cursor.close()
+        self.cursors.clear()
+        self.raw.close()
+
+
+class AzureSQL:
+    """
+    AzureSQL class for interacting with Azure SQL Database.
+
+    Connections come from a thread-safe pool and keep a small cache of
+    prepared cursors. Any DB-API 2.0 driver using the ``?`` parameter style
+    works, so a local SQLite connection factory can stand in for Azure SQL.
     """
 
     def __init__(
         self,
-        container_name: str,
-        connection: str = "DefaultEndpointsProtocol=https;AccountName=[AccountNameAccountName];AccountKey=[AccountKey];EndpointSuffix=core.windows.net",
+        connection: Union[
+            str, Callable[[], Any]
+        ] = "Driver={ODBC Driver 18 for SQL Server};Server=tcp:[Server].database.windows.net,1433;Database=[Database];Uid=[User];Pwd=[Password];Encrypt=yes;",
+        pool_size: int = 8,
+        timeout: float = 30.0,
+        statement_cache_size: int = 64,
     ) -> None:
         """
-        Initialize the AzureStorage object.
+        Initialize the AzureSQL object.
 
         Parameters:
-            container_name (str): The name of the container in Azure Blob Storage.
-            connection (str, optional): The connection string for the Azure Storage account. Defaults to the provided connection string.
+            connection (Union[str, Callable[[], Any]], optional): An ODBC connection string, or a callable returning a new DB-API connection. Defaults to the provided connection string.
+            pool_size (int, optional): The maximum number of open connections.
+            timeout (float, optional): Seconds to wait for a free connection before raising TimeoutError.
+            statement_cache_size (int, optional): The number of prepared cursors kept per connection.
         """
-        self.connection_str = connection
-        self.blob_service_client = BlobServiceClient.from_connection_string(
-            conn_str=self.connection_str
-        )
-        self.container_name = str(container_name)
-        try:
-            self.container_client = self.blob_service_client.create_container(
-                self.container_name
-            )
-        except:
-            warnings.warn("Container already exists")
+        if isinstance(connection, str):
+            connection_str = connection
+
+            def connect() -> Any:
+                import pyodbc
+
+                return pyodbc.connect(connection_str)
+
+            self.connect = connect
+        else:
+            self.connect = connection
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
 
     def __repr__(self) -> str:
         """
         Return a string representation of the object.
         """
-        return f"AzureStorage(container_name={self.container_name})"
+        return f"AzureSQL(pool_size={self.pool_size})"
 
     def __str__(self) -> str:
         """
         Return a string representation of the object.
         """
-        return f"AzureStorage: Container '{self.container_name}'"
+        return f"AzureSQL: {self._created}/{self.pool_size} connections open"
+
+    def __enter__(self) -> "AzureSQL":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _acquire(self) -> _PooledConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.pool_size
+            if create:
+                self._created += 1
+        if create:
+            try:
+                return _PooledConnection(self.connect(), self.statement_cache_size)
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError("No database connection available") from None
 
-    def __len__(self) -> int:
+    def _discard(self, conn: _PooledConnection) -> None:
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledConnection]:
         """
-        Return the number of files in the container.
+        Borrows a pooled connection for the duration of a transaction.
+
+        The transaction is committed when the block exits normally and
+        rolled back otherwise; a connection whose rollback fails is dropped.
+
+        Yields:
+            _PooledConnection: The borrowed connection.
         """
-        return len(self.find_file())
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.raw.commit()
+        except BaseException:
+            try:
+                conn.raw.rollback()
+            except Exception:
+                self._discard(conn)
+                raise
+            self._idle.put(conn)
+            raise
+        self._idle.put(conn)
 
-    def __getitem__(self, index: int) -> str:
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
         """
-        Get the file name at the specified index in the container.
+        Executes a statement in its own transaction.
+
+        Parameters:
+            sql (str): The SQL statement, using ``?`` placeholders.
+            params (Sequence[Any], optional): The statement parameters.
+
+        Returns:
+            int: The number of affected rows as reported by the driver.
         """
-        files = self.find_file()
-        if 0 <= index < len(files):
-            return files[index]
-        else:
-            raise IndexError("Index out of range")
+        with self.connection() as conn:
+            cursor = conn.cursor_for(sql)
+            cursor.execute(sql, params)
+            return cursor.rowcount
 
-    def __contains__(self, item: str) -> bool:
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
         """
-        Check if a file with the given name exists in the container.
+        Runs a query and returns every row.
+
+        Parameters:
+            sql (str): The SQL query, using ``?`` placeholders.
+            params (Sequence[Any], optional): The query parameters.
+
+        Returns:
+            List[tuple]: The result rows.
         """
-        return item in self.find_file()
+        with self.connection() as conn:
+            cursor = conn.cursor_for(sql)
+            cursor.execute(sql, params)
+            return [tuple(row) for row in cursor.fetchall()]
 
-    def create_file(self, file_rb: Any, file_name_in_the_cloud: str) -> None:
+    def bulk_insert(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        batch_size: int = 1000,
+    ) -> int:
         """
-        Uploads a file to Azure Blob Storage.
+        Inserts rows with ``executemany`` in batches, committing each batch.
+
+        Rows are consumed lazily, so only one batch is held in memory. The
+        table and column names are inserted verbatim and must be trusted.
 
         Parameters:
-            file_rb (Any): The file to be uploaded.
-            file_name_in_the_cloud (str): The name of the file in Azure Blob Storage.
+            table (str): The target table.
+            columns (Sequence[str]): The target columns.
+            rows (Iterable[Sequence[Any]]): The rows to insert.
+            batch_size (int, optional): The number of rows sent per executemany call.
+
+        Returns:
+            int: The number of rows inserted.
         """
-        blob_client = self.blob_service_client.get_blob_client(
-            container=self.container_name, blob=file_name_in_the_cloud
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
         )
-        blob_client.upload_blob(file_rb, overwrite=True)
+        rows = iter(rows)
+        inserted = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                return inserted
+            with self.connection() as conn:
+                cursor = conn.cursor_for(sql)
+                if hasattr(cursor, "fast_executemany"):
+                    cursor.fast_executemany = True
+                cursor.executemany(sql, batch)
+            inserted += len(batch)
 
-    def find_file(self) -> List[str]:
+    def iter_rows(
+        self, sql: str, params: Sequence[Any] = (), fetch_size: int = 500
+    ) -> Iterator[tuple]:
         """
-        Finds all files in the container.
+        Streams the rows of a query, fetching ``fetch_size`` rows at a time.
 
-        Returns:
-            List[str]: A list of file names in the container.
+        The connection stays checked out until the generator is exhausted or
+        closed.
+
+        Parameters:
+            sql (str): The SQL query, using ``?`` placeholders.
+            params (Sequence[Any], optional): The query parameters.
+            fetch_size (int, optional): The number of rows fetched per round trip.
+
+        Yields:
+            tuple: Each result row.
         """
-        blobs_list = self.container_client.list_blobs()
-        files = []
-        for blob in blobs_list:
-            files.append(blob.name)
-        return files
+        with self.connection() as conn:
+            cursor = conn.raw.cursor()
+            try:
+                cursor.arraysize = fetch_size
+                cursor.execute(sql, params)
+                while True:
+                    rows = cursor.fetchmany(fetch_size)
+                    if not rows:
+                        return
+                    for row in rows:
+                        yield tuple(row)
+            finally:
+                cursor.close()
 
-    def download_file(self, file_name_in_the_cloud: str) -> Optional[bytes]:
+    def iter_record_batches(
+        self, sql: str, params: Sequence[Any] = (), batch_size: int = 10000
+    ) -> Iterator[Any]:
         """
-        Downloads a file from Azure Blob Storage.
+        Streams the result of a query as Arrow record batches.
+
+        Rows are fetched ``batch_size`` at a time and turned into one Arrow
+        array per column, without building a dict per row.
 
         Parameters:
-            file_name_in_the_cloud (str): The name of the file in Azure Blob Storage.
+            sql (str): The SQL query, using ``?`` placeholders.
+            params (Sequence[Any], optional): The query parameters.
+            batch_size (int, optional): The number of rows per record batch.
+
+        Yields:
+            pyarrow.RecordBatch: The result rows.
+        """
+        with self.connection() as conn:
+            cursor = conn.raw.cursor()
+            try:
+                cursor.arraysize = batch_size
+                cursor.execute(sql, params)
+                columns = [column[0] for column in cursor.description]
+                # One rows_to_batches call over every fetched row, so a column
+                # that is null in the first batch still gets its type later.
+                rows = _fetch(cursor, batch_size)
+                yield from rows_to_batches(columns, rows, batch_size)
+            finally:
+                cursor.close()
+
+    def to_table(
+        self, sql: str, params: Sequence[Any] = (), batch_size: int = 10000
+    ) -> Any:
+        """
+        Runs a query and returns the result as an Arrow table.
+
+        Parameters:
+            sql (str): The SQL query, using ``?`` placeholders.
+            params (Sequence[Any], optional): The query parameters.
+            batch_size (int, optional): The number of rows per record batch.
 
         Returns:
-            Optional[bytes]: The content of the downloaded file.
+            pyarrow.Table: The result rows.
         """
-        blob_client = self.blob_service_client.get_blob_client(
-            container=self.container_name, blob=file_name_in_the_cloud
-        )
-        return blob_client.download_blob().readall()
+        return batches_to_table(self.iter_record_batches(sql, params, batch_size))
 
-    def delete_blob(self) -> None:
+    def close(self) -> None:
         """
-        Deletes the container and all its contents.
+        Closes every idle pooled connection.
         """
-        self.container_client.delete_container()
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(conn)
+
+
+def _fetch(cursor: Any, batch_size: int) -> Iterator[Any]:
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield from rows
@@ -1,16 +1,45 @@
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-from typing import Union, List, Optional, Any
+import base64
+import mmap
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Union, List, Optional, Any, Iterator, Set
+
+try:
+    from azure.core import MatchConditions
+    from azure.storage.blob import (
+        BlobServiceClient,
+        BlobClient,
+        ContainerClient,
+        BlobBlock,
+    )
+except ImportError as e:
+    raise ImportError(
+        "AzureStorage requires azure-storage-blob: pip install PyDataBridgeX[azure]"
+    ) from e
+from ..instrumentation import Instrumentation, measure
 
 
 class AzureStorage:
     """
     AzureStorage class for interacting with Azure Blob Storage.
+
+    ``len()``, indexing and ``in`` are served from a local index of blob
+    names that is loaded on first use, kept current by this object's own
+    uploads and deletions, and reloaded once it is older than ``index_ttl``.
+    Loading and reloading list the whole container, so any of them can block
+    on the network; set ``index_ttl`` to None to reload only on request.
     """
 
     def __init__(
         self,
         container_name: str,
         connection: str = "DefaultEndpointsProtocol=https;AccountName=[AccountNameAccountName];AccountKey=[AccountKey];EndpointSuffix=core.windows.net",
+        index_ttl: Optional[float] = 300.0,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         """
         Initialize the AzureStorage object.
@@ -18,17 +47,26 @@ class AzureStorage:
         Parameters:
             container_name (str): The name of the container in Azure Blob Storage.
             connection (str, optional): The connection string for the Azure Storage account. Defaults to the provided connection string.
+            index_ttl (float, optional): Seconds before the local blob-name index is reloaded. None keeps it until refresh_index() is called.
+            instrumentation (Instrumentation, optional): Hooks and metrics for every call to the storage service.
         """
+        self.instrumentation = instrumentation
         self.blob_service_client = BlobServiceClient.from_connection_string(
             conn_str=connection
         )
         self.container_name = str(container_name)
+        self.container_client = self.blob_service_client.get_container_client(
+            self.container_name
+        )
         try:
-            self.container_client = self.blob_service_client.create_container(
-                self.container_name
-            )
+            self.container_client.create_container()
         except:
             pass
+        self.index_ttl = index_ttl
+        self._names = None
+        self._name_set = None
+        self._index_loaded_at = 0.0
+        self._index_lock = threading.Lock()
 
     def __repr__(self) -> str:
         """
@@ -45,14 +83,19 @@ class AzureStorage:
     def __len__(self) -> int:
         """
         Return the number of files in the container.
+
+        Lists the container over the network when the local index is not
+        loaded yet or is older than ``index_ttl``.
         """
-        return len(self.find_file())
+        return len(self._index())
 
     def __getitem__(self, index: int) -> str:
         """
-        Get the file name at the specified index in the container.
+        Get the file name at the specified index in the container, in sorted order.
+
+        Like len(), this lists the container when the local index is stale.
         """
-        files = self.find_file()
+        files = self._sorted_index()
         if 0 <= index < len(files):
             return files[index]
         else:
@@ -61,8 +104,64 @@ class AzureStorage:
     def __contains__(self, item: str) -> bool:
         """
         Check if a file with the given name exists in the container.
+
+        Like len(), this lists the container when the local index is stale.
+        """
+        return item in self._index()
+
+    def _index(self) -> Set[str]:
+        names = self._name_set
+        if names is None or (
+            self.index_ttl is not None
+            and time.monotonic() - self._index_loaded_at > self.index_ttl
+        ):
+            names = self._reload_index()
+        return names
+
+    def _sorted_index(self) -> List[str]:
+        # The sorted view is rebuilt on demand after uploads and deletions
+        # rather than kept sorted on every change.
+        self._index()
+        with self._index_lock:
+            if self._names is None:
+                self._names = sorted(self._name_set or ())
+            return self._names
+
+    def _index_add(self, name: str) -> None:
+        with self._index_lock:
+            if self._name_set is not None and name not in self._name_set:
+                self._name_set.add(name)
+                self._names = None
+
+    def _index_discard(self, name: str) -> None:
+        with self._index_lock:
+            if self._name_set is not None and name in self._name_set:
+                self._name_set.discard(name)
+                self._names = None
+
+    def _reload_index(self) -> Set[str]:
+        with measure(
+            self.instrumentation,
+            "AzureStorage",
+            "list_blobs",
+            self.container_client.url,
+        ):
+            names = set(self.iter_files())
+        with self._index_lock:
+            self._name_set = names
+            self._names = None
+            self._index_loaded_at = time.monotonic()
+        return names
+
+    def refresh_index(self) -> List[str]:
+        """
+        Reloads the local blob-name index from the container.
+
+        Returns:
+            List[str]: The sorted file names in the container.
         """
-        return item in self.find_file()
+        self._reload_index()
+        return list(self._sorted_index())
 
     def create_file(self, file_rb: Any, file_name_in_the_cloud: str) -> None:
         """
@@ -75,7 +174,123 @@ class AzureStorage:
         blob_client = self.blob_service_client.get_blob_client(
             container=self.container_name, blob=file_name_in_the_cloud
         )
-        blob_client.upload_blob(file_rb, overwrite=True)
+        with measure(
+            self.instrumentation, "AzureStorage", "create_file", blob_client.url
+        ) as call:
+            if isinstance(file_rb, (bytes, bytearray, str)):
+                call.bytes_sent = len(file_rb)
+            blob_client.upload_blob(file_rb, overwrite=True)
+        self._index_add(file_name_in_the_cloud)
+
+    def upload_path(
+        self,
+        file_path: str,
+        file_name_in_the_cloud: str,
+        max_concurrency: int = 8,
+        block_size: int = 8 * 1024 * 1024,
+    ) -> None:
+        """
+        Uploads a local file as concurrently staged blocks.
+
+        Each worker reads its own block straight from disk, so memory use is
+        bounded by ``max_concurrency * block_size`` whatever the file size.
+
+        Parameters:
+            file_path (str): The path of the local file.
+            file_name_in_the_cloud (str): The name of the file in Azure Blob Storage.
+            max_concurrency (int, optional): The number of blocks uploaded in parallel.
+            block_size (int, optional): The size of each block in bytes.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=file_name_in_the_cloud
+        )
+        size = os.path.getsize(file_path)
+
+        def stage(index: int) -> BlobBlock:
+            block_id = base64.b64encode(f"{index:08d}".encode()).decode()
+            with open(file_path, "rb") as file:
+                file.seek(index * block_size)
+                blob_client.stage_block(block_id, file.read(block_size))
+            return BlobBlock(block_id=block_id)
+
+        with measure(
+            self.instrumentation, "AzureStorage", "upload_path", blob_client.url
+        ) as call:
+            call.bytes_sent = size
+            if size <= block_size:
+                with open(file_path, "rb") as file:
+                    blob_client.upload_blob(file, length=size, overwrite=True)
+            else:
+                with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+                    blocks = list(pool.map(stage, range(-(-size // block_size))))
+                blob_client.commit_block_list(blocks)
+        self._index_add(file_name_in_the_cloud)
+
+    def download_to_path(
+        self,
+        file_name_in_the_cloud: str,
+        file_path: str,
+        max_concurrency: int = 8,
+        range_size: int = 8 * 1024 * 1024,
+        use_mmap: bool = False,
+    ) -> None:
+        """
+        Downloads a file as concurrent byte ranges written straight to disk.
+
+        The destination is preallocated and every range is streamed into its
+        own region of the file (or of a memory map of it), so the blob is
+        never held in memory as a whole. Every range is read on the
+        condition that the blob still has the ETag it had when the download
+        started, so a blob overwritten mid-download fails the download
+        instead of mixing old and new content. The ranges are written to a
+        temporary file next to ``file_path`` that replaces it only once
+        every range has arrived, so a failed download leaves any existing
+        file untouched.
+
+        Parameters:
+            file_name_in_the_cloud (str): The name of the file in Azure Blob Storage.
+            file_path (str): The path of the local destination file.
+            max_concurrency (int, optional): The number of ranges downloaded in parallel.
+            range_size (int, optional): The size of each range in bytes.
+            use_mmap (bool, optional): Whether to write through a memory map of the file.
+
+        Raises:
+            ResourceModifiedError: If the blob changed during the download.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=self.container_name, blob=file_name_in_the_cloud
+        )
+        range_size = -(-range_size // mmap.ALLOCATIONGRANULARITY) * (
+            mmap.ALLOCATIONGRANULARITY
+        )
+
+        def fetch(offset: int) -> None:
+            length = min(range_size, size - offset)
+            downloader = blob_client.download_blob(
+                offset=offset,
+                length=length,
+                etag=properties.etag,
+                match_condition=MatchConditions.IfNotModified,
+            )
+            with open(part, "r+b") as file:
+                if use_mmap:
+                    with mmap.mmap(file.fileno(), length, offset=offset) as region:
+                        downloader.readinto(region)
+                else:
+                    file.seek(offset)
+                    downloader.readinto(file)
+
+        with measure(
+            self.instrumentation, "AzureStorage", "download_to_path", blob_client.url
+        ) as call:
+            properties = blob_client.get_blob_properties()
+            size = properties.size
+            with _replacing(file_path) as part:
+                with open(part, "wb") as file:
+                    file.truncate(size)
+                with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+                    list(pool.map(fetch, range(0, size, range_size)))
+            call.bytes_received = size
 
     def find_file(self) -> List[str]:
         """
@@ -84,11 +299,20 @@ class AzureStorage:
         Returns:
             List[str]: A list of file names in the container.
         """
-        blobs_list = self.container_client.list_blobs()
-        files = []
-        for blob in blobs_list:
-            files.append(blob.name)
-        return files
+        return self.refresh_index()
+
+    def iter_files(self, prefix: Optional[str] = None) -> Iterator[str]:
+        """
+        Lazily lists the files in the container, page by page.
+
+        Parameters:
+            prefix (str, optional): Only list files whose names start with this prefix.
+
+        Yields:
+            str: The name of each matching file.
+        """
+        for blob in self.container_client.list_blobs(name_starts_with=prefix):
+            yield blob.name
 
     def download_file(self, file_name_in_the_cloud: str) -> Optional[bytes]:
         """
@@ -103,10 +327,51 @@ class AzureStorage:
         blob_client = self.blob_service_client.get_blob_client(
             container=self.container_name, blob=file_name_in_the_cloud
         )
-        return blob_client.download_blob().readall()
+        with measure(
+            self.instrumentation, "AzureStorage", "download_file", blob_client.url
+        ) as call:
+            content = blob_client.download_blob().readall()
+            call.bytes_received = len(content)
+        return content
+
+    def delete_file(self, file_name_in_the_cloud: str) -> None:
+        """
+        Deletes a file from Azure Blob Storage.
+
+        Parameters:
+            file_name_in_the_cloud (str): The name of the file in Azure Blob Storage.
+        """
+        with measure(
+            self.instrumentation,
+            "AzureStorage",
+            "delete_file",
+            self.container_client.url,
+        ):
+            self.container_client.delete_blob(file_name_in_the_cloud)
+        self._index_discard(file_name_in_the_cloud)
 
     def delete_blob(self) -> None:
         """
         Deletes the container and all its contents.
         """
         self.container_client.delete_container()
+        with self._index_lock:
+            self._names = None
+            self._name_set = None
+
+
+@contextmanager
+def _replacing(path: str) -> Iterator[str]:
+    # Yields a temporary sibling of ``path`` to write to; it replaces
+    # ``path`` only if the block succeeds and is removed otherwise.
+    directory, name = os.path.split(os.path.abspath(path))
+    part = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.part")
+    try:
+        yield part
+        os.replace(part, path)
+    except BaseException:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,190 @@
+import hashlib
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from .storage import AzureStorage, _replacing
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+    ServiceResponseError,
+)
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TransferManager:
+    """
+    Moves many files between local disk and an AzureStorage container concurrently.
+
+    Transfers run over a bounded thread pool, transient failures are retried
+    with exponential backoff, and files whose size and MD5 already match the
+    other side are skipped. Downloads replace the local file only once they
+    have completed, so a failed one leaves the previous file intact.
+    """
+
+    def __init__(
+        self,
+        storage: AzureStorage,
+        max_workers: int = 16,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+    ) -> None:
+        """
+        Initialize the TransferManager object.
+
+        Parameters:
+            storage (AzureStorage): The container to transfer to and from.
+            max_workers (int, optional): The maximum number of concurrent transfers.
+            max_retries (int, optional): The number of retries for a transient failure.
+            backoff (float, optional): The base delay in seconds between retries.
+        """
+        self.storage = storage
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"TransferManager(storage={self.storage!r}, max_workers={self.max_workers})"
+        )
+
+    def upload(
+        self, pairs: Iterable[Tuple[str, str]], skip_unchanged: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Uploads many local files.
+
+        Parameters:
+            pairs (Iterable[Tuple[str, str]]): (local path, blob name) pairs.
+            skip_unchanged (bool, optional): Whether to skip blobs whose size and MD5 already match.
+
+        Returns:
+            Dict[str, Any]: The per-item results and aggregate counts, bytes and throughput.
+        """
+        return self._run(self._upload_one, pairs, skip_unchanged)
+
+    def download(
+        self, pairs: Iterable[Tuple[str, str]], skip_unchanged: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Downloads many blobs to local files.
+
+        Parameters:
+            pairs (Iterable[Tuple[str, str]]): (blob name, local path) pairs.
+            skip_unchanged (bool, optional): Whether to skip files whose size and MD5 already match.
+
+        Returns:
+            Dict[str, Any]: The per-item results and aggregate counts, bytes and throughput.
+        """
+        return self._run(self._download_one, pairs, skip_unchanged)
+
+    def _run(
+        self,
+        transfer: Callable[[str, str, bool], Dict[str, Any]],
+        pairs: Iterable[Tuple[str, str]],
+        skip_unchanged: bool,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            items = list(pool.map(lambda pair: transfer(*pair, skip_unchanged), pairs))
+        seconds = time.perf_counter() - started
+        moved = sum(item["bytes"] for item in items if item["status"] == "transferred")
+        return {
+            "items": items,
+            "transferred": sum(1 for item in items if item["status"] == "transferred"),
+            "skipped": sum(1 for item in items if item["status"] == "skipped"),
+            "failed": sum(1 for item in items if item["status"] == "failed"),
+            "bytes": moved,
+            "seconds": seconds,
+            "throughput": moved / seconds if seconds else 0.0,
+        }
+
+    def _upload_one(self, path: str, name: str, skip_unchanged: bool) -> Dict[str, Any]:
+        blob_client = self.storage.blob_service_client.get_blob_client(
+            container=self.storage.container_name, blob=name
+        )
+
+        def send() -> None:
+            with open(path, "rb") as file:
+                self.storage.create_file(file, name)
+
+        return self._transfer(
+            path, name, os.path.getsize(path), blob_client, path, skip_unchanged, send
+        )
+
+    def _download_one(
+        self, name: str, path: str, skip_unchanged: bool
+    ) -> Dict[str, Any]:
+        blob_client = self.storage.blob_service_client.get_blob_client(
+            container=self.storage.container_name, blob=name
+        )
+
+        def send() -> None:
+            with _replacing(path) as part, open(part, "wb") as file:
+                blob_client.download_blob().readinto(file)
+
+        size = os.path.getsize(path) if os.path.exists(path) else None
+        return self._transfer(name, path, size, blob_client, path, skip_unchanged, send)
+
+    def _transfer(
+        self,
+        source: str,
+        target: str,
+        local_size: Optional[int],
+        blob_client: Any,
+        local_path: str,
+        skip_unchanged: bool,
+        send: Callable[[], None],
+    ) -> Dict[str, Any]:
+        result = {"source": source, "target": target, "attempts": 0, "bytes": 0}
+        try:
+            if skip_unchanged and self._unchanged(blob_client, local_path, local_size):
+                result.update(status="skipped", bytes=local_size)
+                return result
+            while True:
+                result["attempts"] += 1
+                try:
+                    send()
+                    break
+                except Exception as e:
+                    if not _is_transient(e) or result["attempts"] > self.max_retries:
+                        raise
+                    delay = self.backoff * 2 ** (result["attempts"] - 1)
+                    time.sleep(random.uniform(0, delay))
+            result.update(status="transferred", bytes=os.path.getsize(local_path))
+        except Exception as e:
+            result.update(status="failed", error=str(e))
+        return result
+
+    def _unchanged(
+        self, blob_client: Any, local_path: str, local_size: Optional[int]
+    ) -> bool:
+        if local_size is None:
+            return False
+        try:
+            properties = blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            return False
+        remote_md5 = properties.content_settings.content_md5
+        if properties.size != local_size or not remote_md5:
+            return False
+        digest = hashlib.md5()
+        with open(local_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.digest() == bytes(remote_md5)
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, (ServiceRequestError, ServiceResponseError)):
+        return True
+    return (
+        isinstance(error, HttpResponseError)
+        and error.status_code in TRANSIENT_STATUS_CODES
+    )
@@ -1,13 +1,73 @@
-# pydatabridge/__init__.py
+# pydatabridgex/firebase/__init__.py
 
 """
-PyDataBridge is a Python package for seamless integration with Firebase services.
+Firebase clients for PyDataBridgeX.
+
+Names are resolved from their submodules on first access, so importing the
+package does not import requests (or httpx) until a client is used.
 """
 
-# Import submodules
-from .firebase.base import *
-from .firebase.authentication import *
-from .firebase.configuration import *
-from .firebase.firestore import *
-from .firebase.realtime import *
-from .firebase.storage import *
+from .._lazy import lazy_exports
+
+_EXPORTS = {
+    "FirebaseError": ".errors",
+    "FirebaseConnectionError": ".errors",
+    "FirebaseHTTPError": ".errors",
+    "CircuitOpenError": ".errors",
+    "parse_retry_after": ".errors",
+    "CircuitBreaker": ".resilience",
+    "ResiliencePolicy": ".resilience",
+    "FirebaseBase": ".base",
+    "AsyncFirebaseBase": ".base",
+    "JSONCodec": ".codec",
+    "OrjsonCodec": ".codec",
+    "MsgspecCodec": ".codec",
+    "CODECS": ".codec",
+    "get_codec": ".codec",
+    "Compression": ".compression",
+    "Transport": ".transport",
+    "AsyncTransport": ".transport",
+    "chunked": ".concurrency",
+    "bounded_map": ".concurrency",
+    "async_bounded_map": ".concurrency",
+    "AutoBatcher": ".batching",
+    "AsyncAutoBatcher": ".batching",
+    "RATE_WINDOW": ".writebehind",
+    "WriteBehindQueue": ".writebehind",
+    "CHANGED_SINCE": ".replica",
+    "OPERATORS": ".replica",
+    "DocumentReplica": ".replica",
+    "DocumentCache": ".cache",
+    "freeze": ".cache",
+    "CHUNK_GRANULARITY": ".upload",
+    "ResumableUpload": ".upload",
+    "Source": ".upload",
+    "SECURE_TOKEN_URL": ".tokens",
+    "EXPIRY_SKEW": ".tokens",
+    "Token": ".tokens",
+    "TokenManager": ".tokens",
+    "IMPORT_USERS_LIMIT": ".authentication",
+    "GET_USERS_LIMIT": ".authentication",
+    "DELETE_USERS_LIMIT": ".authentication",
+    "Authentication": ".authentication",
+    "AsyncAuthentication": ".authentication",
+    "Configuration": ".configuration",
+    "Firestore": ".firestore",
+    "AsyncFirestore": ".firestore",
+    "STREAM_HEADERS": ".stream",
+    "StreamEvent": ".stream",
+    "Snapshot": ".stream",
+    "Listener": ".stream",
+    "listen_async": ".stream",
+    "MAX_WRITE_BYTES": ".realtime",
+    "PUSH_CHARS": ".realtime",
+    "RealTime": ".realtime",
+    "AsyncRealTime": ".realtime",
+    "push_id": ".realtime",
+    "Storage": ".storage",
+    "AsyncStorage": ".storage",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -1,23 +1,71 @@
-from typing import Dict, Any
-from pydatabridge.pydatabridge import Configuration
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+from .configuration import Configuration
+from .base import FirebaseBase, AsyncFirebaseBase
+from .batching import BATCH_GET_UNSUPPORTED, AsyncAutoBatcher, AutoBatcher
+from .errors import FirebaseError, FirebaseHTTPError
+from .resilience import ResiliencePolicy
+from .concurrency import async_bounded_map, bounded_map, chunked
+from .tokens import TokenManager
+
+# The largest batches the Admin API accepts per request.
+IMPORT_USERS_LIMIT = 1000
+GET_USERS_LIMIT = 100
+DELETE_USERS_LIMIT = 1000
 
 
 class Authentication(FirebaseBase):
     """
     Class for Firebase Authentication operations.
 
+    Signed-in users' ID tokens are cached in ``tokens`` and refreshed in the
+    background before they expire; attach() makes other clients send a
+    user's token without calling the auth service.
+
     Args:
         config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+        tokens (TokenManager, optional): The token cache.
+
+    Attributes:
+        batcher (Optional[AutoBatcher]): Coalesces concurrent get_user calls, once enabled.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self,
+        config: Configuration,
+        policy: Optional[ResiliencePolicy] = None,
+        tokens: Optional[TokenManager] = None,
+    ) -> None:
         """
         Initializes the Authentication class with the provided configuration.
 
         Args:
             config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+            tokens (TokenManager, optional): The token cache. Defaults to a new
+                TokenManager using the ``apiKey`` of ``firebase_config``.
         """
-        super().__init__(config)
+        super().__init__(config, policy)
+        self.tokens = (
+            tokens
+            if tokens is not None
+            else TokenManager(
+                config.get_transport(),
+                config.firebase_config.get("apiKey"),
+                policy=self.policy,
+            )
+        )
+        self.batcher = None
+        self._batch_get = True
 
     def __repr__(self) -> str:
         """
@@ -31,6 +79,33 @@ class Authentication(FirebaseBase):
         """
         return f"Authentication: Config={self.config}"
 
+    def enable_batching(
+        self, window: float = 0.002, max_batch: int = GET_USERS_LIMIT
+    ) -> "Authentication":
+        """
+        Batches get_user calls made concurrently from different threads.
+
+        Lookups arriving within ``window`` seconds of each other, up to
+        ``max_batch`` of them, are fetched with one batch request and
+        identical IDs are fetched once. Users missing from the batch
+        response are looked up singly, and so is every user once the server
+        answers the batch route with 404, 405 or 501, so each call returns
+        exactly what an unbatched get_user would.
+
+        Args:
+            window (float): Seconds to collect lookups before fetching.
+            max_batch (int): The most IDs fetched per request, up to GET_USERS_LIMIT.
+
+        Returns:
+            Authentication: This instance.
+
+        Raises:
+            ValueError: If max_batch is outside 1..GET_USERS_LIMIT.
+        """
+        _check_batch_size(max_batch, GET_USERS_LIMIT)
+        self.batcher = AutoBatcher(self._load_users, window, max_batch)
+        return self
+
     def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Creates a new user.
@@ -59,6 +134,8 @@ class Authentication(FirebaseBase):
         """
         Logs in a user with the provided email and password.
 
+        The ID token in the response is cached in ``tokens`` under the email.
+
         Args:
             email (str): The email address of the user.
             password (str): The password of the user.
@@ -66,9 +143,42 @@ class Authentication(FirebaseBase):
         Returns:
             dict: The response data.
         """
-        return self._send_request(
+        response = self._send_request(
             "GET", "login", params={"email": email, "password": password}
         )
+        if isinstance(response, dict) and "idToken" in response:
+            self.tokens.store(email, response)
+        return response
+
+    def session(self, email: str, password: str) -> str:
+        """
+        Returns a cached ID token for a user, logging in only when none is cached.
+
+        Args:
+            email (str): The email address of the user.
+            password (str): The password of the user.
+
+        Returns:
+            str: The ID token.
+        """
+        if email not in self.tokens:
+            self.login_user(email, password)
+        return self.tokens.get(email)
+
+    def attach(self, identity: Optional[str], *clients: FirebaseBase) -> None:
+        """
+        Sends an identity's cached ID token with every request made by the given clients.
+
+        Only the clients' own ``token_source`` is set, so other clients sharing
+        the configuration keep their identity.
+
+        Args:
+            identity (str, optional): The identity (email address for users
+                logged in with login_user); None makes the clients fall back
+                to ``config.token_source``.
+            *clients (FirebaseBase): The clients; defaults to this one.
+        """
+        _attach(self.tokens, identity, clients or (self,))
 
     def update_user(self, uid: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -93,7 +203,9 @@ class Authentication(FirebaseBase):
         Returns:
             dict: The response data.
         """
-        return self._send_request("GET", "", params={"uid": uid})
+        if self.batcher is None:
+            return self._get_one(uid)
+        return self.batcher.load(uid)
 
     def delete_user(self, uid: str) -> Dict[str, Any]:
         """
@@ -107,6 +219,131 @@ class Authentication(FirebaseBase):
         """
         return self._send_request("DELETE", "", data={"uid": uid})
 
+    def import_users(
+        self,
+        users: Iterable[Dict[str, Any]],
+        batch_size: int = IMPORT_USERS_LIMIT,
+        max_in_flight: int = 8,
+    ) -> Iterator[Union[str, Exception]]:
+        """
+        Creates or overwrites many users, sending batches concurrently.
+
+        Users are consumed lazily in batches of ``batch_size``, with at most
+        ``max_in_flight`` batches outstanding, so arbitrarily many users can
+        be streamed through in bounded memory.
+
+        Args:
+            users (Iterable[Dict[str, Any]]): The user records; each needs a ``uid``.
+            batch_size (int): Users per request, up to IMPORT_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            Iterator[Union[str, Exception]]: The uid of each imported
+            user, or the error for that user, in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..IMPORT_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, IMPORT_USERS_LIMIT)
+        return _flatten(
+            bounded_map(self._import_batch, chunked(users, batch_size), max_in_flight)
+        )
+
+    def get_users(
+        self,
+        uids: Iterable[str],
+        batch_size: int = GET_USERS_LIMIT,
+        max_in_flight: int = 8,
+    ) -> Iterator[Union[Dict[str, Any], None, Exception]]:
+        """
+        Retrieves many users by ID, sending batches concurrently.
+
+        Args:
+            uids (Iterable[str]): The user IDs.
+            batch_size (int): IDs per request, up to GET_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            Iterator[Union[Dict[str, Any], None, Exception]]: Each user's
+            data, None if the user does not exist, or the error for that user,
+            in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..GET_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, GET_USERS_LIMIT)
+        return _flatten(
+            bounded_map(self._get_batch, chunked(uids, batch_size), max_in_flight)
+        )
+
+    def delete_users(
+        self,
+        uids: Iterable[str],
+        batch_size: int = DELETE_USERS_LIMIT,
+        max_in_flight: int = 8,
+    ) -> Iterator[Union[str, Exception]]:
+        """
+        Deletes many users by ID, sending batches concurrently.
+
+        Args:
+            uids (Iterable[str]): The user IDs.
+            batch_size (int): IDs per request, up to DELETE_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            Iterator[Union[str, Exception]]: The uid of each deleted
+            user, or the error for that user, in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..DELETE_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, DELETE_USERS_LIMIT)
+        return _flatten(
+            bounded_map(self._delete_batch, chunked(uids, batch_size), max_in_flight)
+        )
+
+    def _import_batch(self, users: List[Dict[str, Any]]) -> List[Any]:
+        try:
+            response = self._send_request("POST", "import", data={"users": users})
+        except Exception as e:
+            return [e] * len(users)
+        return _batch_results([user.get("uid") for user in users], response)
+
+    def _get_batch(self, uids: List[str]) -> List[Any]:
+        try:
+            found = self._fetch_users(uids)
+        except Exception as e:
+            return [e] * len(uids)
+        return [found.get(uid) for uid in uids]
+
+    def _fetch_users(self, uids: List[str]) -> Dict[str, Any]:
+        response = self._send_request("GET", "batch", params={"uids": uids})
+        return {user.get("uid"): user for user in response.get("users") or []}
+
+    def _load_users(self, uids: List[str]) -> List[Any]:
+        found = {}
+        if self._batch_get:
+            try:
+                found = self._fetch_users(uids)
+            except FirebaseHTTPError as e:
+                if e.status_code not in BATCH_GET_UNSUPPORTED:
+                    raise
+                self._batch_get = False
+        rest = [uid for uid in uids if uid not in found]
+        for uid, user in zip(rest, bounded_map(self._get_one, rest, len(rest) or 1)):
+            found[uid] = user
+        return [found[uid] for uid in uids]
+
+    def _get_one(self, uid: str) -> Dict[str, Any]:
+        return self._send_request("GET", "", params={"uid": uid})
+
+    def _delete_batch(self, uids: List[str]) -> List[Any]:
+        try:
+            response = self._send_request("DELETE", "batch", data={"uids": uids})
+        except Exception as e:
+            return [e] * len(uids)
+        return _batch_results(uids, response)
+
     def create_phone_verification(self, phone_number: str) -> Dict[str, Any]:
         """
         Creates a phone verification request.
@@ -147,3 +384,429 @@ class Authentication(FirebaseBase):
             dict: The response data.
         """
         return self._send_request("GET", "reset/password", params={"email": email})
+
+
+class AsyncAuthentication(AsyncFirebaseBase):
+    """
+    Class for asyncio Firebase Authentication operations.
+
+    Signed-in users' ID tokens are cached in ``tokens`` and refreshed in the
+    background before they expire; attach() makes other clients send a
+    user's token without calling the auth service.
+
+    Args:
+        config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+        tokens (TokenManager, optional): The token cache.
+
+    Attributes:
+        batcher (Optional[AsyncAutoBatcher]): Coalesces concurrent get_user calls, once enabled.
+    """
+
+    def __init__(
+        self,
+        config: Configuration,
+        policy: Optional[ResiliencePolicy] = None,
+        tokens: Optional[TokenManager] = None,
+    ) -> None:
+        """
+        Initializes the AsyncAuthentication class with the provided configuration.
+
+        Args:
+            config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+            tokens (TokenManager, optional): The token cache. Defaults to a new
+                TokenManager using the ``apiKey`` of ``firebase_config``.
+        """
+        super().__init__(config, policy)
+        self.tokens = (
+            tokens
+            if tokens is not None
+            else TokenManager(
+                config.get_transport(),
+                config.firebase_config.get("apiKey"),
+                policy=self.policy,
+                async_transport=self.transport,
+            )
+        )
+        self.batcher = None
+        self._batch_get = True
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncAuthentication(config={self.config})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncAuthentication: Config={self.config}"
+
+    def enable_batching(
+        self, window: float = 0.002, max_batch: int = GET_USERS_LIMIT
+    ) -> "AsyncAuthentication":
+        """
+        Batches get_user calls made concurrently from different coroutines.
+
+        Lookups arriving within ``window`` seconds of each other, up to
+        ``max_batch`` of them, are fetched with one batch request and
+        identical IDs are fetched once. Users missing from the batch
+        response are looked up singly, and so is every user once the server
+        answers the batch route with 404, 405 or 501, so each call returns
+        exactly what an unbatched get_user would.
+
+        Args:
+            window (float): Seconds to collect lookups before fetching.
+            max_batch (int): The most IDs fetched per request, up to GET_USERS_LIMIT.
+
+        Returns:
+            AsyncAuthentication: This instance.
+
+        Raises:
+            ValueError: If max_batch is outside 1..GET_USERS_LIMIT.
+        """
+        _check_batch_size(max_batch, GET_USERS_LIMIT)
+        self.batcher = AsyncAutoBatcher(self._load_users, window, max_batch)
+        return self
+
+    async def create_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Creates a new user.
+
+        Args:
+            user_data (dict): The user data.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request("POST", "", data={"userData": user_data})
+
+    async def send_verification_email(self, email: str) -> Dict[str, Any]:
+        """
+        Sends a verification email to the specified email address.
+
+        Args:
+            email (str): The email address.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request(
+            "GET", "verification/email", params={"email": email}
+        )
+
+    async def login_user(self, email: str, password: str) -> Dict[str, Any]:
+        """
+        Logs in a user with the provided email and password.
+
+        The ID token in the response is cached in ``tokens`` under the email.
+
+        Args:
+            email (str): The email address of the user.
+            password (str): The password of the user.
+
+        Returns:
+            dict: The response data.
+        """
+        response = await self._send_request(
+            "GET", "login", params={"email": email, "password": password}
+        )
+        if isinstance(response, dict) and "idToken" in response:
+            self.tokens.store(email, response)
+        return response
+
+    async def session(self, email: str, password: str) -> str:
+        """
+        Returns a cached ID token for a user, logging in only when none is cached.
+
+        Args:
+            email (str): The email address of the user.
+            password (str): The password of the user.
+
+        Returns:
+            str: The ID token.
+        """
+        if email not in self.tokens:
+            await self.login_user(email, password)
+        return await self.tokens.aget(email)
+
+    def attach(
+        self,
+        identity: Optional[str],
+        *clients: Union[AsyncFirebaseBase, FirebaseBase],
+    ) -> None:
+        """
+        Sends an identity's cached ID token with every request made by the given clients.
+
+        Asyncio clients get ``tokens.async_source``, so a token refreshed
+        before use does not block the event loop.
+
+        Args:
+            identity (str, optional): The identity (email address for users
+                logged in with login_user); None makes the clients fall back
+                to ``config.token_source``.
+            *clients (Union[AsyncFirebaseBase, FirebaseBase]): The clients;
+                defaults to this one.
+        """
+        _attach(self.tokens, identity, clients or (self,))
+
+    async def update_user(self, uid: str, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates a user's information.
+
+        Args:
+            uid (str): The user ID.
+            user_data (dict): The updated user data.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request(
+            "PUT", "", data={"uid": uid, "userData": user_data}
+        )
+
+    async def get_user(self, uid: str) -> Dict[str, Any]:
+        """
+        Retrieves user information by ID.
+
+        Args:
+            uid (str): The user ID.
+
+        Returns:
+            dict: The response data.
+        """
+        if self.batcher is None:
+            return await self._get_one(uid)
+        return await self.batcher.load(uid)
+
+    async def delete_user(self, uid: str) -> Dict[str, Any]:
+        """
+        Deletes a user by ID.
+
+        Args:
+            uid (str): The user ID.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request("DELETE", "", data={"uid": uid})
+
+    def import_users(
+        self,
+        users: Iterable[Dict[str, Any]],
+        batch_size: int = IMPORT_USERS_LIMIT,
+        max_in_flight: int = 16,
+    ) -> AsyncIterator[Union[str, Exception]]:
+        """
+        Creates or overwrites many users, awaiting batches concurrently.
+
+        Users are consumed lazily in batches of ``batch_size``, with at most
+        ``max_in_flight`` batches outstanding, so arbitrarily many users can
+        be streamed through in bounded memory.
+
+        Args:
+            users (Iterable[Dict[str, Any]]): The user records; each needs a ``uid``.
+            batch_size (int): Users per request, up to IMPORT_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            AsyncIterator[Union[str, Exception]]: The uid of each imported
+            user, or the error for that user, in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..IMPORT_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, IMPORT_USERS_LIMIT)
+        return _async_flatten(
+            async_bounded_map(
+                self._import_batch, chunked(users, batch_size), max_in_flight
+            )
+        )
+
+    def get_users(
+        self,
+        uids: Iterable[str],
+        batch_size: int = GET_USERS_LIMIT,
+        max_in_flight: int = 16,
+    ) -> AsyncIterator[Union[Dict[str, Any], None, Exception]]:
+        """
+        Retrieves many users by ID, awaiting batches concurrently.
+
+        Args:
+            uids (Iterable[str]): The user IDs.
+            batch_size (int): IDs per request, up to GET_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            AsyncIterator[Union[Dict[str, Any], None, Exception]]: Each user's
+            data, None if the user does not exist, or the error for that user,
+            in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..GET_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, GET_USERS_LIMIT)
+        return _async_flatten(
+            async_bounded_map(self._get_batch, chunked(uids, batch_size), max_in_flight)
+        )
+
+    def delete_users(
+        self,
+        uids: Iterable[str],
+        batch_size: int = DELETE_USERS_LIMIT,
+        max_in_flight: int = 16,
+    ) -> AsyncIterator[Union[str, Exception]]:
+        """
+        Deletes many users by ID, awaiting batches concurrently.
+
+        Args:
+            uids (Iterable[str]): The user IDs.
+            batch_size (int): IDs per request, up to DELETE_USERS_LIMIT.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            AsyncIterator[Union[str, Exception]]: The uid of each deleted
+            user, or the error for that user, in input order.
+
+        Raises:
+            ValueError: If batch_size is outside 1..DELETE_USERS_LIMIT.
+        """
+        _check_batch_size(batch_size, DELETE_USERS_LIMIT)
+        return _async_flatten(
+            async_bounded_map(
+                self._delete_batch, chunked(uids, batch_size), max_in_flight
+            )
+        )
+
+    async def _import_batch(self, users: List[Dict[str, Any]]) -> List[Any]:
+        try:
+            response = await self._send_request("POST", "import", data={"users": users})
+        except Exception as e:
+            return [e] * len(users)
+        return _batch_results([user.get("uid") for user in users], response)
+
+    async def _get_batch(self, uids: List[str]) -> List[Any]:
+        try:
+            found = await self._fetch_users(uids)
+        except Exception as e:
+            return [e] * len(uids)
+        return [found.get(uid) for uid in uids]
+
+    async def _fetch_users(self, uids: List[str]) -> Dict[str, Any]:
+        response = await self._send_request("GET", "batch", params={"uids": uids})
+        return {user.get("uid"): user for user in response.get("users") or []}
+
+    async def _load_users(self, uids: List[str]) -> List[Any]:
+        found = {}
+        if self._batch_get:
+            try:
+                found = await self._fetch_users(uids)
+            except FirebaseHTTPError as e:
+                if e.status_code not in BATCH_GET_UNSUPPORTED:
+                    raise
+                self._batch_get = False
+        rest = [uid for uid in uids if uid not in found]
+        index = 0
+        async for user in async_bounded_map(self._get_one, rest, len(rest) or 1):
+            found[rest[index]] = user
+            index += 1
+        return [found[uid] for uid in uids]
+
+    async def _get_one(self, uid: str) -> Dict[str, Any]:
+        return await self._send_request("GET", "", params={"uid": uid})
+
+    async def _delete_batch(self, uids: List[str]) -> List[Any]:
+        try:
+            response = await self._send_request("DELETE", "batch", data={"uids": uids})
+        except Exception as e:
+            return [e] * len(uids)
+        return _batch_results(uids, response)
+
+    async def create_phone_verification(self, phone_number: str) -> Dict[str, Any]:
+        """
+        Creates a phone verification request.
+
+        Args:
+            phone_number (str): The phone number.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request(
+            "POST", "phone", data={"phoneNumber": phone_number}
+        )
+
+    async def verify_phone_verification(
+        self, verification_id: str, otp: str
+    ) -> Dict[str, Any]:
+        """
+        Verifies a phone verification request.
+
+        Args:
+            verification_id (str): The verification ID.
+            otp (str): The one-time password.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request(
+            "GET", "phone", params={"verificationId": verification_id, "otp": otp}
+        )
+
+    async def reset_password(self, email: str) -> Dict[str, Any]:
+        """
+        Resets the password for a user.
+
+        Args:
+            email (str): The email address.
+
+        Returns:
+            dict: The response data.
+        """
+        return await self._send_request(
+            "GET", "reset/password", params={"email": email}
+        )
+
+
+def _attach(
+    tokens: TokenManager,
+    identity: Optional[str],
+    clients: Iterable[Union[AsyncFirebaseBase, FirebaseBase]],
+) -> None:
+    for client in clients:
+        if identity is None:
+            client.token_source = None
+        elif isinstance(client, AsyncFirebaseBase):
+            client.token_source = tokens.async_source(identity)
+        else:
+            client.token_source = tokens.source(identity)
+
+
+def _check_batch_size(batch_size: int, limit: int) -> None:
+    if not 1 <= batch_size <= limit:
+        raise ValueError(f"batch_size must be between 1 and {limit}")
+
+
+def _flatten(batches: Iterator[List[Any]]) -> Iterator[Any]:
+    for results in batches:
+        yield from results
+
+
+async def _async_flatten(batches: AsyncIterator[List[Any]]) -> AsyncIterator[Any]:
+    async for results in batches:
+        for result in results:
+            yield result
+
+
+def _batch_results(uids: List[str], response: Dict[str, Any]) -> List[Any]:
+    # Batch responses list only the failures, by index within the batch.
+    results = list(uids)
+    for error in response.get("errors") or []:
+        index = error.get("index")
+        if isinstance(index, int) and 0 <= index < len(uids):
+            results[index] = FirebaseError(
+                f"User '{uids[index]}' failed: {error.get('reason') or error}"
+            )
+    return results
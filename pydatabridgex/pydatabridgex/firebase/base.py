@@ -1,6 +1,19 @@
-from typing import Dict, Any
-from pydatabridge.pydatabridge import Configuration
+import inspect
+import time
+from typing import Callable, Dict, Any, Optional, Tuple
+from .configuration import Configuration
 import requests
+from urllib3.exceptions import NewConnectionError
+from .errors import (
+    FirebaseConnectionError,
+    FirebaseError,
+    FirebaseHTTPError,
+    parse_retry_after,
+)
+from .resilience import ResiliencePolicy
+from .codec import JSON_HEADERS
+from .compression import Compression, _wire_bytes
+from ..instrumentation import measure
 
 
 class FirebaseBase:
@@ -9,18 +22,45 @@ class FirebaseBase:
 
     Args:
         config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+
+    Attributes:
+        compression (Optional[Compression]): The compression settings and counters,
+            taken from the configuration; assign another instance to change them
+            for this client only.
+        token_source (Optional[Callable[[], str]]): Returns the ID token sent by
+            this client only; when None, ``config.token_source`` is used.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
         """
         Initializes the FirebaseBase class with the provided configuration.
 
         Args:
             config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+                Defaults to a new ResiliencePolicy.
         """
         self.config = config
-        self.headers = self.config.produce_headers()
+        self.policy = policy if policy is not None else ResiliencePolicy()
+        self._headers = self.config.produce_headers()
+        self._headers_version = self.config.version
+        self.compression = self.config.compression
         self.base_url = self.config.base_url
+        self.transport = self.config.get_transport()
+        self.token_source = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        The request headers, refreshed whenever the configuration changes.
+        """
+        if self._headers_version != self.config.version:
+            self._headers = self.config.produce_headers()
+            self._headers_version = self.config.version
+        return self._headers
 
     def __repr__(self) -> str:
         """
@@ -53,36 +93,451 @@ class FirebaseBase:
         data: Dict[str, Any] = None,
         params: Dict[str, Any] = None,
         files: Dict[str, Any] = None,
-    ) -> Dict[str, Any]:
+        url: Optional[str] = None,
+        schema: Any = None,
+    ) -> Any:
         """
         Sends a request to the Firebase API.
 
         Args:
-            method (str): The HTTP method (GET, POST, PUT, DELETE).
+            method (str): The HTTP method (GET, POST, PUT, PATCH, DELETE).
             endpoint (str): The API endpoint.
-            data (dict): The request body data (for POST, PUT, DELETE methods).
+            data (dict): The request body data (for POST, PUT, PATCH, DELETE methods).
             params (dict): The request URL parameters.
             files (dict): The files to upload (for POST method).
+            url (str, optional): A full URL to send to instead of ``base_url``; the
+                endpoint then only labels the request in metrics. Neither the
+                configuration headers, which carry the service account, nor the
+                client's ID token are sent there.
+            schema (Any, optional): A type, such as a ``msgspec.Struct`` or dataclass,
+                to decode the response into instead of plain dicts and lists.
 
         Returns:
-            dict: The JSON response from the API.
-        """
-        url = f"{self.base_url}/{endpoint}"
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=self.headers, params=params)
-            elif method == "POST":
-                response = requests.post(
-                    url, headers=self.headers, json=data, files=files
+            Any: The decoded JSON response from the API.
+
+        Raises:
+            FirebaseHTTPError: If the server answered with an error status.
+            FirebaseConnectionError: If no response was received.
+            CircuitOpenError: If the endpoint's circuit breaker is open.
+            FirebaseError: If the request body cannot be encoded as JSON.
+        """
+        compress = url is None
+        if url is None:
+            url = f"{self.base_url}/{endpoint}"
+            headers = _authorize(self.headers, _token_source(self))
+        else:
+            headers = {}
+        if data is not None and files is None:
+            data = _encode(self.config.codec, data)
+            headers = dict(headers, **JSON_HEADERS)
+        data, headers, fallback = _compress(
+            self.compression, url, data, headers, compress and files is None
+        )
+        if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        breaker = self.policy.breaker
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker is not None and breaker.before(url)
+            try:
+                result = self._attempt_request(
+                    method, endpoint, url, headers, data, params, files, schema
                 )
-            elif method == "PUT":
-                response = requests.put(url, headers=self.headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers, json=data)
+            except FirebaseError as e:
+                if fallback is not None and getattr(e, "status_code", None) == 415:
+                    self.compression.reject(url)
+                    data, headers = fallback
+                    fallback = None
+                    continue
+                if breaker is not None:
+                    if e.transient:
+                        breaker.record_failure(url)
+                    else:
+                        breaker.record_success(url)
+                if not self.policy.should_retry(method, e, attempt):
+                    raise
+                delay = self.policy.delay(attempt, e.retry_after)
             else:
-                raise ValueError(f"Unsupported method: {method}")
+                if breaker is not None:
+                    breaker.record_success(url)
+                return result
+            finally:
+                if probe:
+                    breaker.release(url)
+            _rewind(files)
+            time.sleep(delay)
+
+    def _attempt_request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Any,
+        params: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, Any]],
+        schema: Any,
+    ) -> Any:
+        with measure(
+            self.config.instrumentation,
+            type(self).__name__,
+            f"{method} /{endpoint}",
+            url,
+        ) as call:
+            try:
+                response = self.transport.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    data=data,
+                    files=files,
+                )
+            except requests.exceptions.RequestException as e:
+                raise _request_error(e) from e
+            _observe(call, response.request, response, response.elapsed)
+            if self.compression is not None:
+                self.compression.record_response(
+                    _wire_bytes(response),
+                    len(response.content),
+                    response.headers.get("Content-Encoding"),
+                )
+            if response.status_code >= 400:
+                raise _http_error(
+                    response.status_code,
+                    response.reason,
+                    url,
+                    response.text,
+                    response.headers.get("Retry-After"),
+                )
+            return _decode(call, response, url, self.config.codec, schema)
+
+
+class AsyncFirebaseBase:
+    """
+    Base class for asyncio Firebase operations.
+
+    Args:
+        config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+
+    Attributes:
+        compression (Optional[Compression]): The compression settings and counters,
+            taken from the configuration; assign another instance to change them
+            for this client only.
+        token_source (Optional[Callable[[], Union[str, Awaitable[str]]]]): Returns
+            the ID token sent by this client only, and may be a coroutine function
+            such as ``TokenManager.async_source(identity)``; when None,
+            ``config.token_source`` is used.
+    """
+
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
+        """
+        Initializes the AsyncFirebaseBase class with the provided configuration.
+
+        Args:
+            config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+                Defaults to a new ResiliencePolicy.
+        """
+        self.config = config
+        self.policy = policy if policy is not None else ResiliencePolicy()
+        self._headers = self.config.produce_headers()
+        self._headers_version = self.config.version
+        self.compression = self.config.compression
+        self.base_url = self.config.base_url
+        self.transport = self.config.get_async_transport()
+        self.token_source = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """
+        The request headers, refreshed whenever the configuration changes.
+        """
+        if self._headers_version != self.config.version:
+            self._headers = self.config.produce_headers()
+            self._headers_version = self.config.version
+        return self._headers
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncFirebaseBase(config={self.config})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncFirebaseBase: Config={self.config}"
+
+    def __len__(self) -> int:
+        """
+        Return the length of the object.
+        """
+        return len(self.config)
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Get an item from the object.
+        """
+        return self.config[key]
+
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Dict[str, Any] = None,
+        params: Dict[str, Any] = None,
+        files: Dict[str, Any] = None,
+        url: Optional[str] = None,
+        schema: Any = None,
+    ) -> Any:
+        """
+        Sends a request to the Firebase API without blocking the event loop.
+
+        Args:
+            method (str): The HTTP method (GET, POST, PUT, PATCH, DELETE).
+            endpoint (str): The API endpoint.
+            data (dict): The request body data (for POST, PUT, PATCH, DELETE methods).
+            params (dict): The request URL parameters.
+            files (dict): The files to upload (for POST method).
+            url (str, optional): A full URL to send to instead of ``base_url``; the
+                endpoint then only labels the request in metrics. Neither the
+                configuration headers, which carry the service account, nor the
+                client's ID token are sent there.
+            schema (Any, optional): A type, such as a ``msgspec.Struct`` or dataclass,
+                to decode the response into instead of plain dicts and lists.
+
+        Returns:
+            Any: The decoded JSON response from the API.
+
+        Raises:
+            FirebaseHTTPError: If the server answered with an error status.
+            FirebaseConnectionError: If no response was received.
+            CircuitOpenError: If the endpoint's circuit breaker is open.
+            FirebaseError: If the request body cannot be encoded as JSON.
+        """
+        compress = url is None
+        if url is None:
+            url = f"{self.base_url}/{endpoint}"
+            headers = self.headers
+            token = await _token(self)
+            if token is not None:
+                headers = dict(headers, Authorization=f"Bearer {token}")
+        else:
+            headers = {}
+        if data is not None and files is None:
+            data = _encode(self.config.codec, data)
+            headers = dict(headers, **JSON_HEADERS)
+        data, headers, fallback = _compress(
+            self.compression, url, data, headers, compress and files is None
+        )
+        if method not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+            raise ValueError(f"Unsupported method: {method}")
+        breaker = self.policy.breaker
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = breaker is not None and breaker.before(url)
+            try:
+                result = await self._attempt_request(
+                    method, endpoint, url, headers, data, params, files, schema
+                )
+            except FirebaseError as e:
+                if fallback is not None and getattr(e, "status_code", None) == 415:
+                    self.compression.reject(url)
+                    data, headers = fallback
+                    fallback = None
+                    continue
+                if breaker is not None:
+                    if e.transient:
+                        breaker.record_failure(url)
+                    else:
+                        breaker.record_success(url)
+                if not self.policy.should_retry(method, e, attempt):
+                    raise
+                delay = self.policy.delay(attempt, e.retry_after)
+            else:
+                if breaker is not None:
+                    breaker.record_success(url)
+                return result
+            finally:
+                if probe:
+                    breaker.release(url)
+            _rewind(files)
+            await _sleep(delay)
+
+    async def _attempt_request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        headers: Dict[str, str],
+        data: Any,
+        params: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, Any]],
+        schema: Any,
+    ) -> Any:
+        import httpx
+
+        with measure(
+            self.config.instrumentation,
+            type(self).__name__,
+            f"{method} /{endpoint}",
+            url,
+        ) as call:
+            try:
+                response = await self.transport.request(
+                    method,
+                    url,
+                    headers=headers,
+                    params=params,
+                    content=data if files is None else None,
+                    data=data if files is not None else None,
+                    files=files,
+                )
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                raise FirebaseConnectionError(str(e), retry_safe=True) from e
+            except httpx.TransportError as e:
+                raise FirebaseConnectionError(str(e)) from e
+            except httpx.HTTPError as e:
+                raise FirebaseError(str(e)) from e
+            _observe(call, response.request, response, response.elapsed)
+            if self.compression is not None:
+                self.compression.record_response(
+                    _wire_bytes(response),
+                    len(response.content),
+                    response.headers.get("Content-Encoding"),
+                )
+            if response.status_code >= 400:
+                raise _http_error(
+                    response.status_code,
+                    response.reason_phrase,
+                    url,
+                    response.text,
+                    response.headers.get("Retry-After"),
+                )
+            return _decode(call, response, url, self.config.codec, schema)
+
+
+def _authorize(
+    headers: Dict[str, str], token_source: Optional[Callable[[], str]]
+) -> Dict[str, str]:
+    if token_source is None:
+        return headers
+    return dict(headers, Authorization=f"Bearer {token_source()}")
+
+
+def _token_source(client: Any) -> Optional[Callable[[], Any]]:
+    if client.token_source is not None:
+        return client.token_source
+    return client.config.token_source
+
+
+async def _token(client: Any) -> Optional[str]:
+    # Async clients accept token sources returning an awaitable, so that a
+    # refresh does not block the event loop.
+    source = _token_source(client)
+    if source is None:
+        return None
+    token = source()
+    if inspect.isawaitable(token):
+        token = await token
+    return token
+
+
+async def _sleep(delay: float) -> None:
+    # asyncio is imported here so synchronous users never pay for it.
+    import asyncio
+
+    await asyncio.sleep(delay)
+
+
+def _compress(
+    compression: Optional[Compression],
+    url: str,
+    data: Any,
+    headers: Dict[str, str],
+    enabled: bool,
+) -> Tuple[Any, Dict[str, str], Optional[Tuple[Any, Dict[str, str]]]]:
+    # Returns the body and headers to send, plus the uncompressed pair to
+    # resend if the server refuses the compressed body.
+    if compression is None:
+        return data, headers, None
+    plain = dict(headers, **{"Accept-Encoding": compression.accept_encoding})
+    if not enabled or data is None:
+        return data, plain, None
+    body, compressed = compression.compress(data, url)
+    if not compressed:
+        return data, plain, None
+    return body, dict(plain, **compression.headers), (data, plain)
+
+
+def _http_error(
+    status_code: int, reason: str, url: str, body: str, retry_after: Optional[str]
+) -> FirebaseHTTPError:
+    return FirebaseHTTPError(
+        status_code,
+        f"{status_code} {reason} for url: {url}",
+        body=body,
+        retry_after=parse_retry_after(retry_after),
+    )
+
+
+def _observe(call: Any, request: Any, response: Any, elapsed: Any) -> None:
+    call.status_code = response.status_code
+    call.bytes_sent = int(request.headers.get("Content-Length") or 0)
+    call.bytes_received = len(response.content)
+    call.phases["response"] = elapsed.total_seconds()
+
+
+def _decode(call: Any, response: Any, url: str, codec: Any, schema: Any) -> Any:
+    started = time.perf_counter()
+    try:
+        result = codec.loads(response.content, schema)
+    except ValueError as e:
+        raise FirebaseError(f"Could not decode the response from {url}: {e}") from e
+    call.phases["decode"] = time.perf_counter() - started
+    return result
+
+
+def _encode(codec: Any, data: Any) -> bytes:
+    try:
+        return codec.dumps(data)
+    except (TypeError, ValueError, OverflowError) as e:
+        raise FirebaseError(f"Cannot encode the request body as JSON: {e}") from e
+
+
+def _request_error(error: requests.exceptions.RequestException) -> FirebaseError:
+    # Maps a requests failure onto the typed errors _send_request raises.
+    response = error.response
+    if response is not None and response.status_code >= 400:
+        return _http_error(
+            response.status_code,
+            response.reason,
+            response.url,
+            response.text,
+            response.headers.get("Retry-After"),
+        )
+    if isinstance(
+        error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+    ):
+        return FirebaseConnectionError(str(error), retry_safe=_connect_failed(error))
+    return FirebaseError(str(error))
+
+
+def _connect_failed(error: requests.exceptions.RequestException) -> bool:
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
 
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+def _rewind(files: Optional[Dict[str, Any]]) -> None:
+    for file in (files or {}).values():
+        if hasattr(file, "seek"):
+            file.seek(0)
@@ -0,0 +1,281 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+# Statuses showing that the server has no route for a batch read, so
+# clients fall back to single reads.
+BATCH_GET_UNSUPPORTED = (404, 405, 501)
+
+
+class AutoBatcher:
+    """
+    Coalesces single-key loads from many threads into batched fetches.
+
+    The first load() of a batch waits ``window`` seconds while other threads
+    add their keys; the batch is then fetched with one call and each caller
+    gets its own result. A batch is fetched early once it holds ``max_batch``
+    keys. Identical keys within a batch are fetched once and share the result.
+
+    Args:
+        fetch (Callable[[List[Any]], List[Any]]): Fetches a batch; returns one
+            result per item, in order. An exception in a slot is raised to
+            that caller only.
+        window (float): Seconds to collect keys before fetching.
+        max_batch (int): The most keys fetched together.
+        key (Callable[[Any], Hashable], optional): Maps an item to the key used
+            to detect duplicates. Defaults to the item itself.
+
+    Methods:
+        load(item): Returns the result for one item.
+        stats(): Returns the load, batch and deduplication counters.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[Any]], List[Any]],
+        window: float = 0.002,
+        max_batch: int = 100,
+        key: Optional[Callable[[Any], Hashable]] = None,
+    ) -> None:
+        """
+        Initializes the AutoBatcher.
+
+        Args:
+            fetch (Callable[[List[Any]], List[Any]]): Fetches a batch, returning one result per item.
+            window (float): Seconds to collect keys before fetching.
+            max_batch (int): The most keys fetched together.
+            key (Callable[[Any], Hashable], optional): Maps an item to its deduplication key.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self.key = key if key is not None else _identity
+        self._pending = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._loads = 0
+        self._batches = 0
+        self._fetched = 0
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AutoBatcher(window={self.window}, max_batch={self.max_batch})"
+
+    def load(self, item: Any) -> Any:
+        """
+        Returns the result for one item, fetched together with concurrent loads.
+
+        Args:
+            item (Any): The item to fetch.
+
+        Returns:
+            Any: The item's result.
+
+        Raises:
+            Exception: The error for this item, or the error that failed its batch.
+        """
+        key = self.key(item)
+        with self._lock:
+            self._loads += 1
+            entry = self._pending.get(key)
+            if entry is not None:
+                future, first, full = entry[1], False, False
+            else:
+                future = Future()
+                self._pending[key] = (item, future)
+                first = len(self._pending) == 1
+                full = len(self._pending) >= self.max_batch
+            generation = self._generation
+        if full:
+            self._flush(generation)
+        elif first:
+            time.sleep(self.window)
+            self._flush(generation)
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the load, batch and deduplication counters.
+
+        Returns:
+            Dict[str, int]: The loads requested, batches fetched, keys fetched
+            and loads served by a duplicate key.
+        """
+        with self._lock:
+            return _stats(self._loads, self._batches, self._fetched)
+
+    def _flush(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation or not self._pending:
+                return
+            batch = self._pending
+            self._pending = {}
+            self._generation += 1
+            self._batches += 1
+            self._fetched += len(batch)
+        entries = list(batch.values())
+        try:
+            results = self.fetch([item for item, _ in entries])
+        except Exception as e:
+            for _, future in entries:
+                future.set_exception(e)
+            return
+        _resolve(entries, results)
+
+
+class AsyncAutoBatcher:
+    """
+    Coalesces single-key loads from many coroutines into batched fetches.
+
+    The asyncio counterpart of :class:`AutoBatcher`: the first load() of a
+    batch schedules the fetch ``window`` seconds later on the event loop, and
+    a cancelled caller does not cancel the fetch other callers are waiting on.
+
+    Args:
+        fetch (Callable[[List[Any]], Awaitable[List[Any]]]): Fetches a batch;
+            returns one result per item, in order.
+        window (float): Seconds to collect keys before fetching.
+        max_batch (int): The most keys fetched together.
+        key (Callable[[Any], Hashable], optional): Maps an item to the key used
+            to detect duplicates. Defaults to the item itself.
+
+    Methods:
+        load(item): Returns the result for one item.
+        stats(): Returns the load, batch and deduplication counters.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[List[Any]], Awaitable[List[Any]]],
+        window: float = 0.002,
+        max_batch: int = 100,
+        key: Optional[Callable[[Any], Hashable]] = None,
+    ) -> None:
+        """
+        Initializes the AsyncAutoBatcher.
+
+        Args:
+            fetch (Callable[[List[Any]], Awaitable[List[Any]]]): Fetches a batch.
+            window (float): Seconds to collect keys before fetching.
+            max_batch (int): The most keys fetched together.
+            key (Callable[[Any], Hashable], optional): Maps an item to its deduplication key.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.fetch = fetch
+        self.window = window
+        self.max_batch = max_batch
+        self.key = key if key is not None else _identity
+        self._pending = {}
+        self._timer = None
+        self._tasks = set()
+        self._loads = 0
+        self._batches = 0
+        self._fetched = 0
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncAutoBatcher(window={self.window}, max_batch={self.max_batch})"
+
+    async def load(self, item: Any) -> Any:
+        """
+        Returns the result for one item, fetched together with concurrent loads.
+
+        Args:
+            item (Any): The item to fetch.
+
+        Returns:
+            Any: The item's result.
+
+        Raises:
+            Exception: The error for this item, or the error that failed its batch.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        key = self.key(item)
+        self._loads += 1
+        entry = self._pending.get(key)
+        if entry is not None:
+            future = entry[1]
+        else:
+            future = loop.create_future()
+            self._pending[key] = (item, future)
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif len(self._pending) == 1:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the load, batch and deduplication counters.
+
+        Returns:
+            Dict[str, int]: The loads requested, batches fetched, keys fetched
+            and loads served by a duplicate key.
+        """
+        return _stats(self._loads, self._batches, self._fetched)
+
+    def _dispatch(self) -> None:
+        import asyncio
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        entries = list(self._pending.values())
+        self._pending = {}
+        self._batches += 1
+        self._fetched += len(entries)
+        task = asyncio.get_running_loop().create_task(self._run(entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, entries: List[tuple]) -> None:
+        try:
+            results = await self.fetch([item for item, _ in entries])
+        except Exception as e:
+            for _, future in entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        _resolve(entries, results)
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _stats(loads: int, batches: int, fetched: int) -> Dict[str, int]:
+    return {
+        "loads": loads,
+        "batches": batches,
+        "keys_fetched": fetched,
+        "deduplicated": loads - fetched,
+    }
+
+
+def _resolve(entries: List[tuple], results: List[Any]) -> None:
+    from .errors import FirebaseError
+
+    if len(results) != len(entries):
+        error = FirebaseError(
+            f"Batch fetch returned {len(results)} results for {len(entries)} keys"
+        )
+        results = [error] * len(entries)
+    for (_, future), result in zip(entries, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
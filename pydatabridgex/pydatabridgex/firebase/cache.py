@@ -0,0 +1,162 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def freeze(value: Any) -> Hashable:
+    """
+    Converts request parameters into a hashable cache key.
+
+    Args:
+        value (Any): The value to convert; dicts, lists and sets are frozen recursively.
+
+    Returns:
+        Hashable: A hashable equivalent of ``value``.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+class DocumentCache:
+    """
+    Size-bounded LRU read-through cache with a per-entry TTL.
+
+    Concurrent misses for the same key are coalesced into a single fetch;
+    a failed fetch is re-raised to every coalesced caller and not stored.
+
+    Args:
+        max_entries (int): The maximum number of cached responses.
+        ttl (float): The number of seconds a cached response stays valid.
+
+    Attributes:
+        hits (int): Reads served from the cache, including coalesced misses.
+        misses (int): Reads that triggered a fetch.
+        evictions (int): Entries dropped to stay within ``max_entries``.
+
+    Methods:
+        get_or_fetch(key, fetch): Returns the cached value or fetches and stores it.
+        invalidate(key): Drops one entry, or every entry when no key is given.
+        stats(): Returns the cache counters.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0) -> None:
+        """
+        Initializes an empty DocumentCache.
+
+        Args:
+            max_entries (int): The maximum number of cached responses.
+            ttl (float): The number of seconds a cached response stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"DocumentCache(max_entries={self.max_entries}, ttl={self.ttl})"
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached entries.
+        """
+        return len(self._entries)
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for ``key``, fetching and storing it on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            fetch (Callable[[], Any]): Called to load the value on a miss.
+
+        Returns:
+            Any: The cached or freshly fetched value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                generation = self._generation
+            else:
+                self.hits += 1
+        if not owner:
+            return future.result()
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                self._release(key, future)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._release(key, future)
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drops one entry, or every entry when no key is given.
+
+        Fetches already in flight when this is called are not stored, and
+        later reads start a fresh fetch instead of waiting on them.
+
+        Args:
+            key (Hashable, optional): The key to drop.
+        """
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+                self._inflight.clear()
+            else:
+                self._entries.pop(key, None)
+                self._inflight.pop(key, None)
+
+    def _release(self, key: Hashable, future: Future) -> None:
+        # An invalidation may have replaced this fetch with a newer one.
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache counters.
+
+        Returns:
+            Dict[str, int]: The hit, miss and eviction counts and the current size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,222 @@
+import dataclasses
+import json
+from typing import Any, Dict, Union
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+
+class JSONCodec:
+    """
+    Encodes request bodies to JSON bytes and decodes response bodies.
+
+    This base implementation uses the standard library and is the default.
+    OrjsonCodec and MsgspecCodec are several times faster but encode a few
+    values differently: NaN and infinities become null instead of being
+    rejected, and integers wider than 64 bits are rejected. Decoding works
+    on the raw response bytes, so no intermediate text copy of the body is
+    made; only a memoryview is copied, since the standard library cannot
+    read one.
+
+    Methods:
+        dumps(obj): Encodes a value to JSON bytes.
+        loads(data, schema): Decodes JSON, optionally into a typed schema.
+    """
+
+    name = "json"
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"{type(self).__name__}()"
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes a value to JSON bytes.
+
+        Args:
+            obj (Any): The value to encode.
+
+        Returns:
+            bytes: The UTF-8 encoded JSON.
+
+        Raises:
+            TypeError: If the value holds a type JSON cannot represent.
+            ValueError: If the value holds NaN or an infinity.
+        """
+        return json.dumps(obj, separators=(",", ":"), allow_nan=False).encode()
+
+    def loads(self, data: Buffer, schema: Any = None) -> Any:
+        """
+        Decodes JSON, optionally into a typed schema.
+
+        Args:
+            data (Buffer): The JSON document.
+            schema (Any, optional): A type to decode into, such as a
+                ``msgspec.Struct`` or dataclass, or ``Dict[str, Model]``.
+
+        Returns:
+            Any: The decoded value.
+
+        Raises:
+            ValueError: If the data is not valid JSON or does not match the schema.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        value = json.loads(data)
+        return value if schema is None else convert(value, schema)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    JSON codec backed by orjson (``pip install PyDataBridgeX[orjson]``).
+
+    Non-string dict keys are written as strings, as the standard library does.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        """
+        Initializes the codec.
+
+        Raises:
+            ImportError: If orjson is not installed.
+        """
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "The orjson codec requires orjson: pip install PyDataBridgeX[orjson]"
+            ) from e
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Buffer, schema: Any = None) -> Any:
+        value = self._orjson.loads(data)
+        return value if schema is None else convert(value, schema)
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    JSON codec backed by msgspec (``pip install PyDataBridgeX[msgspec]``).
+
+    Typed decoding validates and builds schema objects while parsing, without
+    creating intermediate dicts.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        """
+        Initializes the codec.
+
+        Raises:
+            ImportError: If msgspec is not installed.
+        """
+        try:
+            import msgspec
+        except ImportError as e:
+            raise ImportError(
+                "The msgspec codec requires msgspec: pip install PyDataBridgeX[msgspec]"
+            ) from e
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._decoders = {}
+        self._msgspec = msgspec
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: Buffer, schema: Any = None) -> Any:
+        if schema is None:
+            return self._decoder.decode(data)
+        decoder = self._decoders.get(schema)
+        if decoder is None:
+            decoder = self._decoders[schema] = self._msgspec.json.Decoder(schema)
+        return decoder.decode(data)
+
+
+CODECS = {
+    "orjson": OrjsonCodec,
+    "msgspec": MsgspecCodec,
+    "json": JSONCodec,
+}
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = None) -> JSONCodec:
+    """
+    Returns a codec by name, defaulting to the standard library.
+
+    The faster codecs are opt-in, so what goes on the wire does not depend
+    on which libraries happen to be installed.
+
+    Args:
+        codec (Union[str, JSONCodec], optional): A codec instance, one of
+            "json", "orjson" or "msgspec", or "auto" to pick orjson, then
+            msgspec, then the standard library. None means "json".
+
+    Returns:
+        JSONCodec: The codec.
+
+    Raises:
+        ValueError: If the name is unknown.
+        ImportError: If the named codec's library is not installed.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return JSONCodec()
+    if codec == "auto":
+        for cls in (OrjsonCodec, MsgspecCodec):
+            try:
+                return cls()
+            except ImportError:
+                continue
+        return JSONCodec()
+    cls = CODECS.get(codec)
+    if cls is None:
+        raise ValueError(f"Unknown JSON codec: {codec}")
+    return cls()
+
+
+def convert(value: Any, schema: Any) -> Any:
+    """
+    Converts decoded JSON into a typed schema.
+
+    msgspec is used when installed, which supports Structs, dataclasses,
+    TypedDicts and generic containers; otherwise only a dataclass can be
+    built, from a dict.
+
+    Args:
+        value (Any): The decoded JSON.
+        schema (Any): The type to convert into.
+
+    Returns:
+        Any: The converted value.
+
+    Raises:
+        ValueError: If the value does not match the schema.
+        TypeError: If the schema needs msgspec and msgspec is not installed.
+    """
+    try:
+        import msgspec
+    except ImportError:
+        if dataclasses.is_dataclass(schema) and isinstance(value, dict):
+            return _build(schema, value)
+        raise TypeError(
+            f"Decoding into {schema!r} requires msgspec: pip install PyDataBridgeX[msgspec]"
+        )
+    return msgspec.convert(value, schema)
+
+
+def _build(schema: Any, value: Dict[str, Any]) -> Any:
+    names = {field.name for field in dataclasses.fields(schema)}
+    try:
+        return schema(**{key: item for key, item in value.items() if key in names})
+    except TypeError as e:
+        raise ValueError(f"Cannot build {schema.__name__}: {e}") from e
@@ -0,0 +1,236 @@
+import gzip
+import threading
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+# Preferred request encodings, best ratio first.
+ENCODINGS = ("zstd", "br", "gzip")
+
+
+class Compression:
+    """
+    Compresses request bodies and counts the bytes saved in both directions.
+
+    Bodies of at least ``threshold`` bytes are compressed with ``encoding``
+    and sent with a ``Content-Encoding`` header; a body that does not shrink
+    is sent as is. HTTP has no way to ask a server which request encodings
+    it accepts, so the first 415 Unsupported Media Type answer from an
+    origin turns request compression off for that origin and the request is
+    resent uncompressed.
+
+    Responses are negotiated with ``Accept-Encoding`` and decompressed
+    incrementally by the HTTP library as the body is read (gzip and deflate
+    always; br and zstd when brotli or zstandard is installed).
+
+    Assign one instance to ``Configuration.compression`` to share it, or to a
+    client's ``compression`` attribute for per-client settings and counters.
+
+    Args:
+        encoding (str): The request encoding: "gzip", "br" or "zstd".
+        threshold (int): The smallest body, in bytes, worth compressing.
+        level (int, optional): The compression level; defaults to the
+            encoding's fast default.
+        accept_encoding (Sequence[str], optional): The response encodings to
+            advertise. Defaults to every encoding the HTTP library can decode.
+
+    Methods:
+        compress(body, url): Compresses a request body if worthwhile.
+        reject(url): Stops compressing requests to an origin.
+        record_response(wire_bytes, body_bytes, encoding): Counts a response.
+        stats(): Returns the counters and compression ratios.
+        reset(): Clears the counters.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        threshold: int = 1024,
+        level: Optional[int] = None,
+        accept_encoding: Optional[Sequence[str]] = None,
+    ) -> None:
+        """
+        Initializes the Compression settings with zeroed counters.
+
+        Args:
+            encoding (str): The request encoding: "gzip", "br" or "zstd".
+            threshold (int): The smallest body, in bytes, worth compressing.
+            level (int, optional): The compression level.
+            accept_encoding (Sequence[str], optional): The response encodings to advertise.
+
+        Raises:
+            ValueError: If the encoding is unknown.
+            ImportError: If the encoding's library is not installed.
+        """
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self._compress = _compressor(encoding, level)
+        self.accept_encoding = ", ".join(
+            accept_encoding if accept_encoding is not None else _decodable()
+        )
+        self.headers = {"Content-Encoding": encoding}
+        self._rejected = set()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"Compression(encoding={self.encoding!r}, threshold={self.threshold}, "
+            f"accept_encoding={self.accept_encoding!r})"
+        )
+
+    def compress(self, body: bytes, url: str) -> Tuple[bytes, bool]:
+        """
+        Compresses a request body if it is large enough and the origin accepts it.
+
+        Args:
+            body (bytes): The encoded request body.
+            url (str): The request URL.
+
+        Returns:
+            Tuple[bytes, bool]: The body to send and whether it was compressed.
+        """
+        if len(body) < self.threshold or _origin(url) in self._rejected:
+            return body, False
+        compressed = self._compress(body)
+        if len(compressed) >= len(body):
+            return body, False
+        with self._lock:
+            self._requests += 1
+            self._request_bytes += len(body)
+            self._request_wire_bytes += len(compressed)
+        return compressed, True
+
+    def reject(self, url: str) -> None:
+        """
+        Stops compressing requests to the URL's origin.
+
+        Args:
+            url (str): A URL on the origin that refused a compressed body.
+        """
+        with self._lock:
+            self._rejected.add(_origin(url))
+
+    def record_response(
+        self, wire_bytes: int, body_bytes: int, encoding: Optional[str]
+    ) -> None:
+        """
+        Counts a response body.
+
+        Args:
+            wire_bytes (int): The bytes read from the connection.
+            body_bytes (int): The size of the decoded body.
+            encoding (str, optional): The response's ``Content-Encoding``.
+        """
+        with self._lock:
+            self._responses += 1
+            self._response_bytes += body_bytes
+            self._response_wire_bytes += wire_bytes
+            if encoding and encoding != "identity":
+                self._responses_compressed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the counters and compression ratios.
+
+        Returns:
+            Dict[str, Any]: Requests compressed with their raw and sent bytes,
+            responses (and how many were compressed) with their decoded and
+            received bytes, each direction's ratio (raw / wire), and the
+            origins that refused compressed requests.
+        """
+        with self._lock:
+            return {
+                "requests_compressed": self._requests,
+                "request_bytes": self._request_bytes,
+                "request_wire_bytes": self._request_wire_bytes,
+                "request_ratio": _ratio(self._request_bytes, self._request_wire_bytes),
+                "responses": self._responses,
+                "responses_compressed": self._responses_compressed,
+                "response_bytes": self._response_bytes,
+                "response_wire_bytes": self._response_wire_bytes,
+                "response_ratio": _ratio(
+                    self._response_bytes, self._response_wire_bytes
+                ),
+                "rejected_origins": sorted(self._rejected),
+            }
+
+    def reset(self) -> None:
+        """
+        Clears the counters; origins that refused compression stay remembered.
+        """
+        with self._lock:
+            self._requests = 0
+            self._request_bytes = 0
+            self._request_wire_bytes = 0
+            self._responses = 0
+            self._responses_compressed = 0
+            self._response_bytes = 0
+            self._response_wire_bytes = 0
+
+
+def _compressor(encoding: str, level: Optional[int]) -> Callable[[bytes], bytes]:
+    if encoding == "gzip":
+        level = 6 if level is None else level
+        return lambda body: gzip.compress(body, compresslevel=level, mtime=0)
+    if encoding == "br":
+        try:
+            import brotli
+        except ImportError:
+            try:
+                import brotlicffi as brotli
+            except ImportError as e:
+                raise ImportError(
+                    "br compression requires brotli: pip install PyDataBridgeX[compression]"
+                ) from e
+        quality = 5 if level is None else level
+        return lambda body: brotli.compress(body, quality=quality)
+    if encoding == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression requires zstandard: pip install PyDataBridgeX[compression]"
+            ) from e
+        compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+        lock = threading.Lock()
+
+        def compress(body: bytes) -> bytes:
+            # ZstdCompressor instances are not safe to share between threads.
+            with lock:
+                return compressor.compress(body)
+
+        return compress
+    raise ValueError(f"Unsupported request encoding: {encoding}")
+
+
+def _decodable() -> Tuple[str, ...]:
+    # urllib3 lists the encodings it can decode with the installed libraries;
+    # httpx supports the same set.
+    from urllib3.util.request import ACCEPT_ENCODING
+
+    available = {value.strip() for value in ACCEPT_ENCODING.split(",")}
+    return tuple(e for e in ENCODINGS + ("deflate",) if e in available)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _ratio(raw: int, wire: int) -> Optional[float]:
+    return raw / wire if wire else None
+
+
+def _wire_bytes(response: Any) -> int:
+    downloaded = getattr(response, "num_bytes_downloaded", None)
+    if downloaded is not None:
+        return downloaded
+    raw = getattr(response, "raw", None)
+    try:
+        return raw.tell()
+    except (AttributeError, OSError):
+        return len(response.content)
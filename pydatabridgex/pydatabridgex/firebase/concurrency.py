@@ -0,0 +1,118 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+)
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+def _outcome(future: Future) -> Any:
+    try:
+        return future.result()
+    except Exception as e:
+        return e
+
+
+async def _async_outcome(task: "asyncio.Future") -> Any:
+    try:
+        return await task
+    except Exception as e:
+        return e
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Groups items into lists of at most ``size``, pulling from ``items`` lazily.
+
+    Args:
+        items (Iterable[Any]): The items to group.
+        size (int): The maximum chunk length.
+
+    Yields:
+        List[Any]: Each chunk, in input order.
+    """
+    if size < 1:
+        raise ValueError("size must be at least 1")
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bounded_map(
+    fn: Callable[[Any], Any], items: Iterable[Any], max_in_flight: int = 16
+) -> Iterator[Any]:
+    """
+    Applies ``fn`` to every item over a bounded thread pool.
+
+    Items are pulled from ``items`` lazily, so no more than ``max_in_flight``
+    calls are pending at once and arbitrarily long iterables stay in
+    constant memory. Results are yielded in input order; an exception raised
+    by ``fn`` is yielded in place of that item's result instead of aborting
+    the whole run.
+
+    Args:
+        fn (Callable[[Any], Any]): The function to apply.
+        items (Iterable[Any]): The items to process.
+        max_in_flight (int): The maximum number of concurrent calls.
+
+    Yields:
+        Any: The result of ``fn`` (or the exception it raised) for each item, in input order.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= max_in_flight:
+                yield _outcome(pending.popleft())
+        while pending:
+            yield _outcome(pending.popleft())
+
+
+async def async_bounded_map(
+    fn: Callable[[Any], Awaitable[Any]], items: Iterable[Any], max_in_flight: int = 64
+) -> AsyncIterator[Any]:
+    """
+    Awaits ``fn`` for every item with at most ``max_in_flight`` calls pending.
+
+    The asyncio counterpart of :func:`bounded_map`; results are yielded in
+    input order and exceptions are yielded in place of results.
+
+    Args:
+        fn (Callable[[Any], Awaitable[Any]]): The coroutine function to apply.
+        items (Iterable[Any]): The items to process.
+        max_in_flight (int): The maximum number of concurrent calls.
+
+    Yields:
+        Any: The result of ``fn`` (or the exception it raised) for each item, in input order.
+    """
+    import asyncio
+
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(fn(item)))
+            if len(pending) >= max_in_flight:
+                yield await _async_outcome(pending.popleft())
+        while pending:
+            yield await _async_outcome(pending.popleft())
+    finally:
+        for task in pending:
+            task.cancel()
@@ -1,5 +1,17 @@
 import json
-from typing import Union, Dict
+import threading
+from typing import Callable, Union, Dict, Optional
+from .transport import Transport, AsyncTransport
+from .codec import JSONCodec, get_codec
+from .compression import Compression
+from ..instrumentation import Instrumentation
+
+_HEADER_FIELDS = (
+    "firebase_config",
+    "service_account",
+    "database_url",
+    "storage_bucket",
+)
 
 
 class Configuration:
@@ -12,6 +24,11 @@ class Configuration:
         database_url (str): The URL of the Firebase database.
         storage_bucket (str): The name of the Firebase storage bucket.
         base_url (str, optional): The base URL for requests. Defaults to "https://fir-connect-ea9c9.uc.r.appspot.com".
+        transport (Transport, optional): The pooled HTTP transport shared by clients using this configuration.
+        instrumentation (Instrumentation, optional): Hooks and metrics for every request made with this configuration.
+        token_source (Callable[[], str], optional): Returns the ID token attached to every request.
+        codec (Union[str, JSONCodec], optional): The JSON codec, or its name ("json", "orjson", "msgspec", "auto").
+        compression (Compression, optional): Request body compression and response encoding negotiation.
 
     Attributes:
         firebase_config (Dict[str, Union[str, int, bool]]): The Firebase configuration.
@@ -19,9 +36,19 @@ class Configuration:
         database_url (str): The URL of the Firebase database.
         storage_bucket (str): The name of the Firebase storage bucket.
         base_url (str): The base URL for requests.
+        transport (Optional[Transport]): The pooled HTTP transport, created on first use.
+        instrumentation (Optional[Instrumentation]): Hooks and metrics for every request, if enabled.
+        token_source (Optional[Callable[[], str]]): Returns the ID token sent as a bearer token, if set.
+        codec (JSONCodec): Encodes request bodies and decodes responses.
+        compression (Optional[Compression]): The default compression settings for clients, if enabled.
+        version (int): Incremented whenever a header field changes; clients compare it to refresh their headers.
+        async_transport (Optional[AsyncTransport]): The pooled asyncio transport, created on first use.
 
     Methods:
         produce_headers(): Generates the headers for requests.
+        invalidate(): Drops the memoized headers and hash after an in-place change.
+        get_transport(): Returns the shared transport, creating it if needed.
+        get_async_transport(): Returns the shared asyncio transport, creating it if needed.
     """
 
     def __init__(
@@ -31,6 +58,11 @@ class Configuration:
         database_url: str,
         storage_bucket: str,
         base_url: str = "https://fir-connect-ea9c9.uc.r.appspot.com",
+        transport: Optional[Transport] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        token_source: Optional[Callable[[], str]] = None,
+        codec: Union[str, JSONCodec, None] = None,
+        compression: Optional[Compression] = None,
     ) -> None:
         """
         Initializes the Configuration object.
@@ -41,7 +73,17 @@ class Configuration:
             database_url (str): The URL of the Firebase database.
             storage_bucket (str): The name of the Firebase storage bucket.
             base_url (str, optional): The base URL for requests. Defaults to "https://fir-connect-ea9c9.uc.r.appspot.com".
+            transport (Transport, optional): The pooled HTTP transport. Defaults to a new Transport on first use.
+            instrumentation (Instrumentation, optional): Hooks and metrics for every request made with this configuration.
+            token_source (Callable[[], str], optional): Returns the ID token attached to every
+                request, e.g. ``TokenManager.source(identity)``.
+            codec (Union[str, JSONCodec], optional): The JSON codec or its name. Defaults
+                to the standard library; "auto" picks the fastest installed one.
+            compression (Compression, optional): Compresses large request bodies and counts the
+                bytes saved. Disabled by default.
         """
+        self.version = 0
+        self._cache = {}
         self.firebase_config = firebase_config
         self.service_account = (
             json.load(open(service_account))
@@ -51,20 +93,77 @@ class Configuration:
         self.database_url = database_url
         self.storage_bucket = storage_bucket
         self.base_url = base_url
+        self.transport = transport
+        self.instrumentation = instrumentation
+        self.token_source = token_source
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.async_transport = None
+        self._transport_lock = threading.Lock()
+
+    def __setattr__(self, name: str, value: object) -> None:
+        super().__setattr__(name, value)
+        if name in _HEADER_FIELDS:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Drops the memoized headers, string and hash and bumps the version.
+
+        Assigning a field (directly or through ``__setitem__``) does this
+        automatically; call it after mutating ``firebase_config`` or
+        ``service_account`` in place.
+        """
+        self._cache = {}
+        self.version += 1
+
+    def _headers(self) -> Dict[str, str]:
+        headers = self._cache.get("headers")
+        if headers is None:
+            headers = self._cache["headers"] = {
+                "firebaseconfig": json.dumps(self.firebase_config),
+                "serviceaccount": json.dumps(self.service_account),
+                "databaseurl": self.database_url,
+                "storagebucket": self.storage_bucket,
+            }
+        return headers
+
+    def get_transport(self) -> Transport:
+        """
+        Returns the transport shared by every client using this configuration.
+
+        Returns:
+            Transport: The pooled HTTP transport.
+        """
+        if self.transport is None:
+            with self._transport_lock:
+                if self.transport is None:
+                    self.transport = Transport()
+        return self.transport
+
+    def get_async_transport(self) -> AsyncTransport:
+        """
+        Returns the asyncio transport shared by every async client using this configuration.
+
+        Returns:
+            AsyncTransport: The pooled asyncio HTTP transport.
+        """
+        if self.async_transport is None:
+            with self._transport_lock:
+                if self.async_transport is None:
+                    self.async_transport = AsyncTransport()
+        return self.async_transport
 
     def produce_headers(self) -> Dict[str, str]:
         """
         Generates headers for requests.
 
+        The serialized headers are memoized until a field changes.
+
         Returns:
             Dict[str, str]: The headers for requests.
         """
-        return {
-            "firebaseconfig": json.dumps(self.firebase_config),
-            "serviceaccount": json.dumps(self.service_account),
-            "databaseurl": self.database_url,
-            "storagebucket": self.storage_bucket,
-        }
+        return dict(self._headers())
 
     def __repr__(self) -> str:
         return (
@@ -75,7 +174,10 @@ class Configuration:
         )
 
     def __str__(self) -> str:
-        return json.dumps(self.produce_headers(), indent=4)
+        text = self._cache.get("str")
+        if text is None:
+            text = self._cache["str"] = json.dumps(self._headers(), indent=4)
+        return text
 
     def __eq__(self, other: object) -> bool:
         if isinstance(other, Configuration):
@@ -91,14 +193,18 @@ class Configuration:
         return not self.__eq__(other)
 
     def __hash__(self) -> int:
-        return hash(
-            (
-                json.dumps(self.firebase_config),
-                json.dumps(self.service_account),
-                self.database_url,
-                self.storage_bucket,
+        value = self._cache.get("hash")
+        if value is None:
+            headers = self._headers()
+            value = self._cache["hash"] = hash(
+                (
+                    headers["firebaseconfig"],
+                    headers["serviceaccount"],
+                    self.database_url,
+                    self.storage_bucket,
+                )
             )
-        )
+        return value
 
     def __len__(self) -> int:
         return 4
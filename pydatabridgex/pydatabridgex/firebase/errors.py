@@ -0,0 +1,101 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+
+class FirebaseError(Exception):
+    """
+    Base class for errors raised by Firebase clients.
+
+    Attributes:
+        retry_safe (bool): Whether the request certainly did not take effect,
+            so it can be retried even when it is not idempotent.
+        retry_after (Optional[float]): Seconds the server asked clients to wait.
+        transient (bool): Whether the failure may go away on its own (connection
+            errors, 429 and 5xx responses).
+    """
+
+    retry_safe = False
+    retry_after = None
+    transient = False
+
+
+class FirebaseConnectionError(FirebaseError):
+    """
+    The request failed before a response was received.
+
+    Args:
+        message (str): The error message.
+        retry_safe (bool): Whether the connection failed before the request was sent.
+    """
+
+    transient = True
+
+    def __init__(self, message: str, retry_safe: bool = False) -> None:
+        super().__init__(message)
+        self.retry_safe = retry_safe
+
+
+class FirebaseHTTPError(FirebaseError):
+    """
+    The server answered with an error status.
+
+    Args:
+        status_code (int): The HTTP status code.
+        message (str): The error message.
+        body (Any, optional): The response body.
+        retry_after (float, optional): Seconds the server asked clients to wait.
+    """
+
+    def __init__(
+        self,
+        status_code: int,
+        message: str,
+        body: Any = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+        self.retry_after = retry_after
+        self.transient = status_code == 429 or status_code >= 500
+        self.retry_safe = status_code in (429, 503)
+
+
+class CircuitOpenError(FirebaseError):
+    """
+    The endpoint's circuit breaker is open, so the request was not sent.
+
+    Args:
+        endpoint (str): The endpoint that is failing.
+        retry_after (float): Seconds until the breaker lets a probe request through.
+    """
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        super().__init__(
+            f"Circuit open for endpoint '{endpoint}', retry in {retry_after:.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a ``Retry-After`` header given in seconds or as an HTTP date.
+
+    Args:
+        value (str, optional): The header value.
+
+    Returns:
+        Optional[float]: The number of seconds to wait, if the header is valid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -1,6 +1,26 @@
 import requests
-from typing import Dict, Any
-from pydatabridge.pydatabridge import Configuration
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from .configuration import Configuration
+from .base import FirebaseBase, AsyncFirebaseBase
+from .resilience import ResiliencePolicy
+from ..arrow import batches_to_table, documents_to_batches
+from .batching import BATCH_GET_UNSUPPORTED, AsyncAutoBatcher, AutoBatcher
+from .cache import DocumentCache, freeze
+from .codec import convert
+from .concurrency import bounded_map, async_bounded_map
+from .errors import FirebaseError, FirebaseHTTPError
 
 
 class Firestore(FirebaseBase):
@@ -9,27 +29,55 @@ class Firestore(FirebaseBase):
 
     Args:
         config (Configuration): The Firebase configuration.
+        cache (DocumentCache, optional): A read-through cache for read_document.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
 
     Attributes:
         config (Configuration): The Firebase configuration.
+        cache (Optional[DocumentCache]): The read-through cache, if any.
+        batcher (Optional[AutoBatcher]): Coalesces concurrent read_document calls, once enabled.
 
     Methods:
         create_document(data): Creates a new document.
-        read_document(req): Reads a document.
+        read_document(req, schema): Reads a document, optionally into a typed schema.
         update_document(data): Updates a document.
         delete_document(req): Deletes a document.
         read_paths(req): Reads paths.
         read_all_documents(req): Reads all documents.
+        iter_documents(req, page_size): Lazily iterates over all documents page by page.
+        iter_record_batches(req): Streams all documents as Arrow record batches.
+        to_table(req): Reads all documents into an Arrow table.
+        bulk_write(ops): Applies many create/update/delete operations concurrently.
+        iter_bulk_write(ops): Lazily yields the outcome of each operation.
+        bulk_read(refs): Reads many documents concurrently.
+        iter_bulk_read(refs): Lazily yields each document read.
+        enable_batching(window, max_batch): Batches concurrent read_document calls.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self,
+        config: Configuration,
+        cache: Optional[DocumentCache] = None,
+        policy: Optional[ResiliencePolicy] = None,
+    ) -> None:
         """
         Initializes the Firestore instance.
 
         Args:
             config (Configuration): The Firebase configuration.
+            cache (DocumentCache, optional): A read-through cache for read_document.
+                Writes made through this instance invalidate it.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
         """
-        super().__init__(config)
+        super().__init__(config, policy)
+        self.cache = cache
+        self.batcher = None
+        self._batch_get = True
+
+    def _invalidate(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        if self.cache is not None:
+            self.cache.invalidate()
+        return response
 
     def __repr__(self) -> str:
         """
@@ -65,18 +113,55 @@ class Firestore(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("POST", "", data={"data": data})
+        return self._invalidate(self._send_request("POST", "", data={"data": data}))
 
-    def read_document(self, req: Dict[str, Any]) -> Dict[str, Any]:
+    def read_document(self, req: Dict[str, Any], schema: Any = None) -> Any:
         """
         Reads a document.
 
         Args:
             req (Dict[str, Any]): The request parameters.
+            schema (Any, optional): A type, such as a ``msgspec.Struct`` or dataclass,
+                to decode the response into.
 
         Returns:
-            Dict[str, Any]: The response data from the server.
+            Any: The response data from the server, typed when a schema is given.
         """
+        if self.cache is not None:
+            return self.cache.get_or_fetch(
+                ("read_document", freeze(req), schema),
+                lambda: self._load(req, schema),
+            )
+        return self._load(req, schema)
+
+    def _load(self, req: Dict[str, Any], schema: Any) -> Any:
+        if self.batcher is None:
+            return self._send_request("GET", "", params=req, schema=schema)
+        document = self.batcher.load(req)
+        return document if schema is None else convert(document, schema)
+
+    def _read_batch(self, reqs: List[Dict[str, Any]]) -> List[Any]:
+        results = {}
+        batched = _batchable(reqs) if self._batch_get else []
+        if batched:
+            try:
+                response = self._send_request(
+                    "POST", "batchGet", data={"requests": [reqs[i] for i in batched]}
+                )
+            except FirebaseHTTPError as e:
+                if e.status_code not in BATCH_GET_UNSUPPORTED:
+                    raise
+                self._batch_get = False
+            else:
+                results = _batch_results(reqs, batched, response)
+        rest = [i for i in range(len(reqs)) if i not in results]
+        for i, result in zip(
+            rest, bounded_map(lambda i: self._read_one(reqs[i]), rest, len(rest) or 1)
+        ):
+            results[i] = result
+        return [results[i] for i in range(len(reqs))]
+
+    def _read_one(self, req: Dict[str, Any]) -> Any:
         return self._send_request("GET", "", params=req)
 
     def update_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -89,7 +174,7 @@ class Firestore(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("PUT", "", data={"data": data})
+        return self._invalidate(self._send_request("PUT", "", data={"data": data}))
 
     def delete_document(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -101,7 +186,7 @@ class Firestore(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("DELETE", "", params=req)
+        return self._invalidate(self._send_request("DELETE", "", params=req))
 
     def read_paths(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -115,7 +200,374 @@ class Firestore(FirebaseBase):
         """
         return self._send_request("GET", "paths", params=req)
 
-    def read_all_documents(self, req: Dict[str, Any]) -> Dict[str, Any]:
+    def read_all_documents(
+        self, req: Dict[str, Any], as_arrow: bool = False
+    ) -> Union[Dict[str, Any], Any]:
+        """
+        Reads all documents.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            as_arrow (bool): Whether to return a pyarrow.Table with an ``id`` column
+                instead of the decoded JSON.
+
+        Returns:
+            Union[Dict[str, Any], pyarrow.Table]: The response data from the server,
+            or the documents as a table when ``as_arrow`` is set.
+        """
+        response = self._send_request("GET", "all", params=req)
+        if not as_arrow:
+            return response
+        return batches_to_table(documents_to_batches(response.items()))
+
+    def _read_page(
+        self, req: Dict[str, Any], page_size: int, cursor: Optional[str]
+    ) -> List[Tuple[str, Any]]:
+        params = dict(req, limit=page_size)
+        if cursor is not None:
+            params["startAfter"] = cursor
+        return _after(cursor, list(self.read_all_documents(params).items()))
+
+    def iter_documents(
+        self, req: Dict[str, Any], page_size: int = 500
+    ) -> Iterator[Tuple[str, Any]]:
+        """
+        Lazily iterates over all documents, one page at a time.
+
+        Pages are requested with a ``limit``/``startAfter`` cursor and the
+        next page is prefetched in the background while the current one is
+        consumed, so at most two pages are held in memory regardless of the
+        collection size. ``dict(iter_documents(req))`` is equivalent to
+        ``read_all_documents(req)``. A server that ignores ``limit`` answers
+        with every document at once, which ends the iteration.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            page_size (int): The number of documents requested per page.
+
+        Yields:
+            Tuple[str, Any]: The ID and data of each document.
+
+        Raises:
+            FirebaseError: If the server ignores the ``startAfter`` cursor.
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            page = self._read_page(req, page_size, None)
+            while page:
+                upcoming = None
+                if len(page) == page_size:
+                    upcoming = prefetcher.submit(
+                        self._read_page, req, page_size, page[-1][0]
+                    )
+                yield from page
+                page = upcoming.result() if upcoming is not None else None
+
+    def iter_record_batches(
+        self, req: Dict[str, Any], page_size: int = 500, batch_size: int = 10000
+    ) -> Iterator[Any]:
+        """
+        Streams all documents as Arrow record batches.
+
+        Built on iter_documents, so memory stays bounded by a couple of pages
+        plus one batch.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            page_size (int): The number of documents requested per page.
+            batch_size (int): The number of documents per record batch.
+
+        Yields:
+            pyarrow.RecordBatch: The documents, with an ``id`` column.
+        """
+        return documents_to_batches(self.iter_documents(req, page_size), batch_size)
+
+    def to_table(
+        self, req: Dict[str, Any], page_size: int = 500, batch_size: int = 10000
+    ) -> Any:
+        """
+        Reads all documents into an Arrow table.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            page_size (int): The number of documents requested per page.
+            batch_size (int): The number of documents per record batch.
+
+        Returns:
+            pyarrow.Table: The documents, with an ``id`` column.
+        """
+        return batches_to_table(self.iter_record_batches(req, page_size, batch_size))
+
+    def _apply_write(self, op: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+        kind, payload = op
+        if kind == "create":
+            return self.create_document(payload)
+        elif kind == "update":
+            return self.update_document(payload)
+        elif kind == "delete":
+            return self.delete_document(payload)
+        raise ValueError(f"Unsupported bulk operation: {kind}")
+
+    def bulk_write(
+        self, ops: Iterable[Tuple[str, Dict[str, Any]]], max_in_flight: int = 16
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Applies many create/update/delete operations over the pooled transport.
+
+        Operations are consumed lazily and dispatched with at most
+        ``max_in_flight`` requests outstanding. A failing operation gets its
+        exception in its slot without affecting the others. The results are
+        collected into a list; use iter_bulk_write to stream them instead.
+
+        Args:
+            ops (Iterable[Tuple[str, Dict[str, Any]]]): ``(kind, payload)`` pairs where kind is
+                "create" or "update" (payload is the document data) or "delete" (payload is the
+                request parameters).
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: The response or error for each operation, in input order.
+        """
+        return list(self.iter_bulk_write(ops, max_in_flight))
+
+    def iter_bulk_write(
+        self, ops: Iterable[Tuple[str, Dict[str, Any]]], max_in_flight: int = 16
+    ) -> Iterator[Union[Dict[str, Any], Exception]]:
+        """
+        Applies many create/update/delete operations, yielding each outcome.
+
+        Like bulk_write, but memory stays bounded by ``max_in_flight``
+        however many operations there are.
+
+        Args:
+            ops (Iterable[Tuple[str, Dict[str, Any]]]): ``(kind, payload)`` pairs, as for bulk_write.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Yields:
+            Union[Dict[str, Any], Exception]: The response or error for each operation, in input order.
+        """
+        return bounded_map(self._apply_write, ops, max_in_flight)
+
+    def bulk_read(
+        self, refs: Iterable[Dict[str, Any]], max_in_flight: int = 16
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Reads many documents over the pooled transport.
+
+        The results are collected into a list; use iter_bulk_read to stream
+        them instead.
+
+        Args:
+            refs (Iterable[Dict[str, Any]]): The request parameters of each document.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: The response or error for each document, in input order.
+        """
+        return list(self.iter_bulk_read(refs, max_in_flight))
+
+    def iter_bulk_read(
+        self, refs: Iterable[Dict[str, Any]], max_in_flight: int = 16
+    ) -> Iterator[Union[Dict[str, Any], Exception]]:
+        """
+        Reads many documents, yielding each as it is read.
+
+        Like bulk_read, but memory stays bounded by ``max_in_flight`` however
+        many documents there are.
+
+        Args:
+            refs (Iterable[Dict[str, Any]]): The request parameters of each document.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Yields:
+            Union[Dict[str, Any], Exception]: The response or error for each document, in input order.
+        """
+        return bounded_map(self.read_document, refs, max_in_flight)
+
+    def enable_batching(
+        self, window: float = 0.002, max_batch: int = 100
+    ) -> "Firestore":
+        """
+        Batches read_document calls made concurrently from different threads.
+
+        Reads arriving within ``window`` seconds of each other, up to
+        ``max_batch`` of them, are fetched together and identical requests
+        are fetched once. Each call waits up to ``window`` seconds longer, so
+        enable this only where many threads read at once.
+
+        A batch is sent as one ``POST batchGet`` request, whose answer maps
+        each document ID to its data. The stock proxy has no such route: on
+        a 404, 405 or 501 the client stops trying it and sends the reads of
+        each batch as concurrent single reads. Requests without an ``id``
+        are always read singly.
+
+        Args:
+            window (float): Seconds to collect reads before fetching.
+            max_batch (int): The most documents fetched per request.
+
+        Returns:
+            Firestore: This instance.
+        """
+        self.batcher = AutoBatcher(self._read_batch, window, max_batch, key=freeze)
+        return self
+
+
+class AsyncFirestore(AsyncFirebaseBase):
+    """
+    Represents an asyncio Firestore instance for performing CRUD operations.
+
+    Args:
+        config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+
+    Attributes:
+        config (Configuration): The Firebase configuration.
+        batcher (Optional[AsyncAutoBatcher]): Coalesces concurrent read_document calls, once enabled.
+
+    Methods:
+        create_document(data): Creates a new document.
+        read_document(req, schema): Reads a document, optionally into a typed schema.
+        update_document(data): Updates a document.
+        delete_document(req): Deletes a document.
+        read_paths(req): Reads paths.
+        read_all_documents(req): Reads all documents.
+        iter_documents(req, page_size): Lazily iterates over all documents page by page.
+        bulk_write(ops): Applies many create/update/delete operations concurrently.
+        iter_bulk_write(ops): Lazily yields the outcome of each operation.
+        bulk_read(refs): Reads many documents concurrently.
+        iter_bulk_read(refs): Lazily yields each document read.
+        enable_batching(window, max_batch): Batches concurrent read_document calls.
+    """
+
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
+        """
+        Initializes the AsyncFirestore instance.
+
+        Args:
+            config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+        """
+        super().__init__(config, policy)
+        self.batcher = None
+        self._batch_get = True
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncFirestore(config={self.config})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncFirestore: Config={self.config}"
+
+    def __len__(self) -> int:
+        """
+        Return the length of the object.
+        """
+        return len(self.config)
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Get an item from the object.
+        """
+        return self.config[key]
+
+    async def create_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Creates a new document.
+
+        Args:
+            data (Dict[str, Any]): The data to be stored.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("POST", "", data={"data": data})
+
+    async def read_document(self, req: Dict[str, Any], schema: Any = None) -> Any:
+        """
+        Reads a document.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            schema (Any, optional): A type, such as a ``msgspec.Struct`` or dataclass,
+                to decode the response into.
+
+        Returns:
+            Any: The response data from the server, typed when a schema is given.
+        """
+        if self.batcher is None:
+            return await self._send_request("GET", "", params=req, schema=schema)
+        document = await self.batcher.load(req)
+        return document if schema is None else convert(document, schema)
+
+    async def _read_batch(self, reqs: List[Dict[str, Any]]) -> List[Any]:
+        results = {}
+        batched = _batchable(reqs) if self._batch_get else []
+        if batched:
+            try:
+                response = await self._send_request(
+                    "POST", "batchGet", data={"requests": [reqs[i] for i in batched]}
+                )
+            except FirebaseHTTPError as e:
+                if e.status_code not in BATCH_GET_UNSUPPORTED:
+                    raise
+                self._batch_get = False
+            else:
+                results = _batch_results(reqs, batched, response)
+        rest = [i for i in range(len(reqs)) if i not in results]
+        index = 0
+        async for result in async_bounded_map(
+            lambda i: self._read_one(reqs[i]), rest, len(rest) or 1
+        ):
+            results[rest[index]] = result
+            index += 1
+        return [results[i] for i in range(len(reqs))]
+
+    async def _read_one(self, req: Dict[str, Any]) -> Any:
+        return await self._send_request("GET", "", params=req)
+
+    async def update_document(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates a document.
+
+        Args:
+            data (Dict[str, Any]): The updated data.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("PUT", "", data={"data": data})
+
+    async def delete_document(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Deletes a document.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("DELETE", "", params=req)
+
+    async def read_paths(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reads paths.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("GET", "paths", params=req)
+
+    async def read_all_documents(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """
         Reads all documents.
 
@@ -125,4 +577,187 @@ class Firestore(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("GET", "all", params=req)
+        return await self._send_request("GET", "all", params=req)
+
+    async def _read_page(
+        self, req: Dict[str, Any], page_size: int, cursor: Optional[str]
+    ) -> List[Tuple[str, Any]]:
+        params = dict(req, limit=page_size)
+        if cursor is not None:
+            params["startAfter"] = cursor
+        return _after(cursor, list((await self.read_all_documents(params)).items()))
+
+    async def iter_documents(
+        self, req: Dict[str, Any], page_size: int = 500
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Lazily iterates over all documents, one page at a time.
+
+        The next page is fetched in a background task while the current one
+        is consumed, so at most two pages are held in memory.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+            page_size (int): The number of documents requested per page.
+
+        Yields:
+            Tuple[str, Any]: The ID and data of each document.
+
+        Raises:
+            FirebaseError: If the server ignores the ``startAfter`` cursor.
+        """
+        import asyncio
+
+        page = await self._read_page(req, page_size, None)
+        while page:
+            upcoming = None
+            if len(page) == page_size:
+                upcoming = asyncio.ensure_future(
+                    self._read_page(req, page_size, page[-1][0])
+                )
+            try:
+                for item in page:
+                    yield item
+            except BaseException:
+                if upcoming is not None:
+                    upcoming.cancel()
+                raise
+            page = await upcoming if upcoming is not None else None
+
+    async def _apply_write(self, op: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+        kind, payload = op
+        if kind == "create":
+            return await self.create_document(payload)
+        elif kind == "update":
+            return await self.update_document(payload)
+        elif kind == "delete":
+            return await self.delete_document(payload)
+        raise ValueError(f"Unsupported bulk operation: {kind}")
+
+    async def bulk_write(
+        self, ops: Iterable[Tuple[str, Dict[str, Any]]], max_in_flight: int = 64
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Applies many create/update/delete operations over the shared event loop.
+
+        Operations are consumed lazily and dispatched with at most
+        ``max_in_flight`` requests outstanding. A failing operation gets its
+        exception in its slot without affecting the others. The results are
+        collected into a list; use iter_bulk_write to stream them instead.
+
+        Args:
+            ops (Iterable[Tuple[str, Dict[str, Any]]]): ``(kind, payload)`` pairs where kind is
+                "create" or "update" (payload is the document data) or "delete" (payload is the
+                request parameters).
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: The response or error for each operation, in input order.
+        """
+        return [result async for result in self.iter_bulk_write(ops, max_in_flight)]
+
+    async def iter_bulk_write(
+        self, ops: Iterable[Tuple[str, Dict[str, Any]]], max_in_flight: int = 64
+    ) -> AsyncIterator[Union[Dict[str, Any], Exception]]:
+        """
+        Applies many create/update/delete operations, yielding each outcome.
+
+        Like bulk_write, but memory stays bounded by ``max_in_flight``
+        however many operations there are.
+
+        Args:
+            ops (Iterable[Tuple[str, Dict[str, Any]]]): ``(kind, payload)`` pairs, as for bulk_write.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Yields:
+            Union[Dict[str, Any], Exception]: The response or error for each operation, in input order.
+        """
+        async for result in async_bounded_map(self._apply_write, ops, max_in_flight):
+            yield result
+
+    async def bulk_read(
+        self, refs: Iterable[Dict[str, Any]], max_in_flight: int = 64
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Reads many documents over the shared event loop.
+
+        The results are collected into a list; use iter_bulk_read to stream
+        them instead.
+
+        Args:
+            refs (Iterable[Dict[str, Any]]): The request parameters of each document.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[Dict[str, Any], Exception]]: The response or error for each document, in input order.
+        """
+        return [result async for result in self.iter_bulk_read(refs, max_in_flight)]
+
+    async def iter_bulk_read(
+        self, refs: Iterable[Dict[str, Any]], max_in_flight: int = 64
+    ) -> AsyncIterator[Union[Dict[str, Any], Exception]]:
+        """
+        Reads many documents, yielding each as it is read.
+
+        Like bulk_read, but memory stays bounded by ``max_in_flight`` however
+        many documents there are.
+
+        Args:
+            refs (Iterable[Dict[str, Any]]): The request parameters of each document.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Yields:
+            Union[Dict[str, Any], Exception]: The response or error for each document, in input order.
+        """
+        async for result in async_bounded_map(self.read_document, refs, max_in_flight):
+            yield result
+
+    def enable_batching(
+        self, window: float = 0.002, max_batch: int = 100
+    ) -> "AsyncFirestore":
+        """
+        Batches read_document calls made concurrently from different coroutines.
+
+        Reads arriving within ``window`` seconds of each other, up to
+        ``max_batch`` of them, are fetched together and identical requests
+        are fetched once, as in Firestore.enable_batching.
+
+        Args:
+            window (float): Seconds to collect reads before fetching.
+            max_batch (int): The most documents fetched per request.
+
+        Returns:
+            AsyncFirestore: This instance.
+        """
+        self.batcher = AsyncAutoBatcher(self._read_batch, window, max_batch, key=freeze)
+        return self
+
+
+def _batchable(reqs: List[Dict[str, Any]]) -> List[int]:
+    # batchGet answers by document ID, so only requests naming an ID that no
+    # other request in the batch names can share it.
+    counts = Counter(req.get("id") for req in reqs)
+    return [
+        i
+        for i, req in enumerate(reqs)
+        if req.get("id") is not None and counts[req["id"]] == 1
+    ]
+
+
+def _batch_results(
+    reqs: List[Dict[str, Any]], batched: List[int], response: Dict[str, Any]
+) -> Dict[int, Any]:
+    # Shaped like a single read: a missing document maps its ID to None.
+    documents = response.get("documents") or {}
+    return {i: {reqs[i]["id"]: documents.get(reqs[i]["id"])} for i in batched}
+
+
+def _after(cursor: Optional[str], page: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+    # A page holding its own cursor means the server ignored startAfter;
+    # requesting the next page would return the same documents forever.
+    if cursor is not None and any(doc_id == cursor for doc_id, _ in page):
+        raise FirebaseError(
+            "The server ignored the startAfter cursor, so documents cannot be "
+            "read in pages; use read_all_documents instead"
+        )
+    return page
@@ -1,6 +1,34 @@
+import json
+import os
+import threading
+import time
 import requests
-from typing import Dict, Any
-from pydatabridge.pydatabridge import Configuration
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from .configuration import Configuration
+from .base import FirebaseBase, AsyncFirebaseBase, _token, _token_source
+from .resilience import ResiliencePolicy
+from .cache import DocumentCache, freeze
+from .concurrency import async_bounded_map, bounded_map
+from .stream import Listener, Snapshot, StreamEvent, listen_async
+
+# The Realtime Database REST API rejects write requests over 16 MB.
+MAX_WRITE_BYTES = 16 * 1024 * 1024
+
+PUSH_CHARS = "-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz"
+
+_push_lock = threading.Lock()
+_last_push_time = 0
+_last_random = [0] * 12
 
 
 class RealTime(FirebaseBase):
@@ -9,25 +37,45 @@ class RealTime(FirebaseBase):
 
     Args:
         config (Configuration): The Firebase configuration.
+        cache (DocumentCache, optional): A read-through cache for read_items.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
 
     Attributes:
         config (Configuration): The Firebase configuration.
+        cache (Optional[DocumentCache]): The read-through cache, if any.
 
     Methods:
         create_item(data): Creates a new item.
         read_items(req): Reads items.
         update_item(id, new_data): Updates an item.
         delete_item(id): Deletes an item.
+        multi_update(updates): Writes many paths in one atomic request.
+        bulk_create(path, items): Adds many items under a path with client-side push IDs.
+        listen(path, callback): Streams changes under a path to a callback.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self,
+        config: Configuration,
+        cache: Optional[DocumentCache] = None,
+        policy: Optional[ResiliencePolicy] = None,
+    ) -> None:
         """
         Initializes the RealTime instance.
 
         Args:
             config (Configuration): The Firebase configuration.
+            cache (DocumentCache, optional): A read-through cache for read_items.
+                Writes made through this instance invalidate it.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
         """
-        super().__init__(config)
+        super().__init__(config, policy)
+        self.cache = cache
+
+    def _invalidate(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        if self.cache is not None:
+            self.cache.invalidate()
+        return response
 
     def __repr__(self) -> str:
         """
@@ -63,7 +111,9 @@ class RealTime(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("POST", "create", data={"data": data})
+        return self._invalidate(
+            self._send_request("POST", "create", data={"data": data})
+        )
 
     def read_items(self, req: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -75,6 +125,11 @@ class RealTime(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
+        if self.cache is not None:
+            return self.cache.get_or_fetch(
+                ("read_items", freeze(req)),
+                lambda: self._send_request("GET", "read", params=req),
+            )
         return self._send_request("GET", "read", params=req)
 
     def update_item(self, id: str, new_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -88,7 +143,9 @@ class RealTime(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("PUT", "update", data={"id": id, "newData": new_data})
+        return self._invalidate(
+            self._send_request("PUT", "update", data={"id": id, "newData": new_data})
+        )
 
     def delete_item(self, id: str) -> Dict[str, Any]:
         """
@@ -100,4 +157,524 @@ class RealTime(FirebaseBase):
         Returns:
             Dict[str, Any]: The response data from the server.
         """
-        return self._send_request("DELETE", "delete", data={"id": id})
+        return self._invalidate(self._send_request("DELETE", "delete", data={"id": id}))
+
+    def multi_update(
+        self,
+        updates: Dict[str, Any],
+        token: Optional[str] = None,
+        max_request_bytes: int = MAX_WRITE_BYTES,
+    ) -> Dict[str, Any]:
+        """
+        Writes many Realtime Database paths with one multi-location update.
+
+        Each request is applied atomically by the server. Payloads larger than
+        ``max_request_bytes`` are split into several requests, sent in order;
+        a node too large for one request is written as a first request that
+        replaces it followed by requests adding its remaining children. A path
+        nested under another path of the update goes into a later request,
+        so overlapping entries take effect in the order given. After a failed
+        request the later ones are not sent.
+
+        Args:
+            updates (Dict[str, Any]): The value to set at each path; None deletes.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+            max_request_bytes (int): The largest JSON body sent in one request.
+
+        Returns:
+            Dict[str, Any]: For each path, the value written or the exception that
+            prevented it.
+        """
+        outcomes = {}
+        error = None
+        for chunk, paths in _chunk_updates(updates, max_request_bytes):
+            if error is None:
+                try:
+                    self._patch(chunk, token)
+                except Exception as e:
+                    error = e
+            for path in paths:
+                if error is not None:
+                    outcomes[path] = error
+                elif path not in outcomes:
+                    outcomes[path] = updates[path]
+        if self.cache is not None:
+            self.cache.invalidate()
+        return outcomes
+
+    def bulk_create(
+        self,
+        path: str,
+        items: Iterable[Any],
+        token: Optional[str] = None,
+        max_request_bytes: int = MAX_WRITE_BYTES,
+        max_in_flight: int = 4,
+    ) -> List[Union[str, Exception]]:
+        """
+        Adds many items under a path using push IDs generated on the client.
+
+        Items are packed into multi-location updates no larger than
+        ``max_request_bytes`` and up to ``max_in_flight`` of them are sent at
+        once; the requests carrying parts of one oversized item are sent in
+        order. Because the IDs are chosen up front, a retried request cannot
+        create duplicates, and the IDs sort in insertion order like
+        server-generated ones.
+
+        Args:
+            path (str): The parent path.
+            items (Iterable[Any]): The items to add.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+            max_request_bytes (int): The largest JSON body sent in one request.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[str, Exception]]: The push ID of each item, or the exception
+            for the request that carried it, in input order.
+        """
+        updates = {f"{path.strip('/')}/{push_id()}": item for item in items}
+        sequences = _sequences(_chunk_updates(updates, max_request_bytes))
+
+        def send(sequence: List[Tuple[Dict[str, Any], List[str]]]) -> List[Any]:
+            errors, error = [], None
+            for chunk, _ in sequence:
+                if error is None:
+                    try:
+                        self._patch(chunk, token)
+                    except Exception as e:
+                        error = e
+                errors.append(error)
+            return errors
+
+        outcomes = {}
+        for sequence, errors in zip(
+            sequences, bounded_map(send, sequences, max_in_flight)
+        ):
+            _record(outcomes, sequence, errors)
+        if self.cache is not None:
+            self.cache.invalidate()
+        return [outcomes[key] or key.rsplit("/", 1)[1] for key in updates]
+
+    def _patch(self, chunk: Dict[str, Any], token: Optional[str]) -> Dict[str, Any]:
+        return self._send_request(
+            "PATCH",
+            ".json",
+            data=chunk,
+            params=_auth(self, token),
+            url=_stream_url(self.config.database_url, ""),
+        )
+
+    def listen(
+        self,
+        path: str,
+        callback: Callable[[StreamEvent], None],
+        snapshot: Optional[Snapshot] = None,
+        token: Optional[str] = None,
+    ) -> Listener:
+        """
+        Streams changes under a Realtime Database path instead of polling read_items.
+
+        One server-sent events connection to ``database_url`` stays open; the
+        first event is a put of the current value, followed by incremental
+        put/patch events. Dropped connections are re-opened automatically.
+
+        Args:
+            path (str): The database path to listen to.
+            callback (Callable[[StreamEvent], None]): Called on the listener thread for each event.
+            snapshot (Snapshot, optional): A local copy of the data, updated before the callback runs.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+
+        Returns:
+            Listener: The started listener; call close() to stop it.
+        """
+        return Listener(
+            self.transport,
+            _stream_url(self.config.database_url, path),
+            callback,
+            params=_stream_auth(self, token),
+            snapshot=snapshot,
+            policy=self.policy,
+            codec=self.config.codec,
+        ).start()
+
+
+class AsyncRealTime(AsyncFirebaseBase):
+    """
+    Represents an asyncio RealTime instance for performing CRUD operations.
+
+    Args:
+        config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+
+    Attributes:
+        config (Configuration): The Firebase configuration.
+
+    Methods:
+        create_item(data): Creates a new item.
+        read_items(req): Reads items.
+        update_item(id, new_data): Updates an item.
+        delete_item(id): Deletes an item.
+        multi_update(updates): Writes many paths in one atomic request.
+        bulk_create(path, items): Adds many items under a path with client-side push IDs.
+        listen(path): Streams changes under a path as an async iterator.
+    """
+
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
+        """
+        Initializes the AsyncRealTime instance.
+
+        Args:
+            config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+        """
+        super().__init__(config, policy)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncRealTime(config={self.config})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncRealTime: Config={self.config}"
+
+    def __len__(self) -> int:
+        """
+        Return the length of the object.
+        """
+        return len(self.config)
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Get an item from the object.
+        """
+        return self.config[key]
+
+    async def create_item(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Creates a new item.
+
+        Args:
+            data (Dict[str, Any]): The data to be stored.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("POST", "create", data={"data": data})
+
+    async def read_items(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reads items.
+
+        Args:
+            req (Dict[str, Any]): The request parameters.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("GET", "read", params=req)
+
+    async def update_item(self, id: str, new_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Updates an item.
+
+        Args:
+            id (str): The ID of the item to update.
+            new_data (Dict[str, Any]): The updated data.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request(
+            "PUT", "update", data={"id": id, "newData": new_data}
+        )
+
+    async def delete_item(self, id: str) -> Dict[str, Any]:
+        """
+        Deletes an item.
+
+        Args:
+            id (str): The ID of the item to delete.
+
+        Returns:
+            Dict[str, Any]: The response data from the server.
+        """
+        return await self._send_request("DELETE", "delete", data={"id": id})
+
+    async def multi_update(
+        self,
+        updates: Dict[str, Any],
+        token: Optional[str] = None,
+        max_request_bytes: int = MAX_WRITE_BYTES,
+    ) -> Dict[str, Any]:
+        """
+        Writes many Realtime Database paths with one multi-location update.
+
+        Behaves like RealTime.multi_update.
+
+        Args:
+            updates (Dict[str, Any]): The value to set at each path; None deletes.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+            max_request_bytes (int): The largest JSON body sent in one request.
+
+        Returns:
+            Dict[str, Any]: For each path, the value written or the exception that
+            prevented it.
+        """
+        outcomes = {}
+        error = None
+        for chunk, paths in _chunk_updates(updates, max_request_bytes):
+            if error is None:
+                try:
+                    await self._patch(chunk, token)
+                except Exception as e:
+                    error = e
+            for path in paths:
+                if error is not None:
+                    outcomes[path] = error
+                elif path not in outcomes:
+                    outcomes[path] = updates[path]
+        return outcomes
+
+    async def bulk_create(
+        self,
+        path: str,
+        items: Iterable[Any],
+        token: Optional[str] = None,
+        max_request_bytes: int = MAX_WRITE_BYTES,
+        max_in_flight: int = 4,
+    ) -> List[Union[str, Exception]]:
+        """
+        Adds many items under a path using push IDs generated on the client.
+
+        Behaves like RealTime.bulk_create.
+
+        Args:
+            path (str): The parent path.
+            items (Iterable[Any]): The items to add.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+            max_request_bytes (int): The largest JSON body sent in one request.
+            max_in_flight (int): The maximum number of concurrent requests.
+
+        Returns:
+            List[Union[str, Exception]]: The push ID of each item, or the exception
+            for the request that carried it, in input order.
+        """
+        updates = {f"{path.strip('/')}/{push_id()}": item for item in items}
+        sequences = _sequences(_chunk_updates(updates, max_request_bytes))
+
+        async def send(sequence: List[Tuple[Dict[str, Any], List[str]]]) -> List[Any]:
+            errors, error = [], None
+            for chunk, _ in sequence:
+                if error is None:
+                    try:
+                        await self._patch(chunk, token)
+                    except Exception as e:
+                        error = e
+                errors.append(error)
+            return errors
+
+        outcomes = {}
+        index = 0
+        async for errors in async_bounded_map(send, sequences, max_in_flight):
+            _record(outcomes, sequences[index], errors)
+            index += 1
+        return [outcomes[key] or key.rsplit("/", 1)[1] for key in updates]
+
+    async def _patch(
+        self, chunk: Dict[str, Any], token: Optional[str]
+    ) -> Dict[str, Any]:
+        return await self._send_request(
+            "PATCH",
+            ".json",
+            data=chunk,
+            params=await _async_auth(self, token),
+            url=_stream_url(self.config.database_url, ""),
+        )
+
+    def listen(
+        self,
+        path: str,
+        snapshot: Optional[Snapshot] = None,
+        token: Optional[str] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Streams changes under a Realtime Database path instead of polling read_items.
+
+        Usage:
+            async for event in realtime.listen("/messages"):
+                ...
+
+        Args:
+            path (str): The database path to listen to.
+            snapshot (Snapshot, optional): A local copy updated before each event is yielded.
+            token (str, optional): A Firebase ID token or database secret sent as ``auth``;
+                defaults to the client's ID token.
+
+        Returns:
+            AsyncIterator[StreamEvent]: The put/patch events, starting with the current value.
+        """
+        return listen_async(
+            self.transport,
+            _stream_url(self.config.database_url, path),
+            params=_async_stream_auth(self, token),
+            snapshot=snapshot,
+            policy=self.policy,
+            codec=self.config.codec,
+        )
+
+
+def push_id() -> str:
+    """
+    Generates a Firebase-style push ID on the client.
+
+    The first 8 characters encode the current time in milliseconds and the
+    remaining 12 are random, incremented instead of regenerated within the
+    same millisecond, so IDs sort in creation order.
+
+    Returns:
+        str: A 20-character push ID.
+    """
+    global _last_push_time
+    with _push_lock:
+        now = int(time.time() * 1000)
+        if now == _last_push_time:
+            for i in range(11, -1, -1):
+                if _last_random[i] != 63:
+                    _last_random[i] += 1
+                    break
+                _last_random[i] = 0
+        else:
+            _last_push_time = now
+            _last_random[:] = [byte % 64 for byte in os.urandom(12)]
+        stamp = []
+        for _ in range(8):
+            stamp.append(PUSH_CHARS[now % 64])
+            now //= 64
+        return "".join(reversed(stamp)) + "".join(PUSH_CHARS[i] for i in _last_random)
+
+
+def _auth(client: FirebaseBase, token: Optional[str]) -> Optional[Dict[str, str]]:
+    source = _token_source(client)
+    if token is None and source is not None:
+        token = source()
+    return {"auth": token} if token else None
+
+
+async def _async_auth(
+    client: AsyncFirebaseBase, token: Optional[str]
+) -> Optional[Dict[str, str]]:
+    if token is None:
+        token = await _token(client)
+    return {"auth": token} if token else None
+
+
+def _stream_auth(client: FirebaseBase, token: Optional[str]) -> Any:
+    # A stream outlives its ID token, so reconnects ask the source again.
+    if token is None and _token_source(client) is not None:
+        return lambda: _auth(client, None)
+    return _auth(client, token)
+
+
+def _async_stream_auth(client: AsyncFirebaseBase, token: Optional[str]) -> Any:
+    if token is None and _token_source(client) is not None:
+        return lambda: _async_auth(client, None)
+    return {"auth": token} if token else None
+
+
+def _stream_url(database_url: str, path: str) -> str:
+    return f"{database_url.rstrip('/')}/{path.strip('/')}.json"
+
+
+def _size(path: str, value: Any) -> int:
+    return len(json.dumps({path: value}, separators=(",", ":")).encode()) + 1
+
+
+def _split_entry(path: str, value: Any, limit: int) -> List[Tuple[str, Any]]:
+    if _size(path, value) <= limit:
+        return [(path, value)]
+    if not isinstance(value, dict) or not value:
+        raise ValueError(f"The value at '{path}' is larger than {limit} bytes")
+    # The first entry replaces the node with as many children as fit; the
+    # rest are added underneath it, so the final state matches one write.
+    head, used, rest = {}, _size(path, {}), []
+    for key, child in value.items():
+        child_size = _size(key, child)
+        if not rest and used + child_size <= limit:
+            head[key] = child
+            used += child_size
+        else:
+            rest.extend(_split_entry(f"{path}/{key}", child, limit))
+    return [(path, head or None)] + rest
+
+
+def _chunk_updates(
+    updates: Dict[str, Any], limit: int
+) -> List[Tuple[Dict[str, Any], List[str]]]:
+    # The server rejects an update in which one path is an ancestor of
+    # another, so such a path starts a new chunk; sent in order, the chunks
+    # then apply the entries in the order given.
+    chunks = []
+    chunk, paths, used, ancestors = {}, [], 2, set()
+    for path, value in updates.items():
+        for key, part in _split_entry(path.strip("/"), value, limit - 2):
+            size = _size(key, part)
+            lineage = _ancestors(key)
+            if chunk and (
+                used + size > limit
+                or key in chunk
+                or key in ancestors
+                or any(parent in chunk for parent in lineage)
+            ):
+                chunks.append((chunk, paths))
+                chunk, paths, used, ancestors = {}, [], 2, set()
+            chunk[key] = part
+            used += size
+            ancestors.update(lineage)
+            if not paths or paths[-1] != path:
+                paths.append(path)
+    if chunk:
+        chunks.append((chunk, paths))
+    return chunks
+
+
+def _ancestors(path: str) -> List[str]:
+    keys = path.split("/")
+    return ["/".join(keys[:depth]) for depth in range(1, len(keys))]
+
+
+def _sequences(
+    chunks: List[Tuple[Dict[str, Any], List[str]]],
+) -> List[List[Tuple[Dict[str, Any], List[str]]]]:
+    # Consecutive chunks carrying parts of the same entry must be sent one
+    # after the other, the head first; otherwise the head could replace the
+    # node after its children were written.
+    sequences = []
+    for chunk, paths in chunks:
+        if sequences and sequences[-1][-1][1][-1] == paths[0]:
+            sequences[-1].append((chunk, paths))
+        else:
+            sequences.append([(chunk, paths)])
+    return sequences
+
+
+def _record(
+    outcomes: Dict[str, Any],
+    sequence: List[Tuple[Dict[str, Any], List[str]]],
+    errors: List[Optional[Exception]],
+) -> None:
+    for (_, paths), error in zip(sequence, errors):
+        for key in paths:
+            if error is not None:
+                outcomes[key] = error
+            else:
+                outcomes.setdefault(key, None)
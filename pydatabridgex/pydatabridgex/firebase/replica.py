@@ -0,0 +1,420 @@
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .firestore import Firestore
+
+# Request parameter asking the server for documents changed at or after an
+# epoch time; deleted documents are returned with a null value.
+CHANGED_SINCE = "changedSince"
+
+# How far ahead of now the probe for changedSince support asks for changes;
+# a server honouring the parameter has none to return.
+PROBE_AHEAD = 86400.0
+
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "in")
+
+_FIELD = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_INDEX_ESCAPE = re.compile(r"_([ud])")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    generation INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+"""
+
+
+class DocumentReplica:
+    """
+    Persistent local replica of a Firestore collection.
+
+    The replica is an SQLite file holding every document matching ``req``,
+    keyed by document ID. The first sync() (or the first read of an empty
+    replica) copies the whole collection; later syncs only request the
+    documents changed since the previous one, passing ``changedSince`` to
+    the server, and apply deleted documents (returned as null) locally.
+    Before its first delta sync the replica asks for one document changed
+    after a future time: a server that returns one ignores ``changedSince``,
+    and every sync from it then reads the whole collection and removes the
+    local documents it no longer returns, as ``sync(full=True)`` does.
+
+    Reads and queries are answered from the file, so a restarted process
+    starts from the last synced state instead of re-reading the
+    collection. Fields listed in ``indexes`` get an SQLite index, which
+    query() uses for filters and ordering on them.
+
+    Args:
+        firestore (Firestore): The client the replica syncs from.
+        path (str): The SQLite database file.
+        req (Dict[str, Any], optional): The request parameters selecting the collection.
+        indexes (Iterable[str]): Dotted field paths to index, such as "address.city".
+        max_staleness (float, optional): When set, a read first syncs if the last
+            sync is older than this many seconds.
+        page_size (int): The number of documents requested per page.
+        overlap (float): Seconds subtracted from the last sync time when asking
+            for changes, covering clock skew between this host and the server.
+
+    Methods:
+        sync(full): Brings the replica up to date with the server.
+        get(doc_id): Returns one document.
+        read_all_documents(): Returns every document.
+        query(filters, order_by, descending, limit): Returns the documents matching filters.
+        add_index(field): Indexes a field.
+        stats(): Returns the document count and sync state.
+        close(): Closes the database.
+    """
+
+    def __init__(
+        self,
+        firestore: Firestore,
+        path: str,
+        req: Optional[Dict[str, Any]] = None,
+        indexes: Iterable[str] = (),
+        max_staleness: Optional[float] = None,
+        page_size: int = 500,
+        overlap: float = 5.0,
+    ) -> None:
+        """
+        Opens, or creates, the replica.
+
+        A replica file created for different request parameters is emptied
+        and synced again from scratch.
+
+        Args:
+            firestore (Firestore): The client the replica syncs from.
+            path (str): The SQLite database file.
+            req (Dict[str, Any], optional): The request parameters selecting the collection.
+            indexes (Iterable[str]): Dotted field paths to index.
+            max_staleness (float, optional): The age, in seconds, at which reads sync first.
+            page_size (int): The number of documents requested per page.
+            overlap (float): Seconds of overlap between consecutive delta syncs.
+
+        Raises:
+            ValueError: If an index field is not a dotted path of identifiers.
+        """
+        self.firestore = firestore
+        self.path = path
+        self.req = dict(req or {})
+        self.max_staleness = max_staleness
+        self.page_size = page_size
+        self.overlap = overlap
+        self._codec = firestore.config.codec
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        scope = self._codec.dumps(sorted(self.req.items())).decode()
+        if self._meta("scope") != scope:
+            with self._db:
+                self._db.execute("DELETE FROM documents")
+                self._db.execute("DELETE FROM meta")
+                self._db.execute("INSERT INTO meta VALUES ('scope', ?)", (scope,))
+        for field in indexes:
+            self.add_index(field)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"DocumentReplica(path={self.path!r}, req={self.req!r})"
+
+    def __len__(self) -> int:
+        """
+        Return the number of documents in the replica.
+        """
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __contains__(self, doc_id: str) -> bool:
+        """
+        Return whether the replica holds a document.
+        """
+        return self.get(doc_id) is not None
+
+    def __enter__(self) -> "DocumentReplica":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """
+        The ``time.time()`` at which the last successful sync started, if any.
+        """
+        return self._meta("last_sync")
+
+    def sync(self, full: bool = False) -> int:
+        """
+        Brings the replica up to date with the server.
+
+        The first sync, and a full one, reads the whole collection and then
+        removes the local documents the server did not return. Later syncs
+        request only the documents changed since the previous sync, unless
+        the server turned out to ignore ``changedSince``. Each page
+        is committed as it arrives, so readers never see a document vanish
+        mid-sync, and a failed sync is simply resumed by the next one.
+
+        Args:
+            full (bool): Whether to re-read the whole collection.
+
+        Returns:
+            int: The number of documents written or deleted locally.
+        """
+        with self._sync_lock:
+            return self._sync(full)
+
+    def get(self, doc_id: str) -> Optional[Any]:
+        """
+        Returns one document from the replica.
+
+        Args:
+            doc_id (str): The document ID.
+
+        Returns:
+            Optional[Any]: The document data, or None if the replica does not hold it.
+        """
+        self._refresh()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM documents WHERE id = ?", (doc_id,)
+            ).fetchone()
+        return self._codec.loads(row[0]) if row is not None else None
+
+    def read_all_documents(self) -> Dict[str, Any]:
+        """
+        Returns every document in the replica, like Firestore.read_all_documents.
+
+        Returns:
+            Dict[str, Any]: The data of each document by ID, in ID order.
+        """
+        return dict(self.query())
+
+    def query(
+        self,
+        filters: Iterable[Tuple[str, str, Any]] = (),
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, Any]]:
+        """
+        Returns the documents matching every filter, answered locally.
+
+        Args:
+            filters (Iterable[Tuple[str, str, Any]]): ``(field, operator, value)``
+                conditions on dotted field paths; the operator is one of
+                OPERATORS, and "in" takes a sequence of values.
+            order_by (str, optional): A field to sort by; documents are in ID
+                order otherwise.
+            descending (bool): Whether to sort in descending order.
+            limit (int, optional): The maximum number of documents returned.
+
+        Returns:
+            List[Tuple[str, Any]]: The ID and data of each matching document.
+
+        Raises:
+            ValueError: If a field or operator is invalid.
+        """
+        clauses = []
+        params = []
+        for field, op, value in filters:
+            if op not in OPERATORS:
+                raise ValueError(f"Unsupported operator: {op}")
+            column = _column(field)
+            if op == "in":
+                values = list(value)
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                clauses.append(f"{column} {'=' if op == '==' else op} ?")
+                params.append(value)
+        sql = "SELECT id, data FROM documents"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = "DESC" if descending else "ASC"
+        if order_by is not None:
+            sql += f" ORDER BY {_column(order_by)} {direction}, id {direction}"
+        else:
+            sql += f" ORDER BY id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        self._refresh()
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [(doc_id, self._codec.loads(data)) for doc_id, data in rows]
+
+    def add_index(self, field: str) -> None:
+        """
+        Indexes a field so that query() can filter and sort on it without a scan.
+
+        Args:
+            field (str): A dotted field path, such as "address.city".
+
+        Raises:
+            ValueError: If the field is not a dotted path of identifiers.
+        """
+        column = _column(field)
+        name = _index_name(field)
+        with self._lock, self._db:
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON documents ({column})"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the document count and sync state.
+
+        Returns:
+            Dict[str, Any]: The number of documents, the start times of the last
+            sync and of the last full sync, and the indexed fields.
+        """
+        with self._lock:
+            indexes = self._db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = 'documents' AND name LIKE 'field\\_%' ESCAPE '\\'"
+            ).fetchall()
+        return {
+            "documents": len(self),
+            "last_sync": self.last_sync,
+            "last_full_sync": self._meta("full_sync"),
+            "indexes": sorted(_index_field(name) for (name,) in indexes),
+        }
+
+    def close(self) -> None:
+        """
+        Closes the database; the replica can be reopened from the same path.
+        """
+        with self._lock:
+            self._db.close()
+
+    def _refresh(self) -> None:
+        # Only an empty replica must wait for a sync; otherwise a read skips
+        # the sync if another one is running, and serves the local data if
+        # the server cannot be reached.
+        if not self._stale():
+            return
+        first = self.last_sync is None
+        if not self._sync_lock.acquire(blocking=first):
+            return
+        try:
+            if self._stale():
+                self._sync(False)
+        except Exception:
+            if first:
+                raise
+        finally:
+            self._sync_lock.release()
+
+    def _stale(self) -> bool:
+        last_sync = self.last_sync
+        return last_sync is None or (
+            self.max_staleness is not None
+            and time.time() - last_sync > self.max_staleness
+        )
+
+    def _sync(self, full: bool) -> int:
+        started = time.time()
+        last_sync = self.last_sync
+        full = full or last_sync is None or not self._honours_changed_since()
+        generation = (self._meta("generation") or 0) + 1
+        req = dict(self.req)
+        if not full:
+            req[CHANGED_SINCE] = last_sync - self.overlap
+        changes = 0
+        page = []
+        for item in self.firestore.iter_documents(req, self.page_size):
+            page.append(item)
+            if len(page) >= self.page_size:
+                changes += self._apply(page, generation)
+                page = []
+        changes += self._apply(page, generation)
+        with self._lock, self._db:
+            if full:
+                changes += self._db.execute(
+                    "DELETE FROM documents WHERE generation < ?", (generation,)
+                ).rowcount
+                self._set_meta("full_sync", started)
+            self._set_meta("generation", generation)
+            self._set_meta("last_sync", started)
+        return changes
+
+    def _honours_changed_since(self) -> bool:
+        honoured = self._meta("changed_since")
+        if honoured is None:
+            # An empty answer to the probe is only conclusive when the
+            # collection holds documents. While the replica is empty a full
+            # sync costs no more than a delta, so it is not probed at all.
+            if not len(self):
+                return False
+            probe = dict(self.req)
+            probe[CHANGED_SINCE] = time.time() + PROBE_AHEAD
+            # Only the first document matters, whether or not the server
+            # honours ``limit``.
+            documents = self.firestore.iter_documents(probe, page_size=1)
+            honoured = next(documents, None) is None
+            documents.close()
+            with self._lock, self._db:
+                self._set_meta("changed_since", int(honoured))
+        return bool(honoured)
+
+    def _apply(self, page: List[Tuple[str, Any]], generation: int) -> int:
+        if not page:
+            return 0
+        upserts = [
+            (doc_id, self._codec.dumps(data).decode(), generation)
+            for doc_id, data in page
+            if data is not None
+        ]
+        deletes = [(doc_id,) for doc_id, data in page if data is None]
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO documents VALUES (?, ?, ?) ON CONFLICT (id) DO UPDATE "
+                "SET data = excluded.data, generation = excluded.generation",
+                upserts,
+            )
+            self._db.executemany("DELETE FROM documents WHERE id = ?", deletes)
+        return len(page)
+
+    def _meta(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM meta WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else default
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        self._db.execute(
+            "INSERT INTO meta VALUES (?, ?) ON CONFLICT (key) DO UPDATE "
+            "SET value = excluded.value",
+            (key, value),
+        )
+
+
+def _column(field: str) -> str:
+    if not _FIELD.match(field):
+        raise ValueError(f"Invalid field path: {field!r}")
+    # The path is spelled out rather than bound so that SQLite can match the
+    # expression against the field's index.
+    return f"json_extract(data, '$.{field}')"
+
+
+def _index_name(field: str) -> str:
+    # "_" and "." are escaped so that "a__b" and "a.b" get different indexes
+    # and stats() can recover the field from the name.
+    return "field_" + field.replace("_", "_u").replace(".", "_d")
+
+
+def _index_field(name: str) -> str:
+    return _INDEX_ESCAPE.sub(
+        lambda match: "_" if match[1] == "u" else ".", name[len("field_") :]
+    )
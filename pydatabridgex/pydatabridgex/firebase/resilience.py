@@ -0,0 +1,224 @@
+import random
+import threading
+import time
+from typing import Iterable, Optional
+from .errors import CircuitOpenError, FirebaseError
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After ``failure_threshold`` consecutive transient failures an endpoint is
+    opened and requests to it fail fast with CircuitOpenError. Once
+    ``reset_timeout`` seconds have passed a single probe request is let
+    through; its success closes the circuit and its failure re-opens it.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open before a probe.
+
+    Methods:
+        before(endpoint): Raises CircuitOpenError if the endpoint is open.
+        record_success(endpoint): Closes the endpoint's circuit.
+        record_failure(endpoint): Counts a failure, opening the circuit at the threshold.
+        release(endpoint): Ends a probe that neither succeeded nor failed.
+        state(endpoint): Returns "closed", "open" or "half_open".
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Initializes the CircuitBreaker with every endpoint closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a probe.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._probing = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"CircuitBreaker(failure_threshold={self.failure_threshold}, "
+            f"reset_timeout={self.reset_timeout})"
+        )
+
+    def state(self, endpoint: str) -> str:
+        """
+        Returns the state of an endpoint's circuit.
+
+        Args:
+            endpoint (str): The endpoint.
+
+        Returns:
+            str: "closed", "open" or "half_open".
+        """
+        opened_at = self._opened_at.get(endpoint)
+        if opened_at is None:
+            return "closed"
+        if time.monotonic() - opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def before(self, endpoint: str) -> bool:
+        """
+        Checks whether a request to the endpoint may be sent.
+
+        Args:
+            endpoint (str): The endpoint.
+
+        Returns:
+            bool: Whether the request is the probe of a half-open circuit; the
+            caller must then end it with record_success, record_failure or
+            release.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or a probe is already in flight.
+        """
+        with self._lock:
+            opened_at = self._opened_at.get(endpoint)
+            if opened_at is None:
+                return False
+            remaining = self.reset_timeout - (time.monotonic() - opened_at)
+            if remaining <= 0 and endpoint not in self._probing:
+                self._probing.add(endpoint)
+                return True
+        raise CircuitOpenError(endpoint, max(remaining, 0.0))
+
+    def record_success(self, endpoint: str) -> None:
+        """
+        Closes the endpoint's circuit.
+
+        Args:
+            endpoint (str): The endpoint.
+        """
+        with self._lock:
+            self._failures.pop(endpoint, None)
+            self._opened_at.pop(endpoint, None)
+            self._probing.discard(endpoint)
+
+    def record_failure(self, endpoint: str) -> None:
+        """
+        Counts a failure, opening the circuit once the threshold is reached.
+
+        Args:
+            endpoint (str): The endpoint.
+        """
+        with self._lock:
+            failures = self._failures.get(endpoint, 0) + 1
+            self._failures[endpoint] = failures
+            if endpoint in self._probing or failures >= self.failure_threshold:
+                self._opened_at[endpoint] = time.monotonic()
+                self._probing.discard(endpoint)
+
+    def release(self, endpoint: str) -> None:
+        """
+        Ends an endpoint's probe without recording an outcome, so that a probe
+        interrupted by an unexpected error does not keep the circuit open for
+        good; the next request after it becomes the new probe.
+
+        Args:
+            endpoint (str): The endpoint.
+        """
+        with self._lock:
+            self._probing.discard(endpoint)
+
+
+class ResiliencePolicy:
+    """
+    Retry, backoff and circuit-breaking policy for Firebase requests.
+
+    Transient failures (connection errors, 429 and 5xx responses) are retried
+    with exponential backoff and full jitter, honouring ``Retry-After``.
+    Requests with non-idempotent methods are only retried when the error
+    shows they never took effect (a failed connect, 429 or 503). PATCH counts
+    as idempotent because the clients only use it for multi-location sets.
+
+    Args:
+        max_attempts (int): The maximum number of attempts per request, including the first.
+        backoff (float): The base backoff in seconds.
+        max_backoff (float): The upper bound of a single backoff, including ``Retry-After``.
+        idempotent_methods (Iterable[str]): The methods that are safe to retry after any transient error.
+        breaker (CircuitBreaker, optional): The circuit breaker. Defaults to a new CircuitBreaker;
+            pass ``False`` to disable circuit breaking.
+
+    Methods:
+        should_retry(method, error, attempt): Whether a failed attempt should be retried.
+        delay(attempt, retry_after): The number of seconds to wait before the next attempt.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        backoff: float = 0.2,
+        max_backoff: float = 30.0,
+        idempotent_methods: Iterable[str] = ("GET", "PUT", "PATCH", "DELETE"),
+        breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        """
+        Initializes the ResiliencePolicy.
+
+        Args:
+            max_attempts (int): The maximum number of attempts per request, including the first.
+            backoff (float): The base backoff in seconds.
+            max_backoff (float): The upper bound of a single backoff, including ``Retry-After``.
+            idempotent_methods (Iterable[str]): The methods that are safe to retry after any transient error.
+            breaker (CircuitBreaker, optional): The circuit breaker, or ``False`` to disable it.
+        """
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.breaker = (
+            CircuitBreaker() if breaker is None else breaker if breaker else None
+        )
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"ResiliencePolicy(max_attempts={self.max_attempts}, "
+            f"backoff={self.backoff}, breaker={self.breaker})"
+        )
+
+    def should_retry(self, method: str, error: FirebaseError, attempt: int) -> bool:
+        """
+        Decides whether a failed attempt should be retried.
+
+        Args:
+            method (str): The HTTP method.
+            error (FirebaseError): The error raised by the attempt.
+            attempt (int): The number of attempts made so far.
+
+        Returns:
+            bool: Whether to retry.
+        """
+        if attempt >= self.max_attempts or not error.transient:
+            return False
+        return error.retry_safe or method in self.idempotent_methods
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): The number of attempts made so far.
+            retry_after (float, optional): The delay requested by the server.
+
+        Returns:
+            float: The backoff in seconds.
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_backoff)
@@ -1,6 +1,10 @@
-from pydatabridge.pydatabridge import Configuration
-from typing import Dict, Any
+from .configuration import Configuration
+from .base import FirebaseBase, AsyncFirebaseBase, _request_error, _token_source
+from typing import Dict, Any, Callable, Optional
 import requests
+from .resilience import ResiliencePolicy
+from .upload import ResumableUpload, Source
+from ..instrumentation import measure
 
 
 class Storage(FirebaseBase):
@@ -9,6 +13,7 @@ class Storage(FirebaseBase):
 
     Args:
         config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
 
     Attributes:
         config (Configuration): The Firebase configuration.
@@ -16,18 +21,22 @@ class Storage(FirebaseBase):
     Methods:
         upload_byte8_array(path, image_base64): Uploads a base64-encoded image.
         upload_file(file_path, path): Uploads a file.
+        upload_stream(source, path): Streams a file or byte iterator in resumable chunks.
         get_download_url(path): Retrieves the download URL of a file.
         delete_file(path): Deletes a file.
     """
 
-    def __init__(self, config: Configuration) -> None:
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
         """
         Initializes the Storage instance.
 
         Args:
             config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
         """
-        super().__init__(config)
+        super().__init__(config, policy)
 
     def __repr__(self) -> str:
         """
@@ -78,9 +87,73 @@ class Storage(FirebaseBase):
         Returns:
             dict: The response data from the server.
         """
-        files = {"file": open(file_path, "rb")}
         data = {"path": path}
-        return self._send_request("POST", "uploadFile", data=data, files=files)
+        with open(file_path, "rb") as file:
+            return self._send_request(
+                "POST", "uploadFile", data=data, files={"file": file}
+            )
+
+    def upload_stream(
+        self,
+        source: Source,
+        path: str,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = 8 * 1024 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        max_retries: int = 3,
+        token: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Streams a file or byte iterator to Firebase Storage in bounded-size chunks.
+
+        Peak memory is about two chunks regardless of the source size, and a
+        failed chunk is resumed from the offset the server acknowledged. Use
+        ResumableUpload directly to resume a session after this call gives up.
+
+        Args:
+            source (Union[str, BinaryIO, Iterable[bytes]]): A file path, a binary file
+                object or an iterable of byte chunks.
+            path (str): The path to store the file.
+            content_type (str): The content type stored with the file.
+            chunk_size (int): The chunk size in bytes, rounded up to a multiple of 256 KiB.
+            progress (Callable[[int, Optional[int]], None], optional): Called with the bytes
+                uploaded so far and the total size when known.
+            max_retries (int): The number of times a failed chunk is retried.
+            token (str, optional): A Firebase ID token authorizing the upload.
+                Defaults to one from the client's token source, if any.
+
+        Returns:
+            dict: The metadata of the stored file.
+
+        Raises:
+            FirebaseHTTPError: If the server answered with an error status.
+            FirebaseConnectionError: If no response was received.
+            CircuitOpenError: If the upload endpoint's circuit breaker is open.
+        """
+        token_source = _token_source(self)
+        if token is None and token_source is not None:
+            token = token_source()
+        upload = ResumableUpload(
+            self.transport,
+            self.config.storage_bucket,
+            path,
+            content_type=content_type,
+            chunk_size=chunk_size,
+            progress=progress,
+            max_retries=max_retries,
+            headers={"Authorization": f"Firebase {token}"} if token else None,
+            policy=self.policy,
+        )
+        with measure(
+            self.config.instrumentation, type(self).__name__, "upload_stream", path
+        ) as call:
+            try:
+                result = upload.upload(source)
+            except requests.exceptions.RequestException as e:
+                raise _request_error(e) from e
+            finally:
+                call.bytes_sent = upload.offset
+            return result
 
     def get_download_url(self, path: str) -> Dict[str, Any]:
         """
@@ -107,3 +180,115 @@ class Storage(FirebaseBase):
         """
         data = {"path": path}
         return self._send_request("DELETE", "deleteFile", data=data)
+
+
+class AsyncStorage(AsyncFirebaseBase):
+    """
+    Represents an asyncio Storage instance for performing file operations.
+
+    Args:
+        config (Configuration): The Firebase configuration.
+        policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+
+    Attributes:
+        config (Configuration): The Firebase configuration.
+
+    Methods:
+        upload_byte8_array(path, image_base64): Uploads a base64-encoded image.
+        upload_file(file_path, path): Uploads a file.
+        get_download_url(path): Retrieves the download URL of a file.
+        delete_file(path): Deletes a file.
+    """
+
+    def __init__(
+        self, config: Configuration, policy: Optional[ResiliencePolicy] = None
+    ) -> None:
+        """
+        Initializes the AsyncStorage instance.
+
+        Args:
+            config (Configuration): The Firebase configuration.
+            policy (ResiliencePolicy, optional): The retry and circuit-breaking policy.
+        """
+        super().__init__(config, policy)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncStorage(config={self.config})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"AsyncStorage: Config={self.config}"
+
+    def __len__(self) -> int:
+        """
+        Return the length of the object.
+        """
+        return len(self.config)
+
+    def __getitem__(self, key: str) -> Any:
+        """
+        Get an item from the object.
+        """
+        return self.config[key]
+
+    async def upload_byte8_array(self, path: str, image_base64: str) -> Dict[str, Any]:
+        """
+        Uploads a base64-encoded image to Firebase Storage.
+
+        Args:
+            path (str): The path to store the image.
+            image_base64 (str): The base64-encoded image data.
+
+        Returns:
+            dict: The response data from the server.
+        """
+        data = {"path": path, "imageBase64": image_base64}
+        return await self._send_request("POST", "uploadByte8Array", data=data)
+
+    async def upload_file(self, file_path: str, path: str) -> Dict[str, Any]:
+        """
+        Uploads a file to Firebase Storage.
+
+        Args:
+            file_path (str): The path of the file to upload.
+            path (str): The path to store the file.
+
+        Returns:
+            dict: The response data from the server.
+        """
+        data = {"path": path}
+        with open(file_path, "rb") as file:
+            return await self._send_request(
+                "POST", "uploadFile", data=data, files={"file": file}
+            )
+
+    async def get_download_url(self, path: str) -> Dict[str, Any]:
+        """
+        Retrieves the download URL of a file from Firebase Storage.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            dict: The response data from the server.
+        """
+        data = {"path": path}
+        return await self._send_request("POST", "getDownloadURL", data=data)
+
+    async def delete_file(self, path: str) -> Dict[str, Any]:
+        """
+        Deletes a file from Firebase Storage.
+
+        Args:
+            path (str): The path of the file to delete.
+
+        Returns:
+            dict: The response data from the server.
+        """
+        data = {"path": path}
+        return await self._send_request("DELETE", "deleteFile", data=data)
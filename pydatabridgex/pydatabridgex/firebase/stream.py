@@ -0,0 +1,428 @@
+import copy
+import inspect
+import socket
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+import requests
+from .base import _http_error
+from .codec import JSONCodec
+from .errors import FirebaseConnectionError, FirebaseError
+from .resilience import ResiliencePolicy
+
+STREAM_HEADERS = {"Accept": "text/event-stream", "Cache-Control": "no-cache"}
+
+
+class StreamEvent(NamedTuple):
+    """
+    One change delivered by a Realtime Database stream.
+
+    Attributes:
+        event (str): "put" (replace the value at ``path``) or "patch" (merge
+            the children in ``data`` into the value at ``path``).
+        path (str): The changed location, relative to the listened path.
+        data (Any): The new value; None deletes.
+    """
+
+    event: str
+    path: str
+    data: Any
+
+
+class Snapshot:
+    """
+    A local copy of the data under a listened path, updated in place as events arrive.
+
+    Methods:
+        apply(event): Applies a put or patch event.
+        get(path): Returns the value at a path, or None.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty Snapshot.
+        """
+        self.data = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"Snapshot(data={self.data!r})"
+
+    def apply(self, event: StreamEvent) -> None:
+        """
+        Applies a put or patch event.
+
+        Args:
+            event (StreamEvent): The event to apply.
+        """
+        keys = _split(event.path)
+        data = copy.deepcopy(event.data)
+        with self._lock:
+            if event.event == "put":
+                self.data = _assign(self.data, keys, data)
+            elif event.event == "patch":
+                for child, value in (data or {}).items():
+                    self.data = _assign(self.data, keys + _split(child), value)
+
+    def get(self, path: str = "/") -> Any:
+        """
+        Returns the value at a path, or None.
+
+        Args:
+            path (str): The path relative to the listened path.
+
+        Returns:
+            Any: The value.
+        """
+        node = self.data
+        for key in _split(path):
+            if not isinstance(node, dict):
+                return None
+            node = node.get(key)
+        return node
+
+
+class _EventParser:
+    """
+    Incremental server-sent events parser; feed it one line at a time.
+    """
+
+    def __init__(self) -> None:
+        self.event = None
+        self.data = []
+        self.last_id = None
+
+    def feed(self, line: str) -> Optional[tuple]:
+        if line == "":
+            event, data = self.event, "\n".join(self.data)
+            self.event, self.data = None, []
+            return (event or "message", data) if event or data else None
+        if line.startswith(":"):
+            return None
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            self.event = value
+        elif field == "data":
+            self.data.append(value)
+        elif field == "id":
+            self.last_id = value
+        return None
+
+
+class Listener:
+    """
+    Keeps one streaming connection to a Realtime Database path open in a
+    background thread and delivers put/patch events to a callback.
+
+    Dropped connections are re-opened with backoff from the policy, sending
+    ``Last-Event-ID`` when the server supplied event IDs; the server answers a
+    reconnect with a put of the current value, which re-synchronises the
+    snapshot. Non-transient errors (such as a revoked permission) stop the
+    listener and are kept in ``error``.
+
+    Args:
+        transport (Transport): The pooled HTTP transport.
+        url (str): The ``.json`` URL of the listened path.
+        callback (Callable[[StreamEvent], None]): Called on the listener thread for each event.
+        params (Dict[str, str], optional): Query parameters such as ``auth``, or a
+            callable returning them, called again on every reconnect.
+        snapshot (Snapshot, optional): A snapshot kept current before the callback runs.
+        policy (ResiliencePolicy, optional): Supplies the reconnect backoff.
+        read_timeout (float): Seconds without data (including keep-alives) before reconnecting.
+        codec (JSONCodec, optional): Decodes event payloads.
+
+    Attributes:
+        error (Optional[Exception]): The error that stopped the listener, if any,
+            including an exception raised by the callback.
+    """
+
+    def __init__(
+        self,
+        transport: Any,
+        url: str,
+        callback: Callable[[StreamEvent], None],
+        params: Optional[Dict[str, str]] = None,
+        snapshot: Optional[Snapshot] = None,
+        policy: Optional[ResiliencePolicy] = None,
+        read_timeout: float = 90.0,
+        codec: Optional[JSONCodec] = None,
+    ) -> None:
+        """
+        Initializes the Listener; call start() to open the stream.
+
+        Args:
+            transport (Transport): The pooled HTTP transport.
+            url (str): The ``.json`` URL of the listened path.
+            callback (Callable[[StreamEvent], None]): Called for each event.
+            params (Dict[str, str], optional): Query parameters such as ``auth``, or a
+                callable returning them.
+            snapshot (Snapshot, optional): A snapshot kept current before the callback runs.
+            policy (ResiliencePolicy, optional): Supplies the reconnect backoff.
+            read_timeout (float): Seconds without data before reconnecting.
+            codec (JSONCodec, optional): Decodes event payloads. Defaults to the
+                standard library codec.
+        """
+        self.transport = transport
+        self.url = url
+        self.callback = callback
+        self.params = params
+        self.snapshot = snapshot
+        self.policy = policy if policy is not None else ResiliencePolicy()
+        self.read_timeout = read_timeout
+        self.codec = codec if codec is not None else JSONCodec()
+        self.error = None
+        self._parser = _EventParser()
+        self._closed = threading.Event()
+        self._response = None
+        self._thread = None
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"Listener(url={self.url!r}, running={self.running})"
+
+    def __enter__(self) -> "Listener":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def running(self) -> bool:
+        """
+        Whether the listener thread is alive.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "Listener":
+        """
+        Starts the listener thread.
+
+        Returns:
+            Listener: This listener.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the listener and closes its connection.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the thread to finish.
+        """
+        self._closed.set()
+        response = self._response
+        if response is not None:
+            _interrupt(response)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._closed.is_set():
+            try:
+                for event in self._stream():
+                    failures = 0
+                    if self.snapshot is not None:
+                        self.snapshot.apply(event)
+                    self.callback(event)
+            except FirebaseError as e:
+                if self._closed.is_set():
+                    return
+                if not e.transient:
+                    self.error = e
+                    return
+                failures += 1
+                self._closed.wait(self.policy.delay(failures, e.retry_after))
+            except Exception as e:
+                if self._closed.is_set():
+                    return
+                self.error = e
+                raise
+
+    def _stream(self) -> Iterator[StreamEvent]:
+        headers = _headers(self._parser)
+        try:
+            response = self.transport.request(
+                "GET",
+                self.url,
+                params=_params(self.params),
+                headers=headers,
+                stream=True,
+                timeout=(_connect_timeout(self.transport.timeout), self.read_timeout),
+            )
+        except requests.exceptions.RequestException as e:
+            raise FirebaseConnectionError(str(e), retry_safe=True) from e
+        self._response = response
+        try:
+            _check(response.status_code, response.reason, response.headers, self.url)
+            lines = response.iter_lines(decode_unicode=True)
+            yield from _events(self._parser, lines, self.codec)
+        except (requests.exceptions.RequestException, AttributeError, ValueError) as e:
+            raise FirebaseConnectionError(str(e)) from e
+        finally:
+            self._response = None
+            response.close()
+        raise FirebaseConnectionError(f"Stream closed by server: {self.url}")
+
+
+async def listen_async(
+    transport: Any,
+    url: str,
+    params: Optional[Dict[str, str]] = None,
+    snapshot: Optional[Snapshot] = None,
+    policy: Optional[ResiliencePolicy] = None,
+    read_timeout: float = 90.0,
+    codec: Optional[JSONCodec] = None,
+) -> AsyncIterator[StreamEvent]:
+    """
+    Streams put/patch events from a Realtime Database path, reconnecting
+    like Listener does.
+
+    Args:
+        transport (AsyncTransport): The pooled asyncio HTTP transport.
+        url (str): The ``.json`` URL of the listened path.
+        params (Dict[str, str], optional): Query parameters such as ``auth``, or a
+            callable returning them or an awaitable of them, called again on
+            every reconnect.
+        snapshot (Snapshot, optional): A snapshot updated before each event is yielded.
+        policy (ResiliencePolicy, optional): Supplies the reconnect backoff.
+        read_timeout (float): Seconds without data before reconnecting.
+        codec (JSONCodec, optional): Decodes event payloads.
+
+    Yields:
+        StreamEvent: Each change.
+
+    Raises:
+        FirebaseHTTPError: If the stream fails with a non-transient error.
+    """
+    import asyncio
+    import httpx
+
+    policy = policy if policy is not None else ResiliencePolicy()
+    codec = codec if codec is not None else JSONCodec()
+    parser = _EventParser()
+    timeout = httpx.Timeout(read_timeout, connect=transport.client.timeout.connect)
+    failures = 0
+    while True:
+        try:
+            try:
+                query = _params(params)
+                if inspect.isawaitable(query):
+                    query = await query
+                async with transport.client.stream(
+                    "GET",
+                    url,
+                    params=query,
+                    headers=_headers(parser),
+                    timeout=timeout,
+                    follow_redirects=True,
+                ) as response:
+                    _check(
+                        response.status_code,
+                        response.reason_phrase,
+                        response.headers,
+                        url,
+                    )
+                    async for line in response.aiter_lines():
+                        for event in _events(parser, [line.rstrip("\r\n")], codec):
+                            failures = 0
+                            if snapshot is not None:
+                                snapshot.apply(event)
+                            yield event
+            except httpx.HTTPError as e:
+                raise FirebaseConnectionError(str(e)) from e
+            raise FirebaseConnectionError(f"Stream closed by server: {url}")
+        except FirebaseError as e:
+            if not e.transient:
+                raise
+            failures += 1
+            await asyncio.sleep(policy.delay(failures, e.retry_after))
+
+
+def _interrupt(response: requests.Response) -> None:
+    # Closing the response from another thread would wait for the blocked
+    # read to finish; shutting the socket down makes that read return now.
+    raw = response.raw
+    connection = getattr(raw, "connection", None) or getattr(raw, "_connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is None:
+        fp = getattr(getattr(raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+def _connect_timeout(timeout: Any) -> float:
+    return timeout[0] if isinstance(timeout, tuple) else timeout
+
+
+def _params(params: Any) -> Optional[Dict[str, str]]:
+    return params() if callable(params) else params
+
+
+def _headers(parser: _EventParser) -> Dict[str, str]:
+    if parser.last_id is None:
+        return STREAM_HEADERS
+    return dict(STREAM_HEADERS, **{"Last-Event-ID": parser.last_id})
+
+
+def _check(status_code: int, reason: str, headers: Any, url: str) -> None:
+    if status_code >= 400:
+        raise _http_error(status_code, reason, url, "", headers.get("Retry-After"))
+
+
+def _events(
+    parser: _EventParser, lines: Any, codec: JSONCodec
+) -> Iterator[StreamEvent]:
+    for line in lines:
+        parsed = parser.feed(line)
+        if parsed is None:
+            continue
+        event, data = parsed
+        if event in ("put", "patch"):
+            payload = codec.loads(data)
+            yield StreamEvent(event, payload.get("path", "/"), payload.get("data"))
+        elif event == "cancel":
+            raise FirebaseError(f"Stream cancelled by server: {data}")
+        elif event == "auth_revoked":
+            raise FirebaseConnectionError(f"Stream credential expired: {data}")
+
+
+def _split(path: str) -> List[str]:
+    return [key for key in path.split("/") if key]
+
+
+def _assign(node: Any, keys: List[str], value: Any) -> Any:
+    if not keys:
+        return value
+    if not isinstance(node, dict):
+        if value is None:
+            return node
+        node = {}
+    key, rest = keys[0], keys[1:]
+    child = _assign(node.get(key), rest, value)
+    if child is None:
+        node.pop(key, None)
+    else:
+        node[key] = child
+    return node or None
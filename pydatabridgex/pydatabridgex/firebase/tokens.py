@@ -0,0 +1,460 @@
+import heapq
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+import requests
+from .base import _http_error
+from .errors import FirebaseConnectionError, FirebaseError
+from .resilience import ResiliencePolicy
+
+SECURE_TOKEN_URL = "https://securetoken.googleapis.com/v1/token"
+
+# A token this close to expiry is refreshed before use rather than returned.
+EXPIRY_SKEW = 30.0
+
+# A token is not renewed before this fraction of its lifetime has passed, so a
+# lifetime shorter than refresh_margin does not make every new token due at once.
+MIN_LIFETIME_USED = 0.5
+
+
+class Token:
+    """
+    A cached Firebase ID token and the refresh token that renews it.
+
+    Attributes:
+        id_token (str): The ID token sent with requests.
+        refresh_token (Optional[str]): The token exchanged for a new ID token.
+        expires_at (float): The ``time.time()`` at which the ID token expires.
+        uid (Optional[str]): The user ID, when known.
+    """
+
+    __slots__ = ("id_token", "refresh_token", "expires_at", "uid")
+
+    def __init__(
+        self,
+        id_token: str,
+        refresh_token: Optional[str],
+        expires_at: float,
+        uid: Optional[str] = None,
+    ) -> None:
+        self.id_token = id_token
+        self.refresh_token = refresh_token
+        self.expires_at = expires_at
+        self.uid = uid
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"Token(uid={self.uid!r}, expires_in={self.expires_at - time.time():.0f}s)"
+        )
+
+    @classmethod
+    def from_response(
+        cls, response: Dict[str, Any], previous: Optional["Token"] = None
+    ) -> "Token":
+        """
+        Builds a Token from a sign-in or refresh response.
+
+        Both the camelCase keys of sign-in responses and the snake_case keys
+        of the secure token endpoint are accepted.
+
+        Args:
+            response (Dict[str, Any]): The response data.
+            previous (Token, optional): The token being renewed, whose refresh
+                token and user ID are kept when the response omits them.
+
+        Returns:
+            Token: The parsed token.
+        """
+
+        def pick(*keys: str) -> Any:
+            for key in keys:
+                if response.get(key) is not None:
+                    return response[key]
+            return None
+
+        id_token = pick("idToken", "id_token", "access_token")
+        if id_token is None:
+            raise FirebaseError("The response does not contain an ID token")
+        return cls(
+            id_token,
+            pick("refreshToken", "refresh_token")
+            or (previous.refresh_token if previous else None),
+            time.time() + float(pick("expiresIn", "expires_in") or 3600),
+            pick("localId", "user_id", "uid") or (previous.uid if previous else None),
+        )
+
+
+class TokenManager:
+    """
+    Caches ID tokens per identity and refreshes them in the background.
+
+    Each token is renewed on a background thread ``refresh_margin`` seconds
+    before it expires, or half-way through its lifetime if that is later, so
+    get() returns the cached token without a network call. A failed renewal
+    is retried with the policy's backoff; one that cannot succeed by
+    retrying, such as a revoked refresh token, stops the renewals of that
+    identity and is kept for error(). Concurrent refreshes of one identity are coalesced into a single
+    request. Tokens are renewed with their refresh token through the secure
+    token endpoint, or with a fetch callable registered for the identity
+    (for example one minting service-account tokens). Coroutines use aget()
+    or async_source(), which renew a token that has to be refreshed before
+    use without blocking the event loop.
+
+    Args:
+        transport (Transport): The pooled HTTP transport.
+        api_key (str, optional): The Web API key used with the secure token endpoint.
+        refresh_margin (float): Seconds before expiry at which a token is refreshed.
+        policy (ResiliencePolicy, optional): Supplies the backoff after a failed refresh.
+        async_transport (AsyncTransport, optional): The pooled asyncio HTTP transport
+            used by aget() and arefresh().
+
+    Methods:
+        store(identity, response): Caches the token in a sign-in response.
+        register(identity, fetch): Registers a callable that fetches fresh tokens.
+        get(identity): Returns a valid ID token.
+        aget(identity): Returns a valid ID token without blocking the event loop.
+        source(identity): Returns a callable returning the identity's ID token.
+        async_source(identity): Returns a coroutine function returning the identity's ID token.
+        refresh(identity): Renews a token now.
+        arefresh(identity): Renews a token now from a coroutine.
+        error(identity): Returns the error that stopped background renewal.
+        remove(identity): Forgets an identity.
+        close(): Stops the background refresh thread.
+    """
+
+    def __init__(
+        self,
+        transport: Any,
+        api_key: Optional[str] = None,
+        refresh_margin: float = 300.0,
+        policy: Optional[ResiliencePolicy] = None,
+        async_transport: Optional[Any] = None,
+    ) -> None:
+        """
+        Initializes an empty TokenManager; the refresh thread starts with the first token.
+
+        Args:
+            transport (Transport): The pooled HTTP transport.
+            api_key (str, optional): The Web API key used with the secure token endpoint.
+            refresh_margin (float): Seconds before expiry at which a token is refreshed.
+            policy (ResiliencePolicy, optional): Supplies the backoff after a failed refresh.
+            async_transport (AsyncTransport, optional): The pooled asyncio HTTP transport.
+        """
+        self.transport = transport
+        self.async_transport = async_transport
+        self.api_key = api_key
+        self.refresh_margin = refresh_margin
+        self.policy = policy if policy is not None else ResiliencePolicy()
+        self.token_url = SECURE_TOKEN_URL
+        self._tokens = {}
+        self._fetchers = {}
+        self._inflight = {}
+        self._failures = {}
+        self._errors = {}
+        self._schedule = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._closed = False
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"TokenManager(identities={len(self._tokens)})"
+
+    def __contains__(self, identity: str) -> bool:
+        return identity in self._tokens
+
+    def store(self, identity: str, response: Dict[str, Any]) -> Token:
+        """
+        Caches the token in a sign-in or refresh response and schedules its refresh.
+
+        Args:
+            identity (str): The user or service identity, e.g. an email address.
+            response (Dict[str, Any]): The response data.
+
+        Returns:
+            Token: The cached token.
+        """
+        token = Token.from_response(response, self._tokens.get(identity))
+        self._put(identity, token)
+        return token
+
+    def register(self, identity: str, fetch: Callable[[], Dict[str, Any]]) -> None:
+        """
+        Registers a callable that returns a fresh token response for an identity.
+
+        The callable is used instead of the refresh token, including for the
+        first token, which is fetched on the first get().
+
+        Args:
+            identity (str): The user or service identity.
+            fetch (Callable[[], Dict[str, Any]]): Returns a response accepted by store().
+        """
+        self._fetchers[identity] = fetch
+
+    def get(self, identity: str) -> str:
+        """
+        Returns a valid ID token, refreshing it first only if it is about to expire.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            str: The ID token.
+
+        Raises:
+            FirebaseError: If the identity is unknown or its token cannot be refreshed.
+        """
+        token = self._tokens.get(identity)
+        if token is None or time.time() >= token.expires_at - EXPIRY_SKEW:
+            token = self.refresh(identity)
+        return token.id_token
+
+    async def aget(self, identity: str) -> str:
+        """
+        Returns a valid ID token, refreshing it first only if it is about to expire.
+
+        Behaves like get(), but a refresh runs over ``async_transport``, or on
+        a worker thread for a registered fetch callable or when no
+        ``async_transport`` was given, while the event loop keeps running.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            str: The ID token.
+
+        Raises:
+            FirebaseError: If the identity is unknown or its token cannot be refreshed.
+        """
+        token = self._tokens.get(identity)
+        if token is None or time.time() >= token.expires_at - EXPIRY_SKEW:
+            token = await self.arefresh(identity)
+        return token.id_token
+
+    def source(self, identity: str) -> Callable[[], str]:
+        """
+        Returns a callable that returns the identity's current ID token.
+
+        Assign it to the ``token_source`` of a client, or of a configuration
+        to attach the token to every request made with it.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            Callable[[], str]: The token source.
+        """
+        return lambda: self.get(identity)
+
+    def async_source(self, identity: str) -> Callable[[], Awaitable[str]]:
+        """
+        Returns a coroutine function that returns the identity's current ID token.
+
+        Assign it to the ``token_source`` of an asyncio client.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            Callable[[], Awaitable[str]]: The token source.
+        """
+        return lambda: self.aget(identity)
+
+    def refresh(self, identity: str) -> Token:
+        """
+        Renews a token now; concurrent calls for one identity share one request.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            Token: The renewed token.
+        """
+        with self._lock:
+            future = self._inflight.get(identity)
+            owner = future is None
+            if owner:
+                future = self._inflight[identity] = Future()
+        if not owner:
+            return future.result()
+        try:
+            token = self._renew(identity)
+            self._put(identity, token)
+            future.set_result(token)
+            return token
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(identity, None)
+
+    async def arefresh(self, identity: str) -> Token:
+        """
+        Renews a token now from a coroutine; it shares in-flight renewals with refresh().
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            Token: The renewed token.
+        """
+        import asyncio
+
+        with self._lock:
+            future = self._inflight.get(identity)
+            owner = future is None
+            if owner:
+                future = self._inflight[identity] = Future()
+        if not owner:
+            return await asyncio.wrap_future(future)
+        try:
+            token = await self._arenew(identity)
+            self._put(identity, token)
+            future.set_result(token)
+            return token
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(identity, None)
+
+    def error(self, identity: str) -> Optional[Exception]:
+        """
+        Returns the error that stopped the background renewal of an identity.
+
+        Args:
+            identity (str): The user or service identity.
+
+        Returns:
+            Optional[Exception]: The error, or None while renewals are scheduled.
+        """
+        return self._errors.get(identity)
+
+    def remove(self, identity: str) -> None:
+        """
+        Forgets an identity's token and fetch callable.
+
+        Args:
+            identity (str): The user or service identity.
+        """
+        with self._lock:
+            self._tokens.pop(identity, None)
+            self._fetchers.pop(identity, None)
+            self._failures.pop(identity, None)
+            self._errors.pop(identity, None)
+
+    def close(self) -> None:
+        """
+        Stops the background refresh thread.
+        """
+        with self._wakeup:
+            self._closed = True
+            self._wakeup.notify_all()
+
+    def _renew(self, identity: str) -> Token:
+        fetch = self._fetchers.get(identity)
+        previous = self._tokens.get(identity)
+        if fetch is not None:
+            return Token.from_response(fetch(), previous)
+        grant = self._grant(identity, previous)
+        try:
+            response = self.transport.request(
+                "POST", self.token_url, params={"key": self.api_key}, data=grant
+            )
+        except requests.exceptions.RequestException as e:
+            raise FirebaseConnectionError(str(e)) from e
+        return self._parse(response, response.reason, previous)
+
+    async def _arenew(self, identity: str) -> Token:
+        import asyncio
+        import httpx
+
+        if identity in self._fetchers or self.async_transport is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._renew, identity)
+        previous = self._tokens.get(identity)
+        grant = self._grant(identity, previous)
+        try:
+            response = await self.async_transport.request(
+                "POST", self.token_url, params={"key": self.api_key}, data=grant
+            )
+        except httpx.HTTPError as e:
+            raise FirebaseConnectionError(str(e)) from e
+        return self._parse(response, response.reason_phrase, previous)
+
+    def _grant(self, identity: str, previous: Optional[Token]) -> Dict[str, str]:
+        if previous is None or previous.refresh_token is None:
+            raise FirebaseError(f"No token or refresh token for '{identity}'")
+        if not self.api_key:
+            raise FirebaseError("Refreshing tokens requires the Web API key")
+        return {"grant_type": "refresh_token", "refresh_token": previous.refresh_token}
+
+    def _parse(self, response: Any, reason: str, previous: Optional[Token]) -> Token:
+        if response.status_code >= 400:
+            raise _http_error(
+                response.status_code,
+                reason,
+                self.token_url,
+                response.text,
+                response.headers.get("Retry-After"),
+            )
+        return Token.from_response(response.json(), previous)
+
+    def _put(self, identity: str, token: Token) -> None:
+        with self._wakeup:
+            self._tokens[identity] = token
+            self._failures.pop(identity, None)
+            self._errors.pop(identity, None)
+            lifetime = token.expires_at - time.time()
+            due = max(
+                token.expires_at - self.refresh_margin,
+                time.time() + lifetime * MIN_LIFETIME_USED,
+            )
+            self._enqueue(identity, token, due)
+
+    def _enqueue(self, identity: str, token: Token, due: float) -> None:
+        heapq.heappush(self._schedule, (due, identity, token.expires_at))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._wakeup.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._wakeup:
+                while not self._closed:
+                    delay = (
+                        self._schedule[0][0] - time.time() if self._schedule else None
+                    )
+                    if delay is not None and delay <= 0:
+                        break
+                    self._wakeup.wait(delay)
+                if self._closed:
+                    return
+                _, identity, expires_at = heapq.heappop(self._schedule)
+                token = self._tokens.get(identity)
+                if token is None or token.expires_at != expires_at:
+                    continue
+            try:
+                self.refresh(identity)
+            except Exception as e:
+                with self._wakeup:
+                    if self._tokens.get(identity) is not token:
+                        continue
+                    if isinstance(e, FirebaseError) and not e.transient:
+                        self._errors[identity] = e
+                        continue
+                    failures = self._failures.get(identity, 0) + 1
+                    self._failures[identity] = failures
+                    retry_after = getattr(e, "retry_after", None)
+                    due = time.time() + self.policy.delay(failures, retry_after)
+                    self._enqueue(identity, token, due)
@@ -0,0 +1,235 @@
+from typing import Any, Dict, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class Transport:
+    """
+    Pooled, keep-alive HTTP transport shared by Firebase clients.
+
+    A single ``requests.Session`` is kept per transport so TCP and TLS
+    connections are reused across requests instead of being re-established
+    on every call.
+
+    Args:
+        pool_connections (int): The number of per-host connection pools to cache.
+        pool_maxsize (int): The maximum number of connections kept open per host.
+        pool_block (bool): Whether to wait for a free connection when a host pool is exhausted.
+        timeout (Union[float, Tuple[float, float]]): The (connect, read) timeout in seconds.
+
+    Methods:
+        request(method, url, **kwargs): Sends a request over the pooled session.
+        stats(): Returns connection pool statistics.
+        close(): Closes every pooled connection.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 32,
+        pool_block: bool = False,
+        timeout: Union[float, Tuple[float, float]] = (5.0, 30.0),
+    ) -> None:
+        """
+        Initializes the Transport with its own session and connection pool.
+
+        Args:
+            pool_connections (int): The number of per-host connection pools to cache.
+            pool_maxsize (int): The maximum number of connections kept open per host.
+            pool_block (bool): Whether to wait for a free connection when a host pool is exhausted.
+            timeout (Union[float, Tuple[float, float]]): The (connect, read) timeout in seconds.
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"Transport(pool_connections={self.pool_connections}, "
+            f"pool_maxsize={self.pool_maxsize}, timeout={self.timeout})"
+        )
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Sends a request over the pooled session.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            **kwargs: Extra arguments forwarded to ``requests.Session.request``.
+
+        Returns:
+            requests.Response: The response from the server.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns connection pool statistics, useful for sizing the pool.
+
+        Returns:
+            Dict[str, Any]: The number of host pools, requests sent, connections
+            opened, idle connections and the connection reuse ratio.
+        """
+        pools = self.adapter.poolmanager.pools
+        hosts = requests_sent = opened = idle = 0
+        for key in pools.keys():
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            hosts += 1
+            requests_sent += pool.num_requests
+            opened += pool.num_connections
+            if pool.pool is not None:
+                idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        return {
+            "hosts": hosts,
+            "requests": requests_sent,
+            "connections_opened": opened,
+            "idle_connections": idle,
+            "reuse_ratio": (1.0 - opened / requests_sent if requests_sent else 0.0),
+        }
+
+    def close(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+
+class AsyncTransport:
+    """
+    Pooled HTTP transport for the asyncio Firebase clients.
+
+    Backed by a single ``httpx.AsyncClient`` so thousands of concurrent
+    requests from one event loop share keep-alive connections. HTTP/2 is
+    negotiated when the ``h2`` package is installed.
+
+    Args:
+        max_connections (int): The maximum number of open connections.
+        max_keepalive_connections (int): The maximum number of idle connections kept alive.
+        keepalive_expiry (float): Seconds an idle connection is kept before being closed.
+        timeout (Union[float, Tuple[float, float]]): The (connect, read) timeout in seconds.
+        http2 (bool): Whether to negotiate HTTP/2 when available.
+
+    Methods:
+        request(method, url, **kwargs): Sends a request over the pooled client.
+        stats(): Returns connection pool statistics.
+        aclose(): Closes every pooled connection.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 1000,
+        max_keepalive_connections: int = 100,
+        keepalive_expiry: float = 30.0,
+        timeout: Union[float, Tuple[float, float]] = (5.0, 30.0),
+        http2: bool = True,
+    ) -> None:
+        """
+        Initializes the AsyncTransport with its own client and connection pool.
+
+        Args:
+            max_connections (int): The maximum number of open connections.
+            max_keepalive_connections (int): The maximum number of idle connections kept alive.
+            keepalive_expiry (float): Seconds an idle connection is kept before being closed.
+            timeout (Union[float, Tuple[float, float]]): The (connect, read) timeout in seconds.
+            http2 (bool): Whether to negotiate HTTP/2 when available.
+        """
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "The asyncio clients require httpx: pip install PyDataBridgeX[async]"
+            ) from e
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            http2=http2,
+        )
+        self._requests = 0
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"AsyncTransport(max_connections={self.max_connections}, "
+            f"http2={self.http2})"
+        )
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> Any:
+        """
+        Sends a request over the pooled client.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            **kwargs: Extra arguments forwarded to ``httpx.AsyncClient.request``.
+
+        Returns:
+            httpx.Response: The response from the server.
+        """
+        self._requests += 1
+        return await self.client.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns connection pool statistics, useful for sizing the pool.
+
+        Returns:
+            Dict[str, Any]: The requests sent, open connections and idle connections.
+        """
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        return {
+            "requests": self._requests,
+            "open_connections": len(connections),
+            "idle_connections": sum(1 for conn in connections if conn.is_idle()),
+        }
+
+    async def aclose(self) -> None:
+        """
+        Closes every pooled connection.
+        """
+        await self.client.aclose()
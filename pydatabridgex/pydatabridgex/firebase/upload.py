@@ -0,0 +1,288 @@
+import os
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, Union
+import requests
+from .errors import parse_retry_after
+from .resilience import ResiliencePolicy
+
+CHUNK_GRANULARITY = 256 * 1024
+
+Source = Union[str, BinaryIO, Iterable[bytes]]
+
+
+class ResumableUpload:
+    """
+    Streams a file to Firebase Storage in bounded-size chunks.
+
+    Uses the Firebase Storage resumable upload protocol: a session is opened
+    once, every chunk is sent with its byte offset, and a failed chunk is
+    retried from the offset the server reports it has received. Only one
+    chunk (plus one chunk of read-ahead) is held in memory, whatever the
+    size of the source.
+
+    The requests go to Firebase Storage itself rather than through the
+    proxy, which has no resumable upload route. When a policy is given,
+    its circuit breaker guards them and its backoff paces the retries.
+
+    Args:
+        transport (Transport): The pooled HTTP transport.
+        bucket (str): The Firebase Storage bucket.
+        path (str): The destination path in the bucket.
+        content_type (str): The content type stored with the object.
+        chunk_size (int): The chunk size in bytes, rounded up to a multiple of 256 KiB.
+        progress (Callable[[int, Optional[int]], None], optional): Called with the bytes
+            uploaded so far and the total size when known.
+        max_retries (int): The number of times a failed chunk is retried.
+        headers (Dict[str, str], optional): Extra headers such as ``Authorization``.
+        policy (ResiliencePolicy, optional): The circuit breaker and backoff to apply.
+
+    Attributes:
+        upload_url (Optional[str]): The session URL, set once the upload has started.
+        offset (int): The number of bytes the server has acknowledged.
+
+    Methods:
+        upload(source): Uploads, or resumes uploading, a source.
+    """
+
+    base_url = "https://firebasestorage.googleapis.com/v0/b"
+
+    def __init__(
+        self,
+        transport: Any,
+        bucket: str,
+        path: str,
+        content_type: str = "application/octet-stream",
+        chunk_size: int = 8 * 1024 * 1024,
+        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+        max_retries: int = 3,
+        headers: Optional[Dict[str, str]] = None,
+        policy: Optional[ResiliencePolicy] = None,
+    ) -> None:
+        """
+        Initializes a ResumableUpload; no request is sent until upload() is called.
+
+        Args:
+            transport (Transport): The pooled HTTP transport.
+            bucket (str): The Firebase Storage bucket.
+            path (str): The destination path in the bucket.
+            content_type (str): The content type stored with the object.
+            chunk_size (int): The chunk size in bytes, rounded up to a multiple of 256 KiB.
+            progress (Callable[[int, Optional[int]], None], optional): The progress callback.
+            max_retries (int): The number of times a failed chunk is retried.
+            headers (Dict[str, str], optional): Extra headers such as ``Authorization``.
+            policy (ResiliencePolicy, optional): The circuit breaker and backoff to apply.
+        """
+        self.transport = transport
+        self.bucket = bucket
+        self.path = path
+        self.content_type = content_type
+        self.chunk_size = -(-chunk_size // CHUNK_GRANULARITY) * CHUNK_GRANULARITY
+        self.progress = progress
+        self.max_retries = max_retries
+        self.headers = dict(headers or {})
+        self.policy = policy
+        self.upload_url = None
+        self.offset = 0
+        self._origin = 0
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"ResumableUpload(bucket={self.bucket}, path={self.path}, "
+            f"offset={self.offset})"
+        )
+
+    def upload(self, source: Source) -> Dict[str, Any]:
+        """
+        Uploads a source, resuming the existing session if one was started.
+
+        When resuming, a seekable source is positioned at the acknowledged
+        offset; other sources must yield the same bytes as before and the
+        acknowledged prefix is skipped.
+
+        Args:
+            source (Union[str, BinaryIO, Iterable[bytes]]): A file path, a binary file
+                object or an iterable of byte chunks.
+
+        Returns:
+            Dict[str, Any]: The metadata of the stored object.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                return self.upload(file)
+        seekable = hasattr(source, "seek") and source.seekable()
+        total = _remaining_size(source)
+        skip = 0
+        if self.upload_url is None:
+            self._origin = source.tell() if seekable else 0
+            self._start(total)
+        else:
+            self.offset = skip = self._query()
+            if seekable:
+                source.seek(self._origin + self.offset)
+                skip = 0
+        chunks = _skip(_rechunk(source, self.chunk_size), skip)
+        chunk = next(chunks, b"")
+        while True:
+            upcoming = next(chunks, None)
+            response = self._send(chunk, final=upcoming is None)
+            if self.progress is not None:
+                self.progress(self.offset, total)
+            if upcoming is None:
+                return response.json()
+            chunk = upcoming
+
+    def _start(self, total: Optional[int]) -> None:
+        headers = dict(
+            self.headers,
+            **{
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Type": self.content_type,
+            },
+        )
+        if total is not None:
+            headers["X-Goog-Upload-Header-Content-Length"] = str(total)
+        response = self._request(
+            f"{self.base_url}/{self.bucket}/o",
+            params={"name": self.path},
+            headers=headers,
+            json={"name": self.path, "contentType": self.content_type},
+        )
+        self.upload_url = response.headers["X-Goog-Upload-URL"]
+        self.offset = 0
+
+    def _query(self) -> int:
+        response = self._request(
+            self.upload_url,
+            headers=dict(self.headers, **{"X-Goog-Upload-Command": "query"}),
+        )
+        return int(response.headers.get("X-Goog-Upload-Size-Received", 0))
+
+    def _send(self, chunk: bytes, final: bool) -> requests.Response:
+        start = self.offset
+        attempt = 0
+        while True:
+            try:
+                response = self._request(
+                    self.upload_url,
+                    headers=dict(
+                        self.headers,
+                        **{
+                            "X-Goog-Upload-Command": (
+                                "upload, finalize" if final else "upload"
+                            ),
+                            "X-Goog-Upload-Offset": str(self.offset),
+                        },
+                    ),
+                    data=chunk[self.offset - start :],
+                )
+                self.offset = start + len(chunk)
+                return response
+            except requests.exceptions.RequestException as e:
+                attempt = self._recover(e, attempt, start, len(chunk))
+
+    def _recover(
+        self,
+        error: requests.exceptions.RequestException,
+        attempt: int,
+        start: int,
+        size: int,
+    ) -> int:
+        # Waits out a transient failure, then resumes from the offset the
+        # server reports; a failed query counts as another failed attempt.
+        while True:
+            attempt += 1
+            if not _transient(error) or attempt > self.max_retries:
+                raise error
+            if self.policy is not None:
+                time.sleep(self.policy.delay(attempt, _retry_after(error)))
+            try:
+                received = self._query()
+            except requests.exceptions.RequestException as e:
+                error = e
+                continue
+            if not start <= received <= start + size:
+                raise error
+            self.offset = received
+            return attempt
+
+    def _request(self, url: str, **kwargs: Any) -> requests.Response:
+        # Every session of a bucket shares one breaker entry, keyed by the
+        # URL that starts them, since session URLs are unique.
+        breaker = self.policy.breaker if self.policy is not None else None
+        endpoint = f"{self.base_url}/{self.bucket}/o"
+        probe = breaker is not None and breaker.before(endpoint)
+        try:
+            response = self.transport.request("POST", url, **kwargs)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if breaker is not None:
+                if _transient(e):
+                    breaker.record_failure(endpoint)
+                else:
+                    breaker.record_success(endpoint)
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success(endpoint)
+            return response
+        finally:
+            if probe:
+                breaker.release(endpoint)
+
+
+def _transient(error: requests.exceptions.RequestException) -> bool:
+    response = error.response
+    if response is None:
+        return isinstance(
+            error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+        )
+    return response.status_code == 429 or response.status_code >= 500
+
+
+def _retry_after(error: requests.exceptions.RequestException) -> Optional[float]:
+    if error.response is None:
+        return None
+    return parse_retry_after(error.response.headers.get("Retry-After"))
+
+
+def _remaining_size(source: Any) -> Optional[int]:
+    try:
+        if source.seekable():
+            position = source.tell()
+            end = source.seek(0, os.SEEK_END)
+            source.seek(position)
+            return end - position
+    except (AttributeError, OSError, ValueError):
+        pass
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return len(source)
+    return None
+
+
+def _rechunk(source: Any, chunk_size: int) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = [bytes(source)]
+    if hasattr(source, "read"):
+        read = source.read
+        source = iter(lambda: read(chunk_size), b"")
+    buffer = bytearray()
+    for piece in source:
+        buffer += piece
+        while len(buffer) >= chunk_size:
+            yield bytes(buffer[:chunk_size])
+            del buffer[:chunk_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _skip(chunks: Iterator[bytes], count: int) -> Iterator[bytes]:
+    for chunk in chunks:
+        if count >= len(chunk):
+            count -= len(chunk)
+            continue
+        yield chunk[count:] if count else chunk
+        count = 0
@@ -0,0 +1,374 @@
+import inspect
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+from .concurrency import bounded_map
+from .errors import FirebaseError
+from .resilience import ResiliencePolicy
+
+# Seconds of history used for the drain rate reported by stats().
+RATE_WINDOW = 10.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS writes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT,
+    method TEXT NOT NULL,
+    args BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    retry_at REAL NOT NULL DEFAULT 0,
+    queued_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS writes_key ON writes (key, seq);
+CREATE TABLE IF NOT EXISTS dead_letters (
+    seq INTEGER PRIMARY KEY,
+    key TEXT,
+    method TEXT NOT NULL,
+    args BLOB NOT NULL,
+    attempts INTEGER NOT NULL,
+    error TEXT NOT NULL,
+    failed_at REAL NOT NULL
+);
+"""
+
+
+class WriteBehindQueue:
+    """
+    Durable write-behind queue for Firestore and RealTime writes.
+
+    submit() appends a write to a local SQLite log and returns as soon as it
+    is committed; a background thread drains the log through the client.
+    Writes sharing a key (by default the document or item ID) are applied
+    one at a time in submission order, while writes to different keys are
+    sent together, up to ``batch_size`` per round and ``max_in_flight`` at
+    once. Writes left in the log when the process stopped are replayed when
+    the queue is opened again, so a write may be applied more than once but
+    is never lost.
+
+    A write failing with a transient error is retried after the policy's
+    backoff, holding back later writes to the same key; any other error moves
+    it to the dead-letter table, see dead_letters().
+
+    Args:
+        client (Any): A synchronous client such as Firestore or RealTime.
+        path (str): The SQLite database file holding the log.
+        batch_size (int): The most writes taken from the log per round.
+        max_in_flight (int): The maximum number of concurrent requests.
+        policy (ResiliencePolicy, optional): Supplies the retry backoff.
+            Defaults to the client's policy.
+        max_attempts (int, optional): Attempts before a transiently failing
+            write is dead-lettered; None retries until it succeeds.
+        synchronous (str): The SQLite ``synchronous`` setting. "NORMAL"
+            survives process crashes; "FULL" also survives power loss at
+            the cost of an fsync per submit().
+
+    Methods:
+        submit(method, *args, key): Appends a write to the log.
+        flush(timeout): Waits until the log is drained.
+        stats(): Returns the backlog depth, drain rate and counters.
+        dead_letters(): Returns the writes that failed permanently.
+        requeue_dead_letters(): Moves dead-lettered writes back into the log.
+        close(flush, timeout): Stops the drain thread and closes the log.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        path: str,
+        batch_size: int = 100,
+        max_in_flight: int = 16,
+        policy: Optional[ResiliencePolicy] = None,
+        max_attempts: Optional[int] = None,
+        synchronous: str = "NORMAL",
+    ) -> None:
+        """
+        Opens the log and starts draining it, replaying any writes left from
+        a previous run.
+
+        Args:
+            client (Any): A synchronous client such as Firestore or RealTime.
+            path (str): The SQLite database file holding the log.
+            batch_size (int): The most writes taken from the log per round.
+            max_in_flight (int): The maximum number of concurrent requests.
+            policy (ResiliencePolicy, optional): Supplies the retry backoff.
+            max_attempts (int, optional): Attempts before a transiently failing write is dead-lettered.
+            synchronous (str): The SQLite ``synchronous`` setting.
+        """
+        self.client = client
+        self.path = path
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.policy = policy or getattr(client, "policy", None) or ResiliencePolicy()
+        self.max_attempts = max_attempts
+        self._codec = client.config.codec
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={synchronous}")
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._depth = self._db.execute("SELECT COUNT(*) FROM writes").fetchone()[0]
+        self._submitted = 0
+        self._applied = 0
+        self._retried = 0
+        self._dead = 0
+        self._in_flight = 0
+        self._recent = deque()
+        self._opened = time.monotonic()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="pydatabridgex-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return f"WriteBehindQueue(client={self.client!r}, path={self.path!r})"
+
+    def __len__(self) -> int:
+        """
+        Return the number of writes not yet applied.
+        """
+        return self._depth
+
+    def __enter__(self) -> "WriteBehindQueue":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def submit(self, method: str, *args: Any, key: Optional[str] = None) -> int:
+        """
+        Appends a write to the log; it is applied in the background.
+
+        Args:
+            method (str): The client method to call, such as "create_document".
+            *args (Any): The method's JSON-serializable arguments.
+            key (str, optional): The ordering key. Defaults to the first string
+                argument or the ``id`` of the first dict argument; writes with
+                no key are not ordered against each other.
+
+        Returns:
+            int: The write's sequence number in the log.
+
+        Raises:
+            ValueError: If the client has no such public method.
+            TypeError: If the method is a coroutine function.
+            RuntimeError: If the queue is closed.
+        """
+        fn = getattr(self.client, method, None) if not method.startswith("_") else None
+        if not callable(fn):
+            raise ValueError(f"{type(self.client).__name__} has no method {method!r}")
+        if inspect.iscoroutinefunction(fn):
+            raise TypeError("WriteBehindQueue requires a synchronous client")
+        if key is None:
+            key = _default_key(args)
+        payload = self._codec.dumps(list(args))
+        with self._wake:
+            if self._closed:
+                raise RuntimeError("WriteBehindQueue is closed")
+            with self._db:
+                seq = self._db.execute(
+                    "INSERT INTO writes (key, method, args, queued_at) VALUES (?, ?, ?, ?)",
+                    (key, method, payload, time.time()),
+                ).lastrowid
+            self._depth += 1
+            self._submitted += 1
+            self._wake.notify_all()
+        return seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every write in the log has been applied or dead-lettered.
+
+        Args:
+            timeout (float, optional): The most seconds to wait.
+
+        Returns:
+            bool: Whether the log was drained in time.
+        """
+        with self._wake:
+            return self._wake.wait_for(lambda: self._depth == 0, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the backlog depth, drain rate and counters.
+
+        Returns:
+            Dict[str, Any]: The writes waiting in the log (``backlog``) and in
+            flight, the age in seconds of the oldest waiting write, the writes
+            applied per second over the last RATE_WINDOW seconds, and the
+            writes submitted, applied, retried and dead-lettered since the
+            queue was opened.
+        """
+        with self._lock:
+            oldest = self._db.execute("SELECT MIN(queued_at) FROM writes").fetchone()[0]
+            return {
+                "backlog": self._depth,
+                "in_flight": self._in_flight,
+                "oldest_age": time.time() - oldest if oldest is not None else 0.0,
+                "drain_rate": self._rate(time.monotonic()),
+                "submitted": self._submitted,
+                "applied": self._applied,
+                "retried": self._retried,
+                "dead_lettered": self._dead,
+            }
+
+    def dead_letters(self) -> List[Dict[str, Any]]:
+        """
+        Returns the writes that failed permanently.
+
+        Returns:
+            List[Dict[str, Any]]: Each write's sequence number, key, method,
+            arguments, attempts, error message and failure time.
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, key, method, args, attempts, error, failed_at "
+                "FROM dead_letters ORDER BY seq"
+            ).fetchall()
+        return [
+            {
+                "seq": seq,
+                "key": key,
+                "method": method,
+                "args": self._codec.loads(args),
+                "attempts": attempts,
+                "error": error,
+                "failed_at": failed_at,
+            }
+            for seq, key, method, args, attempts, error, failed_at in rows
+        ]
+
+    def requeue_dead_letters(self) -> int:
+        """
+        Moves every dead-lettered write to the end of the log with its attempts reset.
+
+        Returns:
+            int: The number of writes requeued.
+        """
+        with self._wake:
+            with self._db:
+                count = self._db.execute(
+                    "INSERT INTO writes (key, method, args, queued_at) "
+                    "SELECT key, method, args, failed_at FROM dead_letters ORDER BY seq"
+                ).rowcount
+                self._db.execute("DELETE FROM dead_letters")
+            self._depth += count
+            self._wake.notify_all()
+        return count
+
+    def close(self, flush: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stops the drain thread and closes the log. Writes still in the log are
+        replayed the next time it is opened.
+
+        Args:
+            flush (bool): Whether to wait for the log to drain first.
+            timeout (float, optional): The most seconds to wait for it.
+        """
+        if flush:
+            self.flush(timeout)
+        with self._wake:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify_all()
+        self._thread.join()
+        self._db.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._wake:
+                if self._closed:
+                    return
+                batch, wait = self._next_batch()
+                if not batch:
+                    self._wake.wait(wait)
+                    continue
+                self._in_flight = len(batch)
+            results = list(bounded_map(self._apply, batch, self.max_in_flight))
+            with self._wake:
+                self._settle(batch, results)
+                self._in_flight = 0
+                self._wake.notify_all()
+
+    def _next_batch(self) -> Tuple[List[tuple], Optional[float]]:
+        # The first write of each key, in log order, unless it is backing off;
+        # the writes queued behind it wait, but other keys are never held up
+        # however many writes a backing-off key has queued. Only a key's
+        # first write is ever sent, so only it can have a retry_at.
+        now = time.time()
+        batch = self._db.execute(
+            "SELECT seq, key, method, args, attempts FROM writes "
+            "WHERE retry_at <= ? AND (key IS NULL OR seq IN "
+            "(SELECT MIN(seq) FROM writes WHERE key IS NOT NULL GROUP BY key)) "
+            "ORDER BY seq LIMIT ?",
+            (now, self.batch_size),
+        ).fetchall()
+        if batch or self._depth == 0:
+            return batch, None
+        (retry_at,) = self._db.execute(
+            "SELECT MIN(retry_at) FROM writes WHERE retry_at > ?", (now,)
+        ).fetchone()
+        return batch, max(retry_at - now, 0.0) if retry_at is not None else 1.0
+
+    def _apply(self, row: tuple) -> Any:
+        _, _, method, args, _ = row
+        return getattr(self.client, method)(*self._codec.loads(args))
+
+    def _settle(self, batch: List[tuple], results: List[Any]) -> None:
+        now = time.time()
+        applied = 0
+        with self._db:
+            for (seq, key, method, args, attempts), result in zip(batch, results):
+                attempts += 1
+                if not isinstance(result, Exception):
+                    self._db.execute("DELETE FROM writes WHERE seq = ?", (seq,))
+                    applied += 1
+                elif _transient(result) and (
+                    self.max_attempts is None or attempts < self.max_attempts
+                ):
+                    delay = self.policy.delay(
+                        attempts, getattr(result, "retry_after", None)
+                    )
+                    self._db.execute(
+                        "UPDATE writes SET attempts = ?, retry_at = ? WHERE seq = ?",
+                        (attempts, now + delay, seq),
+                    )
+                    self._retried += 1
+                else:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO dead_letters VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (seq, key, method, args, attempts, str(result), now),
+                    )
+                    self._db.execute("DELETE FROM writes WHERE seq = ?", (seq,))
+                    self._dead += 1
+                    self._depth -= 1
+        self._applied += applied
+        self._depth -= applied
+        if applied:
+            self._recent.append((time.monotonic(), applied))
+
+    def _rate(self, now: float) -> float:
+        while self._recent and self._recent[0][0] < now - RATE_WINDOW:
+            self._recent.popleft()
+        elapsed = min(RATE_WINDOW, now - self._opened)
+        return sum(count for _, count in self._recent) / elapsed if elapsed else 0.0
+
+
+def _default_key(args: Tuple[Any, ...]) -> Optional[str]:
+    for arg in args:
+        if isinstance(arg, str):
+            return arg
+        if isinstance(arg, dict) and arg.get("id") is not None:
+            return str(arg["id"])
+    return None
+
+
+def _transient(error: Exception) -> bool:
+    return isinstance(error, FirebaseError) and error.transient
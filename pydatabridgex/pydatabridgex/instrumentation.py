@@ -0,0 +1,353 @@
+"""
+Hooks, metrics and tracing spans for backend calls.
+
+Clients take an optional Instrumentation; without one, calls go through
+a shared no-op context that discards whatever the client records. Spans are
+emitted through any tracer implementing the OpenTelemetry
+``start_as_current_span`` API, so opentelemetry is not a dependency.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Call:
+    """
+    One instrumented backend call, passed to hooks and filled in by the client.
+
+    Attributes:
+        backend (str): The client making the call, e.g. "Firestore" or "AzureStorage".
+        operation (str): The operation, e.g. "GET /all" or "download_file".
+        url (Optional[str]): The request URL, when there is one.
+        started (float): The ``time.perf_counter()`` value when the call began.
+        seconds (Optional[float]): The wall-clock duration, set when the call ends.
+        bytes_sent (int): The request payload size.
+        bytes_received (int): The response payload size.
+        status_code (Optional[int]): The HTTP status code, when known.
+        error (Optional[BaseException]): The exception the call raised, if any.
+        phases (Dict[str, float]): Seconds spent in named phases, e.g. "response"
+            (the round trip as timed by the HTTP library) and "decode" (JSON parsing).
+    """
+
+    __slots__ = (
+        "backend",
+        "operation",
+        "url",
+        "started",
+        "seconds",
+        "bytes_sent",
+        "bytes_received",
+        "status_code",
+        "error",
+        "phases",
+    )
+
+    def __init__(self, backend: str, operation: str, url: Optional[str]) -> None:
+        self.backend = backend
+        self.operation = operation
+        self.url = url
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.status_code = None
+        self.error = None
+        self.phases = {}
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"Call(backend={self.backend!r}, operation={self.operation!r}, "
+            f"seconds={self.seconds})"
+        )
+
+
+class _NullCall:
+    """
+    Stands in for a Call when instrumentation is disabled; writes are dropped.
+    """
+
+    __slots__ = ()
+
+    @property
+    def phases(self) -> Dict[str, float]:
+        return {}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        pass
+
+
+_NULL = nullcontext(_NullCall())
+
+
+class _Series:
+    __slots__ = (
+        "counts",
+        "count",
+        "errors",
+        "total",
+        "max",
+        "sent",
+        "received",
+        "phases",
+    )
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.errors = {}
+        self.total = 0.0
+        self.max = 0.0
+        self.sent = 0
+        self.received = 0
+        self.phases = {}
+
+
+class _Measurement:
+    __slots__ = ("instrumentation", "call", "manager", "span")
+
+    def __init__(self, instrumentation: "Instrumentation", call: Call) -> None:
+        self.instrumentation = instrumentation
+        self.call = call
+        self.manager = None
+        self.span = None
+
+    def __enter__(self) -> Call:
+        instrumentation = self.instrumentation
+        call = self.call
+        for hook in instrumentation.before_hooks:
+            hook(call)
+        if instrumentation.tracer is not None:
+            attributes = {"backend": call.backend, "operation": call.operation}
+            if call.url is not None:
+                attributes["url"] = call.url
+            self.manager = instrumentation.tracer.start_as_current_span(
+                f"{call.backend} {call.operation}", attributes=attributes
+            )
+            self.span = self.manager.__enter__()
+        return call
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        call = self.call
+        call.seconds = time.perf_counter() - call.started
+        if exc is not None:
+            call.error = exc
+        instrumentation = self.instrumentation
+        instrumentation.record(call)
+        if self.manager is not None:
+            span = self.span
+            span.set_attribute("bytes_sent", call.bytes_sent)
+            span.set_attribute("bytes_received", call.bytes_received)
+            if call.status_code is not None:
+                span.set_attribute("http.status_code", call.status_code)
+            self.manager.__exit__(exc_type, exc, tb)
+        for hook in instrumentation.after_hooks:
+            hook(call)
+        return False
+
+
+class Instrumentation:
+    """
+    Collects per-endpoint latency histograms, byte and error counters, runs
+    pre/post call hooks and optionally emits tracing spans.
+
+    Share one instance between clients (through ``Configuration`` for
+    Firebase, or the ``instrumentation`` argument of AzureStorage) to get a
+    single view of every backend call. Hooks run on the calling thread and
+    their exceptions propagate to the caller.
+
+    Args:
+        tracer (Any, optional): An OpenTelemetry-compatible tracer used to emit spans.
+        buckets (Sequence[float]): The upper bounds, in seconds, of the latency histogram buckets.
+
+    Methods:
+        add_hook(before, after): Registers callables run before and after every call.
+        measure(backend, operation, url): Context manager instrumenting one call.
+        record(call): Adds a finished call to the metrics.
+        metrics(): Returns a snapshot of the collected metrics.
+        reset(): Clears the collected metrics.
+    """
+
+    def __init__(
+        self, tracer: Optional[Any] = None, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        """
+        Initializes the Instrumentation with no hooks and empty metrics.
+
+        Args:
+            tracer (Any, optional): An OpenTelemetry-compatible tracer used to emit spans.
+            buckets (Sequence[float]): The upper bounds, in seconds, of the latency histogram buckets.
+        """
+        self.tracer = tracer
+        self.buckets = tuple(sorted(buckets))
+        self.before_hooks = []
+        self.after_hooks = []
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the object.
+        """
+        return (
+            f"Instrumentation(tracer={self.tracer!r}, "
+            f"hooks={len(self.before_hooks) + len(self.after_hooks)})"
+        )
+
+    def add_hook(
+        self,
+        before: Optional[Callable[[Call], None]] = None,
+        after: Optional[Callable[[Call], None]] = None,
+    ) -> None:
+        """
+        Registers hooks run around every instrumented call.
+
+        Args:
+            before (Callable[[Call], None], optional): Called when a call starts.
+            after (Callable[[Call], None], optional): Called with the finished call,
+                including its duration, sizes and error.
+        """
+        if before is not None:
+            self.before_hooks.append(before)
+        if after is not None:
+            self.after_hooks.append(after)
+
+    def measure(
+        self, backend: str, operation: str, url: Optional[str] = None
+    ) -> _Measurement:
+        """
+        Instruments one call; the client fills in sizes and status on the yielded Call.
+
+        Args:
+            backend (str): The client making the call.
+            operation (str): The operation being performed.
+            url (str, optional): The request URL.
+
+        Returns:
+            ContextManager[Call]: A context manager yielding the Call.
+        """
+        return _Measurement(self, Call(backend, operation, url))
+
+    def record(self, call: Call) -> None:
+        """
+        Adds a finished call to the metrics.
+
+        Args:
+            call (Call): The finished call.
+        """
+        key = (call.backend, call.operation)
+        index = bisect.bisect_left(self.buckets, call.seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(len(self.buckets))
+            series.counts[index] += 1
+            series.count += 1
+            series.total += call.seconds
+            if call.seconds > series.max:
+                series.max = call.seconds
+            series.sent += call.bytes_sent
+            series.received += call.bytes_received
+            if call.error is not None:
+                name = type(call.error).__name__
+                series.errors[name] = series.errors.get(name, 0) + 1
+            for phase, seconds in call.phases.items():
+                series.phases[phase] = series.phases.get(phase, 0.0) + seconds
+
+    def metrics(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Returns a snapshot of the collected metrics.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: For each backend and operation:
+            count, errors by type, total/mean/max/p50/p95/p99 seconds, bytes
+            sent and received, total seconds per phase and the cumulative
+            histogram as (upper bound, count) pairs.
+        """
+        with self._lock:
+            snapshot = {}
+            for (backend, operation), s in self._series.items():
+                snapshot.setdefault(backend, {})[operation] = {
+                    "count": s.count,
+                    "errors": dict(s.errors),
+                    "seconds": s.total,
+                    "mean": s.total / s.count,
+                    "max": s.max,
+                    "p50": self._quantile(s, 0.50),
+                    "p95": self._quantile(s, 0.95),
+                    "p99": self._quantile(s, 0.99),
+                    "bytes_sent": s.sent,
+                    "bytes_received": s.received,
+                    "phases": dict(s.phases),
+                    "histogram": self._cumulative(s.counts),
+                }
+        return snapshot
+
+    def reset(self) -> None:
+        """
+        Clears the collected metrics.
+        """
+        with self._lock:
+            self._series = {}
+
+    def _cumulative(self, counts: List[int]) -> List[Tuple[float, int]]:
+        histogram = []
+        running = 0
+        for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+            running += bucket
+            histogram.append((bound, running))
+        return histogram
+
+    def _quantile(self, series: _Series, q: float) -> float:
+        rank = q * series.count
+        running = 0
+        for bound, bucket in zip(self.buckets, series.counts):
+            running += bucket
+            if running >= rank:
+                return min(bound, series.max)
+        return series.max
+
+
+def measure(
+    instrumentation: Optional[Instrumentation],
+    backend: str,
+    operation: str,
+    url: Optional[str] = None,
+) -> Any:
+    """
+    Instruments one call, or returns a shared no-op context when disabled.
+
+    Args:
+        instrumentation (Instrumentation, optional): The instrumentation, if enabled.
+        backend (str): The client making the call.
+        operation (str): The operation being performed.
+        url (str, optional): The request URL.
+
+    Returns:
+        ContextManager[Call]: A context manager yielding the Call (or a no-op stand-in).
+    """
+    if instrumentation is None:
+        return _NULL
+    return instrumentation.measure(backend, operation, url)
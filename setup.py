@@ -13,8 +13,28 @@ setup(
     description=DESCRIPTION,
     long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
-    packages=find_packages(),
+    package_dir={"": "pydatabridgex"},
+    packages=find_packages("pydatabridgex"),
     install_requires=["requests", "typing"],
+    extras_require={
+        "async": ["httpx[http2]"],
+        "azure": ["azure-storage-blob"],
+        "sql": ["pyodbc"],
+        "arrow": ["pyarrow"],
+        "orjson": ["orjson"],
+        "msgspec": ["msgspec"],
+        "compression": ["zstandard", "brotli"],
+        "all": [
+            "httpx[http2]",
+            "azure-storage-blob",
+            "pyodbc",
+            "pyarrow",
+            "orjson",
+            "msgspec",
+            "zstandard",
+            "brotli",
+        ],
+    },
     keywords=[
         "python",
         "database",
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fakes import FakeFirebase  # noqa: E402
+from pydatabridgex.pydatabridgex.firebase.configuration import (  # noqa: E402
+    Configuration,
+)
+from pydatabridgex.pydatabridgex.firebase.resilience import (  # noqa: E402
+    ResiliencePolicy,
+)
+
+
+@pytest.fixture
+def fake():
+    with FakeFirebase() as server:
+        yield server
+
+
+@pytest.fixture
+def config(fake):
+    config = Configuration(
+        {"apiKey": "test"}, {}, fake.url + "/rtdb", "bucket", base_url=fake.url
+    )
+    yield config
+    config.get_transport().close()
+
+
+@pytest.fixture
+def policy():
+    # Fast backoff so retry tests finish quickly; the breaker is off unless a
+    # test installs one.
+    return ResiliencePolicy(
+        max_attempts=4, backoff=0.01, max_backoff=1.0, breaker=False
+    )
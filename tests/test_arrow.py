@@ -0,0 +1,44 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from pydatabridgex.pydatabridgex.arrow import (  # noqa: E402
+    batches_to_table,
+    documents_to_batches,
+    rows_to_batches,
+)
+
+
+def test_rows_widen_a_null_column():
+    rows = [(1, None), (2, None), (3, "x")]
+    table = batches_to_table(rows_to_batches(["a", "b"], rows, batch_size=2))
+    assert table.schema.field("b").type == pa.string()
+    assert table.to_pylist()[-1] == {"a": 3, "b": "x"}
+
+
+def test_documents_widen_null_and_add_fields():
+    documents = [("1", {"a": None}), ("2", {"a": 5}), ("3", {"a": 6, "b": True})]
+    table = batches_to_table(documents_to_batches(documents, batch_size=1))
+    assert table.schema.field("a").type == pa.int64()
+    assert table.column("b").to_pylist() == [None, None, True]
+
+
+def test_int_then_float_is_not_truncated():
+    documents = [("1", {"n": 1}), ("2", {"n": 2.5})]
+    table = batches_to_table(documents_to_batches(documents, batch_size=1))
+    assert table.column("n").to_pylist() == [1.0, 2.5]
+
+
+def test_incompatible_types_fail_loudly():
+    documents = [("1", {"n": 1}), ("2", {"n": "one"})]
+    with pytest.raises((pa.ArrowInvalid, pa.ArrowTypeError)):
+        list(documents_to_batches(documents, batch_size=1))
+
+
+def test_given_schema_rejects_lossy_values():
+    schema = pa.schema([("id", pa.string()), ("n", pa.int64())])
+    with pytest.raises(pa.ArrowInvalid):
+        list(documents_to_batches([("1", {"n": 2.5})], schema=schema))
+    (batch,) = documents_to_batches([("1", {"m": 1})], schema=schema)
+    assert batch.schema == schema
+    assert batch.column("n").to_pylist() == [None]
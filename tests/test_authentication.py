@@ -0,0 +1,156 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pydatabridgex.pydatabridgex.firebase.authentication import (
+    AsyncAuthentication,
+    Authentication,
+)
+from pydatabridgex.pydatabridgex.firebase.errors import FirebaseError
+from pydatabridgex.pydatabridgex.firebase.firestore import AsyncFirestore, Firestore
+
+
+def _signed_in(auth, fake, expires_in="3600"):
+    auth.tokens.token_url = f"{fake.url}/token"
+    auth.tokens.api_key = "key"
+    auth.tokens.store(
+        "a@example.com",
+        {"idToken": "id-0", "refreshToken": "refresh", "expiresIn": expires_in},
+    )
+
+
+def _authorization(fake):
+    return [headers.get("Authorization") for headers in fake.headers]
+
+
+def test_attach_only_affects_the_given_clients(fake, config):
+    auth = Authentication(config)
+    _signed_in(auth, fake)
+    attached, other = Firestore(config), Firestore(config)
+    try:
+        auth.attach("a@example.com", attached)
+        attached.read_document({"id": "x"})
+        other.read_document({"id": "x"})
+        assert config.token_source is None
+        assert _authorization(fake) == ["Bearer id-0", None]
+        auth.attach(None, attached)
+        attached.read_document({"id": "x"})
+        assert _authorization(fake)[-1] is None
+    finally:
+        auth.tokens.close()
+
+
+def test_async_clients_refresh_over_the_async_transport(fake, config):
+    async def main():
+        auth = AsyncAuthentication(config)
+        # Expiring within EXPIRY_SKEW, so the first request renews it.
+        _signed_in(auth, fake, expires_in="1")
+        firestore = AsyncFirestore(config)
+        auth.attach("a@example.com", firestore)
+        auth.tokens.transport = None  # A blocking refresh would fail here.
+        try:
+            await firestore.read_document({"id": "x"})
+        finally:
+            auth.tokens.close()
+            await config.get_async_transport().aclose()
+
+    asyncio.run(main())
+    assert fake.token_refreshes == 1
+    assert fake.requests[0] == ("POST", "/token")
+    assert _authorization(fake)[-1] == "Bearer id-1"
+
+
+def _users(fake):
+    fake.users.update({"u1": {"uid": "u1", "n": 1}, "u3": {"uid": "u3", "n": 3}})
+
+
+def _get_together(auth, uids):
+    with ThreadPoolExecutor(len(uids)) as pool:
+        return list(pool.map(auth.get_user, uids))
+
+
+def test_batched_get_user_matches_unbatched_results(fake, config):
+    _users(fake)
+    uids = ["u1", "u2", "u3"]
+    unbatched = [Authentication(config).get_user(uid) for uid in uids]
+    fake.requests.clear()
+    batched = _get_together(Authentication(config).enable_batching(window=0.2), uids)
+    assert batched == unbatched == [fake.users["u1"], None, fake.users["u3"]]
+    # Only the user missing from the batch response is looked up again.
+    assert fake.requests == [("GET", "/batch"), ("GET", "/")]
+
+
+def test_batched_get_user_falls_back_to_single_lookups(fake, config, monkeypatch):
+    monkeypatch.delitem(fake.routes, ("GET", "/batch"))
+    _users(fake)
+    auth = Authentication(config).enable_batching(window=0.2)
+    for _ in range(2):
+        assert _get_together(auth, ["u1", "u3"]) == [fake.users["u1"], fake.users["u3"]]
+    assert fake.requests.count(("GET", "/batch")) == 1
+    assert fake.requests.count(("GET", "/")) == 4
+
+
+def test_async_batched_get_user_falls_back_to_single_lookups(fake, config, monkeypatch):
+    monkeypatch.delitem(fake.routes, ("GET", "/batch"))
+    _users(fake)
+
+    async def main():
+        auth = AsyncAuthentication(config).enable_batching(window=0.05)
+        try:
+            return await asyncio.gather(auth.get_user("u1"), auth.get_user("u2"))
+        finally:
+            auth.tokens.close()
+
+    assert asyncio.run(main()) == [fake.users["u1"], None]
+    assert fake.requests.count(("GET", "/batch")) == 1
+
+
+def test_bulk_methods_reject_bad_batch_sizes_when_called(config):
+    auth, async_auth = Authentication(config), AsyncAuthentication(config)
+    for method in (auth.import_users, auth.get_users, auth.delete_users):
+        with pytest.raises(ValueError):
+            method([], batch_size=0)
+    for method in (
+        async_auth.import_users,
+        async_auth.get_users,
+        async_auth.delete_users,
+    ):
+        with pytest.raises(ValueError):
+            method([], batch_size=0)
+
+
+def test_import_users_maps_errors_to_their_users_in_order(fake, config):
+    users = [{"uid": f"u{i}"} for i in range(5)]
+    users[3] = {"email": "no-uid@example.com"}
+    results = list(
+        Authentication(config).import_users(users, batch_size=2, max_in_flight=3)
+    )
+    assert results[:3] + results[4:] == ["u0", "u1", "u2", "u4"]
+    assert isinstance(results[3], FirebaseError)
+    assert set(fake.users) == {"u0", "u1", "u2", "u4"}
+
+
+def test_get_users_keeps_uids_with_commas_apart(fake, config):
+    fake.users.update({"a,b": {"uid": "a,b"}, "c": {"uid": "c"}})
+    results = list(Authentication(config).get_users(["c", "a,b", "missing"]))
+    assert results == [{"uid": "c"}, {"uid": "a,b"}, None]
+
+
+def test_async_delete_users_maps_errors_to_their_users(fake, config):
+    fake.users.update({"u1": {"uid": "u1"}, "u3": {"uid": "u3"}})
+
+    async def main():
+        auth = AsyncAuthentication(config)
+        try:
+            return [
+                result
+                async for result in auth.delete_users(["u1", "u2", "u3"], batch_size=2)
+            ]
+        finally:
+            auth.tokens.close()
+
+    deleted, failed, last = asyncio.run(main())
+    assert (deleted, last) == ("u1", "u3")
+    assert isinstance(failed, FirebaseError)
+    assert fake.users == {}
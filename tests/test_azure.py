@@ -0,0 +1,98 @@
+import pytest
+from azure.core.exceptions import ResourceModifiedError
+from azure.storage.blob import BlobClient
+from fakes import FakeBlobService, _Blob
+
+from pydatabridgex.pydatabridgex.azure.storage import AzureStorage
+from pydatabridgex.pydatabridgex.azure.transfer import TransferManager
+
+
+@pytest.fixture
+def blobs():
+    with FakeBlobService() as server:
+        yield server
+
+
+def _counting_listings(storage, monkeypatch):
+    listings = []
+    iter_files = storage.iter_files
+
+    def counted(prefix=None):
+        listings.append(prefix)
+        return iter_files(prefix)
+
+    monkeypatch.setattr(storage, "iter_files", counted)
+    return listings
+
+
+def test_index_follows_own_writes_without_listing_again(blobs, monkeypatch):
+    storage = AzureStorage("box", connection=blobs.connection_string, index_ttl=None)
+    storage.create_file(b"1", "b")
+    listings = _counting_listings(storage, monkeypatch)
+    assert len(storage) == 1
+    storage.create_file(b"2", "c")
+    storage.create_file(b"0", "a")
+    storage.delete_file("b")
+    assert [storage[0], storage[1]] == ["a", "c"]
+    assert "c" in storage and "b" not in storage
+    assert len(storage) == 2
+    assert listings == [None]
+
+
+def test_returned_names_are_not_changed_by_later_writes(blobs):
+    storage = AzureStorage("box", connection=blobs.connection_string, index_ttl=None)
+    storage.create_file(b"1", "b")
+    names = storage.refresh_index()
+    storage.create_file(b"0", "a")
+    assert names == ["b"]
+    names.append("z")
+    assert "z" not in storage
+    assert storage.find_file() == ["a", "b"]
+
+
+def test_expired_index_is_listed_again(blobs, monkeypatch):
+    storage = AzureStorage("box", connection=blobs.connection_string, index_ttl=0)
+    listings = _counting_listings(storage, monkeypatch)
+    len(storage)
+    len(storage)
+    assert listings == [None, None]
+
+
+def test_download_to_path_fails_when_the_blob_changes(blobs, tmp_path, monkeypatch):
+    storage = AzureStorage("box", connection=blobs.connection_string)
+    storage.create_file(b"a" * 3 * 4096, "f")
+    download_blob = BlobClient.download_blob
+    calls = []
+
+    def overwritten_after_first_range(client, *args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            blobs.containers["box"]["f"] = _Blob(b"b" * 3 * 4096)
+        return download_blob(client, *args, **kwargs)
+
+    monkeypatch.setattr(BlobClient, "download_blob", overwritten_after_first_range)
+    (tmp_path / "f").write_bytes(b"previous")
+    with pytest.raises(ResourceModifiedError):
+        storage.download_to_path(
+            "f", str(tmp_path / "f"), max_concurrency=1, range_size=4096
+        )
+    # The destination is replaced only by a complete download.
+    assert (tmp_path / "f").read_bytes() == b"previous"
+    assert [path.name for path in tmp_path.iterdir()] == ["f"]
+
+
+def test_download_to_path_reads_every_range(blobs, tmp_path):
+    storage = AzureStorage("box", connection=blobs.connection_string)
+    payload = bytes(range(256)) * 64
+    storage.create_file(payload, "f")
+    storage.download_to_path("f", str(tmp_path / "f"), range_size=4096)
+    assert (tmp_path / "f").read_bytes() == payload
+
+
+def test_failed_transfer_download_keeps_the_local_file(blobs, tmp_path):
+    storage = AzureStorage("box", connection=blobs.connection_string)
+    (tmp_path / "f").write_bytes(b"previous")
+    result = TransferManager(storage).download([("missing", str(tmp_path / "f"))])
+    assert result["failed"] == 1
+    assert (tmp_path / "f").read_bytes() == b"previous"
+    assert [path.name for path in tmp_path.iterdir()] == ["f"]
@@ -0,0 +1,45 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from pydatabridgex.pydatabridgex.firebase.firestore import AsyncFirestore, Firestore
+
+
+def _read_together(firestore, reqs):
+    with ThreadPoolExecutor(len(reqs)) as pool:
+        return list(pool.map(firestore.read_document, reqs))
+
+
+def test_batched_reads_are_keyed_by_document_id(fake, config):
+    fake.documents.update({"a": {"n": 1}, "c": {"n": 3}})
+    firestore = Firestore(config).enable_batching(window=0.2)
+    results = _read_together(firestore, [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+    # A missing document in the middle must not shift the ones after it.
+    assert results == [{"a": {"n": 1}}, {"b": None}, {"c": {"n": 3}}]
+    assert fake.batch_gets == 1
+    assert fake.requests == [("POST", "/batchGet")]
+
+
+def test_batched_reads_fall_back_to_single_reads(fake, config, monkeypatch):
+    monkeypatch.delitem(fake.routes, ("POST", "/batchGet"))
+    fake.documents.update({"a": {"n": 1}, "b": {"n": 2}})
+    firestore = Firestore(config).enable_batching(window=0.2)
+    for _ in range(2):
+        results = _read_together(firestore, [{"id": "a"}, {"id": "b"}])
+        assert results == [{"a": {"n": 1}}, {"b": {"n": 2}}]
+    # The unsupported route is tried once, not once per batch.
+    assert fake.requests.count(("POST", "/batchGet")) == 1
+    assert fake.requests.count(("GET", "/")) == 4
+
+
+def test_async_batched_reads_fall_back_to_single_reads(fake, config, monkeypatch):
+    monkeypatch.delitem(fake.routes, ("POST", "/batchGet"))
+    fake.documents.update({"a": {"n": 1}})
+
+    async def main():
+        firestore = AsyncFirestore(config).enable_batching(window=0.05)
+        return await asyncio.gather(
+            firestore.read_document({"id": "a"}), firestore.read_document({"id": "b"})
+        )
+
+    assert asyncio.run(main()) == [{"a": {"n": 1}}, {"b": None}]
+    assert fake.requests.count(("POST", "/batchGet")) == 1
@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pydatabridgex.pydatabridgex.firebase.cache import DocumentCache
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = DocumentCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    with ThreadPoolExecutor(4) as pool:
+        results = [pool.submit(cache.get_or_fetch, "k", fetch) for _ in range(4)]
+        release.set()
+        assert [result.result() for result in results] == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_read_after_write_does_not_join_a_stale_fetch():
+    cache = DocumentCache()
+    started, release = threading.Event(), threading.Event()
+    stored = {"value": "old"}
+
+    def slow_fetch():
+        value = stored["value"]
+        started.set()
+        release.wait(5)
+        return value
+
+    with ThreadPoolExecutor(1) as pool:
+        before = pool.submit(cache.get_or_fetch, "k", slow_fetch)
+        assert started.wait(5)
+        stored["value"] = "new"
+        cache.invalidate()
+        # Issued after the write, so it must not wait on the older fetch.
+        assert cache.get_or_fetch("k", lambda: stored["value"]) == "new"
+        release.set()
+        assert before.result() == "old"
+    assert cache.get_or_fetch("k", lambda: "unused") == "new"
+
+
+def test_invalidating_one_key_keeps_the_others():
+    cache = DocumentCache()
+    cache.get_or_fetch("a", lambda: 1)
+    cache.get_or_fetch("b", lambda: 2)
+    cache.invalidate("a")
+    assert cache.get_or_fetch("a", lambda: 3) == 3
+    assert cache.get_or_fetch("b", lambda: 4) == 2
@@ -0,0 +1,30 @@
+import pytest
+
+from pydatabridgex.pydatabridgex.firebase.codec import (
+    JSONCodec,
+    OrjsonCodec,
+    get_codec,
+)
+from pydatabridgex.pydatabridgex.firebase.errors import FirebaseError
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore
+
+
+def test_default_codec_is_the_standard_library(config):
+    assert type(get_codec()) is JSONCodec
+    assert type(config.codec) is JSONCodec
+
+
+def test_orjson_writes_non_string_keys_like_the_standard_library():
+    pytest.importorskip("orjson")
+    assert OrjsonCodec().dumps({1: "a"}) == JSONCodec().dumps({1: "a"})
+
+
+def test_decodes_a_memoryview():
+    assert JSONCodec().loads(memoryview(b'{"a":1}')) == {"a": 1}
+
+
+@pytest.mark.parametrize("value", [float("nan"), object()])
+def test_unencodable_bodies_raise_firebase_error(fake, config, value):
+    with pytest.raises(FirebaseError):
+        Firestore(config).create_document({"n": value})
+    assert fake.requests == []
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from pydatabridgex.pydatabridgex.firebase.errors import FirebaseError
+from pydatabridgex.pydatabridgex.firebase.firestore import AsyncFirestore, Firestore
+
+
+def _fill(fake, count):
+    fake.documents.update({f"d{i:03}": {"n": i} for i in range(count)})
+
+
+def _without_cursor(honour_limit):
+    # A read_all route that ignores startAfter, and limit unless honoured.
+    def read_all(server, query, payload, body):
+        ids = sorted(server.documents)
+        if "limit" in query and honour_limit:
+            ids = ids[: int(query["limit"])]
+        return {doc_id: server.documents[doc_id] for doc_id in ids}
+
+    return read_all
+
+
+def test_iter_documents_pages_through_everything(fake, config):
+    _fill(fake, 25)
+    documents = list(Firestore(config).iter_documents({}, page_size=10))
+    assert documents == sorted(fake.documents.items())
+    assert fake.requests.count(("GET", "/all")) == 3
+
+
+def test_iter_documents_stops_when_limit_is_ignored(fake, config, monkeypatch):
+    _fill(fake, 25)
+    monkeypatch.setitem(fake.routes, ("GET", "/all"), _without_cursor(False))
+    documents = list(Firestore(config).iter_documents({}, page_size=10))
+    assert len(documents) == 25
+    assert fake.requests == [("GET", "/all")]
+
+
+def test_iter_documents_raises_when_cursor_is_ignored(fake, config, monkeypatch):
+    _fill(fake, 25)
+    monkeypatch.setitem(fake.routes, ("GET", "/all"), _without_cursor(True))
+    with pytest.raises(FirebaseError):
+        list(Firestore(config).iter_documents({}, page_size=10))
+    assert len(fake.requests) == 2
+
+
+def test_iter_bulk_read_pulls_refs_lazily(fake, config):
+    _fill(fake, 50)
+    pulled = []
+
+    def refs():
+        for i in range(50):
+            pulled.append(i)
+            yield {"id": f"d{i:03}"}
+
+    results = Firestore(config).iter_bulk_read(refs(), max_in_flight=4)
+    assert next(results) == {"d000": {"n": 0}}
+    assert len(pulled) <= 5
+    assert len(list(results)) == 49
+
+
+def test_async_iter_bulk_write_yields_each_outcome(fake, config):
+    async def main():
+        ops = [("create", {"n": 1}), ("drop", {}), ("create", {"n": 2})]
+        return [result async for result in AsyncFirestore(config).iter_bulk_write(ops)]
+
+    created, failed, again = asyncio.run(main())
+    assert isinstance(failed, ValueError)
+    assert {created["id"], again["id"]} == set(fake.documents)
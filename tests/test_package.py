@@ -0,0 +1,17 @@
+import pytest
+
+import pydatabridgex.pydatabridgex as package
+from pydatabridgex.pydatabridgex import firebase
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore
+
+
+def test_exports_resolve_on_first_access():
+    assert package.Firestore is Firestore
+    assert firebase.Firestore is Firestore
+    assert "Firestore" in vars(package)
+    assert set(package.__all__) <= set(dir(package))
+
+
+def test_unknown_names_raise_attribute_error():
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        package.missing
@@ -0,0 +1,79 @@
+import asyncio
+
+from pydatabridgex.pydatabridgex.firebase.realtime import (
+    AsyncRealTime,
+    RealTime,
+    _chunk_updates,
+)
+
+
+def _sent_headers(fake):
+    return [{name.lower() for name in headers} for headers in fake.headers]
+
+
+def test_multi_update_sends_no_configuration_headers(fake, config):
+    config.service_account = {"private_key": "secret"}
+    config.invalidate()
+    RealTime(config).multi_update({"a/b": 1}, token="t")
+    assert fake.tree == {"a": {"b": 1}}
+    (headers,) = _sent_headers(fake)
+    assert "serviceaccount" not in headers
+    assert "firebaseconfig" not in headers
+    assert "content-type" in headers
+
+
+def test_async_multi_update_sends_no_configuration_headers(fake, config):
+    async def main():
+        realtime = AsyncRealTime(config)
+        try:
+            await realtime.multi_update({"a/b": 1}, token="t")
+        finally:
+            await config.get_async_transport().aclose()
+
+    asyncio.run(main())
+    assert fake.tree == {"a": {"b": 1}}
+    (headers,) = _sent_headers(fake)
+    assert "serviceaccount" not in headers
+
+
+def _overlaps(chunk):
+    return [(a, b) for a in chunk for b in chunk if a != b and b.startswith(a + "/")]
+
+
+def test_chunks_never_hold_overlapping_paths():
+    chunks = _chunk_updates({"items/k1": None, "items/k1/a": {"x": 1}}, 1024)
+    assert [chunk for chunk, _ in chunks] == [
+        {"items/k1": None},
+        {"items/k1/a": {"x": 1}},
+    ]
+    value = {f"c{i}": {"text": "x" * 40} for i in range(6)}
+    for chunk, _ in _chunk_updates({"items/k1": value}, 120):
+        assert not _overlaps(chunk)
+
+
+def test_split_entry_is_written_in_order(fake, config):
+    value = {f"c{i}": {"text": "x" * 40, "n": i} for i in range(20)}
+    realtime = RealTime(config)
+    ids = realtime.bulk_create(
+        "items", [value, {"small": 1}], max_request_bytes=200, max_in_flight=8
+    )
+    assert not any(isinstance(result, Exception) for result in ids)
+    assert fake.tree["items"][ids[0]] == value
+    assert fake.tree["items"][ids[1]] == {"small": 1}
+
+
+def test_multi_update_applies_overlapping_entries_in_order(fake, config):
+    fake.tree = {"items": {"k1": {"old": 1}}}
+    updates = {"items/k1": None, "items/k1/a": {"x": 1}}
+    outcomes = RealTime(config).multi_update(updates)
+    assert outcomes == updates
+    assert fake.tree == {"items": {"k1": {"a": {"x": 1}}}}
+
+
+def test_failed_part_fails_only_its_entry(fake, config, policy):
+    value = {f"c{i}": {"text": "x" * 40} for i in range(10)}
+    realtime = RealTime(config, policy=policy)
+    fake.fail(400)
+    ids = realtime.bulk_create("items", [value], max_request_bytes=200)
+    assert isinstance(ids[0], Exception)
+    assert len(fake.requests) == 1
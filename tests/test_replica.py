@@ -0,0 +1,89 @@
+from fakes import _read_all
+
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore
+from pydatabridgex.pydatabridgex.firebase.replica import (
+    CHANGED_SINCE,
+    DocumentReplica,
+)
+
+
+def _seed(fake, count=5):
+    fake.documents.update({f"d{i}": {"n": i, "a_b": i} for i in range(count)})
+
+
+def _without_changed_since(server, query, payload, body):
+    query = {k: v for k, v in query.items() if k != CHANGED_SINCE}
+    return _read_all(server, query, payload, body)
+
+
+def _without_changed_since_or_limit(server, query, payload, body):
+    query = {k: v for k, v in query.items() if k not in (CHANGED_SINCE, "limit")}
+    return _read_all(server, query, payload, body)
+
+
+def _reads(fake):
+    return fake.requests.count(("GET", "/all"))
+
+
+def test_delta_sync_applies_changes_and_deletions(fake, config, tmp_path):
+    _seed(fake)
+    firestore = Firestore(config)
+    with DocumentReplica(firestore, str(tmp_path / "replica.db"), overlap=0) as replica:
+        assert len(replica.read_all_documents()) == 5
+        firestore.delete_document({"id": "d0"})
+        firestore.update_document({"id": "d1", "n": 10})
+        replica.sync()
+        assert replica.get("d0") is None
+        assert replica.get("d1") == {"id": "d1", "n": 10}
+        assert len(replica) == 4
+        assert replica.stats()["last_full_sync"] < replica.last_sync
+
+
+def test_ignored_changed_since_falls_back_to_full_sync(
+    fake, config, tmp_path, monkeypatch
+):
+    monkeypatch.setitem(fake.routes, ("GET", "/all"), _without_changed_since)
+    _seed(fake)
+    with DocumentReplica(Firestore(config), str(tmp_path / "replica.db")) as replica:
+        assert len(replica.read_all_documents()) == 5
+        del fake.documents["d0"]
+        replica.sync()
+        assert replica.get("d0") is None
+        assert len(replica) == 4
+        assert replica.stats()["last_full_sync"] == replica.last_sync
+
+
+def test_empty_replica_syncs_without_probing(fake, config, tmp_path):
+    with DocumentReplica(Firestore(config), str(tmp_path / "replica.db")) as replica:
+        replica.sync()
+        replica.sync()
+        assert _reads(fake) == 2
+        _seed(fake)
+        replica.sync()
+        assert len(replica) == 5
+
+
+def test_probe_is_cached_when_the_server_ignores_limit(
+    fake, config, tmp_path, monkeypatch
+):
+    monkeypatch.setitem(fake.routes, ("GET", "/all"), _without_changed_since_or_limit)
+    _seed(fake)
+    with DocumentReplica(Firestore(config), str(tmp_path / "replica.db")) as replica:
+        replica.sync()
+        replica.sync()
+        replica.sync()
+        # The first sync, one probe, then a full sync each time.
+        assert _reads(fake) == 4
+        assert len(replica) == 5
+
+
+def test_index_names_do_not_collide(fake, config, tmp_path):
+    _seed(fake)
+    path = str(tmp_path / "replica.db")
+    indexes = ["a__b", "a.b", "a_b"]
+    with DocumentReplica(Firestore(config), path, indexes=indexes) as replica:
+        assert replica.stats()["indexes"] == ["a.b", "a__b", "a_b"]
+        assert [doc_id for doc_id, _ in replica.query([("a_b", ">=", 3)])] == [
+            "d3",
+            "d4",
+        ]
@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from pydatabridgex.pydatabridgex.firebase.errors import (
+    CircuitOpenError,
+    FirebaseHTTPError,
+)
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore
+from pydatabridgex.pydatabridgex.firebase.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+)
+
+
+def _breaker_policy(threshold: int = 2, reset_timeout: float = 0.2) -> ResiliencePolicy:
+    return ResiliencePolicy(
+        max_attempts=1,
+        breaker=CircuitBreaker(
+            failure_threshold=threshold, reset_timeout=reset_timeout
+        ),
+    )
+
+
+def test_retries_429_after_retry_after(fake, config, policy):
+    firestore = Firestore(config, policy=policy)
+    doc_id = firestore.create_document({"n": 1})["id"]
+    fake.fail(429, times=2, retry_after="0.1")
+    started = time.monotonic()
+    assert firestore.read_document({"id": doc_id}) == {doc_id: {"n": 1}}
+    assert time.monotonic() - started >= 0.2
+    assert fake.requests[-3:] == [("GET", "/")] * 3
+
+
+def test_retries_503_for_post(fake, config, policy):
+    # 503 means the request was not processed, so even POST is safe to resend.
+    fake.fail(503, retry_after="0")
+    assert "id" in Firestore(config, policy=policy).create_document({"n": 1})
+    assert fake.requests == [("POST", "/")] * 2
+
+
+def test_does_not_retry_post_after_500(fake, config, policy):
+    fake.fail(500)
+    with pytest.raises(FirebaseHTTPError) as info:
+        Firestore(config, policy=policy).create_document({"n": 1})
+    assert info.value.status_code == 500
+    assert fake.requests == [("POST", "/")]
+    assert fake.documents == {}
+
+
+def test_retries_idempotent_get_after_500(fake, config, policy):
+    fake.fail(500, times=2)
+    Firestore(config, policy=policy).read_document({"id": "missing"})
+    assert fake.requests == [("GET", "/")] * 3
+
+
+def test_gives_up_after_max_attempts(fake, config, policy):
+    fake.fail(503, times=10, retry_after="0")
+    with pytest.raises(FirebaseHTTPError):
+        Firestore(config, policy=policy).read_document({"id": "x"})
+    assert len(fake.requests) == policy.max_attempts
+
+
+def test_does_not_retry_client_errors(fake, config, policy):
+    fake.fail(400)
+    with pytest.raises(FirebaseHTTPError) as info:
+        Firestore(config, policy=policy).read_document({"id": "x"})
+    assert not info.value.transient
+    assert len(fake.requests) == 1
+
+
+def test_delay_honours_retry_after_and_cap():
+    policy = ResiliencePolicy(backoff=0.01, max_backoff=2.0)
+    assert policy.delay(1, retry_after=1.5) == 1.5
+    assert policy.delay(1, retry_after=60) == 2.0
+    assert 0 <= policy.delay(10) <= 2.0
+
+
+def test_breaker_opens_half_opens_and_closes(fake, config):
+    policy = _breaker_policy()
+    firestore = Firestore(config, policy=policy)
+    url = f"{fake.url}/"
+    fake.fail(500, times=2)
+    for _ in range(2):
+        with pytest.raises(FirebaseHTTPError):
+            firestore.read_document({"id": "x"})
+    assert policy.breaker.state(url) == "open"
+    with pytest.raises(CircuitOpenError):
+        firestore.read_document({"id": "x"})
+    assert len(fake.requests) == 2
+    time.sleep(0.25)
+    assert policy.breaker.state(url) == "half_open"
+    firestore.read_document({"id": "x"})
+    assert policy.breaker.state(url) == "closed"
+
+
+def test_failed_probe_reopens_breaker(fake, config):
+    policy = _breaker_policy(threshold=1)
+    firestore = Firestore(config, policy=policy)
+    url = f"{fake.url}/"
+    fake.fail(500, times=2)
+    with pytest.raises(FirebaseHTTPError):
+        firestore.read_document({"id": "x"})
+    time.sleep(0.25)
+    with pytest.raises(FirebaseHTTPError):
+        firestore.read_document({"id": "x"})
+    assert policy.breaker.state(url) == "open"
+
+
+def test_probe_ended_by_unexpected_error_is_released(fake, config, monkeypatch):
+    policy = _breaker_policy(threshold=1)
+    firestore = Firestore(config, policy=policy)
+    fake.fail(500)
+    with pytest.raises(FirebaseHTTPError):
+        firestore.read_document({"id": "x"})
+    time.sleep(0.25)
+
+    def broken(*args, **kwargs):
+        raise TypeError("decoding failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(firestore, "_attempt_request", broken)
+        with pytest.raises(TypeError):
+            firestore.read_document({"id": "x"})
+    # Without releasing the probe every later request would fail fast.
+    firestore.read_document({"id": "x"})
+    assert policy.breaker.state(f"{fake.url}/") == "closed"
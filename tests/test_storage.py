@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from pydatabridgex.pydatabridgex.firebase.errors import FirebaseError, FirebaseHTTPError
+from pydatabridgex.pydatabridgex.firebase.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+)
+from pydatabridgex.pydatabridgex.firebase.storage import Storage
+from pydatabridgex.pydatabridgex.firebase.upload import ResumableUpload
+
+CHUNK = 256 * 1024
+
+
+@pytest.fixture
+def resumable(fake, monkeypatch):
+    monkeypatch.setattr(ResumableUpload, "base_url", f"{fake.url}/v0/b")
+
+
+def test_upload_stream_survives_a_failed_offset_query(fake, config, policy, resumable):
+    payload = os.urandom(3 * CHUNK)
+    sent = []
+
+    def progress(uploaded, total):
+        # The next chunk and the query that follows its failure both fail.
+        if not sent:
+            fake.fail(503, times=2, retry_after="0")
+        sent.append(uploaded)
+
+    result = Storage(config, policy=policy).upload_stream(
+        payload, "big.bin", chunk_size=CHUNK, progress=progress
+    )
+    assert result["size"] == str(len(payload))
+    assert fake.files["big.bin"] == payload
+
+
+def test_upload_stream_trips_the_circuit_breaker(fake, config, resumable):
+    policy = ResiliencePolicy(
+        max_attempts=1, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    )
+    storage = Storage(config, policy=policy)
+    fake.fail(503, times=10)
+    with pytest.raises(FirebaseError):
+        storage.upload_stream(b"data", "small.bin", max_retries=0)
+    assert policy.breaker.state(f"{fake.url}/v0/b/bucket/o") == "open"
+    requests = len(fake.requests)
+    with pytest.raises(FirebaseError):
+        storage.upload_stream(b"data", "small.bin", max_retries=0)
+    assert len(fake.requests) == requests
+
+
+def test_upload_stream_does_not_retry_permanent_errors(fake, config, policy, resumable):
+    def progress(uploaded, total):
+        if uploaded == CHUNK:
+            fake.fail(403)
+
+    with pytest.raises(FirebaseHTTPError) as info:
+        Storage(config, policy=policy).upload_stream(
+            os.urandom(3 * CHUNK), "big.bin", chunk_size=CHUNK, progress=progress
+        )
+    assert info.value.status_code == 403
+    # Start, the first chunk and the refused second chunk; no offset query.
+    assert len(fake.requests) == 3
+
+
+def test_upload_stream_uses_the_token_source(fake, config, resumable):
+    storage = Storage(config)
+    storage.token_source = lambda: "id-token"
+    storage.upload_stream(b"data", "small.bin")
+    assert {headers.get("Authorization") for headers in fake.headers} == {
+        "Firebase id-token"
+    }
@@ -0,0 +1,73 @@
+import time
+
+from pydatabridgex.pydatabridgex.firebase.errors import (
+    FirebaseConnectionError,
+    FirebaseHTTPError,
+)
+from pydatabridgex.pydatabridgex.firebase.resilience import ResiliencePolicy
+from pydatabridgex.pydatabridgex.firebase.tokens import TokenManager
+
+
+def _manager(config, backoff=0.05):
+    policy = ResiliencePolicy(backoff=backoff, max_backoff=backoff, breaker=False)
+    return TokenManager(config.get_transport(), refresh_margin=300.0, policy=policy)
+
+
+def test_short_lived_token_is_not_due_at_once(config):
+    calls = []
+
+    def fetch():
+        calls.append(time.monotonic())
+        return {"idToken": f"t{len(calls)}", "expiresIn": "0.4"}
+
+    manager = _manager(config)
+    manager.register("svc", fetch)
+    try:
+        assert manager.get("svc") == "t1"
+        time.sleep(0.5)
+    finally:
+        manager.close()
+    # Renewed half-way through each 0.4 s lifetime rather than continuously.
+    assert 2 <= len(calls) <= 4
+
+
+def test_failed_refresh_backs_off_after_expiry(config):
+    calls = []
+
+    def fetch():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return {"idToken": "t1", "expiresIn": "0.05"}
+        raise FirebaseConnectionError("unreachable")
+
+    manager = _manager(config)
+    manager.register("svc", fetch)
+    try:
+        manager.get("svc")
+        time.sleep(0.5)
+    finally:
+        manager.close()
+    # Full jitter averages 25 ms per retry here; without the backoff the
+    # expired token was retried in a tight loop, thousands of times.
+    assert len(calls) <= 50
+    assert manager.error("svc") is None
+
+
+def test_permanent_refresh_failure_stops_renewals(config):
+    calls = []
+
+    def fetch():
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return {"idToken": "t1", "expiresIn": "0.05"}
+        raise FirebaseHTTPError(400, "TOKEN_EXPIRED")
+
+    manager = _manager(config)
+    manager.register("svc", fetch)
+    try:
+        manager.get("svc")
+        time.sleep(0.3)
+    finally:
+        manager.close()
+    assert len(calls) == 2
+    assert isinstance(manager.error("svc"), FirebaseHTTPError)
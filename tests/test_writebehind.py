@@ -0,0 +1,39 @@
+import time
+
+from pydatabridgex.pydatabridgex.firebase.errors import FirebaseConnectionError
+from pydatabridgex.pydatabridgex.firebase.firestore import Firestore
+from pydatabridgex.pydatabridgex.firebase.writebehind import WriteBehindQueue
+
+
+def test_writes_to_one_key_apply_in_order(fake, config, tmp_path):
+    fake.documents["doc"] = {"n": 0}
+    with WriteBehindQueue(Firestore(config), str(tmp_path / "log.db")) as queue:
+        for n in range(1, 21):
+            queue.submit("update_document", {"id": "doc", "n": n})
+        assert queue.flush(timeout=5)
+    assert fake.documents["doc"] == {"id": "doc", "n": 20}
+
+
+def test_backing_off_key_does_not_starve_others(fake, config, tmp_path, monkeypatch):
+    firestore = Firestore(config)
+    update = firestore.update_document
+
+    def flaky(req):
+        if req["id"] == "hot":
+            raise FirebaseConnectionError("unreachable")
+        return update(req)
+
+    monkeypatch.setattr(firestore, "update_document", flaky)
+    queue = WriteBehindQueue(firestore, str(tmp_path / "log.db"), batch_size=10)
+    try:
+        for n in range(100):
+            queue.submit("update_document", {"id": "hot", "n": n})
+        for n in range(5):
+            queue.submit("update_document", {"id": f"cold{n}", "n": n})
+        deadline = time.monotonic() + 5
+        while queue.stats()["applied"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert queue.stats()["applied"] == 5
+        assert len(queue) == 100
+    finally:
+        queue.close(flush=False)